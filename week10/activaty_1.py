@@ -2,6 +2,7 @@
 analyser
 analyzing the text inputs.
 '''
+from metrics import FusedAnalysis
 
 class TextAnlyser:
     '''A class to analyze imput_text.'''
@@ -22,9 +23,16 @@ class TextAnlyser:
         upper_words = [word for word in words if word.isupper()]
         return len(upper_words)
 
+    # count both in one pass over the text.
+    def analyze(self)->dict:
+        '''Count words and uppercase words together, splitting the text once.'''
+        results = FusedAnalysis(["words", "uppercase_words"]).run([self.text])
+        return {"total_words": results["words"], "upper_words": results["uppercase_words"]}
+
 if __name__ == "__main__":
     #text = "Hello World. THIS is a TEST. Python is GREAT."
     text = input("Enter the text to be analyzed: ")
     analyser = TextAnlyser(text)
-    print("Total words:", analyser.count_words())
-    print("Total uppercase words:", analyser.count_upper_words())
+    result = analyser.analyze()
+    print("Total words:", result["total_words"])
+    print("Total uppercase words:", result["upper_words"])
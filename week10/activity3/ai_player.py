@@ -0,0 +1,314 @@
+"""
+Computer player for Tic-Tac-Toe
+Negamax search with alpha-beta pruning and a transposition table keyed by
+Zobrist hashes, folded over the board's 8 rotations/reflections.
+"""
+
+import time
+
+from tic_tac_toe import Player, TicTacToeGame, line_tables, zobrist_keys
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit runs out."""
+
+
+def _symmetries(size):
+    """Return the 8 rotation/reflection permutations of cell indices."""
+    last = size - 1
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    perms = []
+    for transform in transforms:
+        perm = []
+        for cell in range(size * size):
+            row, col = transform(*divmod(cell, size))
+            perm.append(row * size + col)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+def _popcount(mask):
+    """Count the set bits in mask."""
+    return bin(mask).count("1")
+
+
+class NegamaxEngine:
+    """Alpha-beta negamax over bitboards for one board shape.
+
+    The search works on raw (mover, opponent) masks rather than Board objects,
+    so no position is copied. Each node carries one Zobrist hash per symmetry;
+    the smallest of them is the transposition-table key, which makes all 8
+    equivalent positions share one entry. On 3x3 boards depth=None solves the
+    game exactly; on larger boards a depth limit with a heuristic evaluation
+    at the leaves is used, optionally under iterative deepening.
+    """
+
+    def __init__(self, size, win_length, use_symmetry=True, seed=0):
+        """Precompute move order, neighbourhoods and Zobrist keys for a shape."""
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.win_masks, self.lines_through = line_tables(size, win_length)
+        self.perms = _symmetries(size) if use_symmetry else (tuple(range(self.cells)),)
+        self.inverse = tuple(
+            tuple(perm.index(cell) for cell in range(self.cells)) for perm in self.perms
+        )
+
+        self.zobrist, self.side_key = zobrist_keys(size, seed)
+
+        centre = (size - 1) / 2
+        self.order = sorted(
+            range(self.cells),
+            key=lambda cell: abs(cell // size - centre) + abs(cell % size - centre),
+        )
+        self.neighbours = tuple(self._neighbour_mask(cell) for cell in range(self.cells))
+        self.weights = tuple(10 ** k for k in range(win_length + 1))
+        # Above any evaluate() total, so a heuristic score never looks like a win.
+        self.win_score = len(self.win_masks) * self.weights[-1] + self.cells + 1
+
+        self.table = {}
+        self.nodes = 0
+        self._deadline = None
+
+    def _neighbour_mask(self, cell):
+        """Return the mask of cells adjacent to cell (including diagonals)."""
+        row, col = divmod(cell, self.size)
+        mask = 0
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                r, c = row + d_row, col + d_col
+                if 0 <= r < self.size and 0 <= c < self.size:
+                    mask |= 1 << (r * self.size + c)
+        return mask
+
+    def hashes(self, mover, opponent, mover_colour, board_hash=None):
+        """Return the Zobrist hash of a position under every symmetry.
+
+        board_hash, the Board.hash of the same position, stands in for the
+        identity symmetry (always the first) instead of rescanning the stones.
+        """
+        result = []
+        for index, perm in enumerate(self.perms):
+            key = self.side_key if mover_colour else 0
+            if index == 0 and board_hash is not None:
+                result.append(key ^ board_hash)
+                continue
+            for colour, mask in ((mover_colour, mover), (1 - mover_colour, opponent)):
+                cell = 0
+                while mask:
+                    if mask & 1:
+                        key ^= self.zobrist[perm[cell]][colour]
+                    mask >>= 1
+                    cell += 1
+            result.append(key)
+        return result
+
+    def candidates(self, occupied):
+        """Return the cells worth searching, best-first by distance to centre."""
+        empties = self.full_mask & ~occupied
+        if self.cells > 16:
+            # On big boards only moves touching existing stones are sensible.
+            if not occupied:
+                return [self.order[0]]
+            near = 0
+            remaining = occupied
+            while remaining:
+                low = remaining & -remaining
+                near |= self.neighbours[low.bit_length() - 1]
+                remaining ^= low
+            if near & empties:
+                empties &= near
+        return [cell for cell in self.order if empties >> cell & 1]
+
+    def evaluate(self, mover, opponent):
+        """Score a non-terminal position from the mover's point of view."""
+        score = 0
+        weights = self.weights
+        for line in self.win_masks:
+            mine = mover & line
+            theirs = opponent & line
+            if mine and not theirs:
+                score += weights[_popcount(mine)]
+            elif theirs and not mine:
+                score -= weights[_popcount(theirs)]
+        return score
+
+    def negamax(self, mover, opponent, colour, hashes, empties, depth, alpha, beta):
+        """Return the value of the position for the side to move."""
+        if empties == 0:
+            return 0
+        if depth == 0:
+            return self.evaluate(mover, opponent)
+
+        self.nodes += 1
+        if self._deadline is not None and self.nodes & 1023 == 0:
+            if time.perf_counter() > self._deadline:
+                raise SearchTimeout()
+
+        key = min(hashes)
+        sym = hashes.index(key)
+        alpha_orig = alpha
+        tt_move = None
+        entry = self.table.get(key)
+        if entry is not None:
+            e_depth, e_value, e_flag, e_move = entry
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                else:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+            tt_move = self.inverse[sym][e_move]
+
+        moves = self.candidates(mover | opponent)
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        win_score = self.win_score
+        best = -win_score * 2
+        best_move = moves[0]
+        zobrist = self.zobrist
+        perms = self.perms
+        side_key = self.side_key
+        for cell in moves:
+            placed = mover | (1 << cell)
+            if any(placed & line == line for line in self.lines_through[cell]):
+                # Winning sooner leaves more empty cells, so it scores higher.
+                score = win_score + empties - 1
+            else:
+                child = [
+                    h ^ zobrist[perm[cell]][colour] ^ side_key
+                    for h, perm in zip(hashes, perms)
+                ]
+                score = -self.negamax(opponent, placed, 1 - colour, child,
+                                      empties - 1, depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+                best_move = cell
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best, flag, self.perms[sym][best_move])
+        return best
+
+    def search(self, mover, opponent, colour, max_depth=None, time_limit=None,
+               board_hash=None):
+        """Return (cell, value) for the side to move using iterative deepening.
+
+        max_depth=None searches to the end of the game. With a time_limit the
+        move from the deepest completed iteration is returned. board_hash is
+        passed on to hashes().
+        """
+        empties = _popcount(self.full_mask & ~(mover | opponent))
+        if empties == 0:
+            raise ValueError("There are no moves left on the board.")
+        limit = empties if max_depth is None else min(max_depth, empties)
+        hashes = self.hashes(mover, opponent, colour, board_hash)
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        best_move = self.candidates(mover | opponent)[0]
+        best_value = 0
+        try:
+            for depth in range(1, limit + 1):
+                value = self.negamax(mover, opponent, colour, hashes, empties,
+                                     depth, -self.win_score * 2, self.win_score * 2)
+                key = min(hashes)
+                best_move = self.inverse[hashes.index(key)][self.table[key][3]]
+                best_value = value
+                if abs(value) >= self.win_score:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+        return best_move, best_value
+
+
+class AIPlayer(Player):
+    """A computer player that picks its moves with NegamaxEngine."""
+
+    def __init__(self, name, symbol, max_depth=None, time_limit=None, use_symmetry=True):
+        """Initialize the player; max_depth=None plays perfectly on 3x3."""
+        super().__init__(name, symbol)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.use_symmetry = use_symmetry
+        self.engine = None
+
+    def _engine_for(self, board):
+        """Return a search engine for the board's shape, reusing its table."""
+        engine = self.engine
+        if engine is None or (engine.size, engine.win_length) != (board.size, board.win_length):
+            engine = NegamaxEngine(board.size, board.win_length, self.use_symmetry)
+            self.engine = engine
+        return engine
+
+    def get_move(self, board=None):
+        """Search the board and return the chosen (row, col)."""
+        if board is None:
+            raise ValueError("AIPlayer needs the board to choose a move.")
+        if board.check_winner() is not None or board.is_full():
+            raise ValueError("The game is already over.")
+
+        opponent_symbol = next(
+            (symbol for symbol in board.masks if symbol != self.symbol),
+            'O' if self.symbol == 'X' else 'X',
+        )
+        mover = board.masks.get(self.symbol, 0)
+        opponent = board.masks.get(opponent_symbol, 0)
+        colour = 0 if self.symbol == 'X' else 1
+
+        max_depth = self.max_depth
+        if max_depth is None and board.size > 3:
+            # Exact search is hopeless beyond 3x3; fall back to a shallow horizon.
+            max_depth = 4
+        # Board.hash uses the engine's keys, as long as the symbols are X and O
+        board_hash = board.hash if set(board.masks) <= {'X', 'O'} else None
+        cell, _ = self._engine_for(board).search(mover, opponent, colour,
+                                                 max_depth, self.time_limit, board_hash)
+        return divmod(cell, board.size)
+
+
+def main():
+    """Play a human against the computer."""
+    try:
+        game = TicTacToeGame()
+        name = input("Enter your name: ").strip() or "Player"
+        first = input("Do you want to go first? (y/n): ").lower().strip() in ['y', 'yes']
+        if first:
+            game.add_player(name, 'X')
+            game.add_player("Computer", 'O', AIPlayer)
+        else:
+            game.add_player("Computer", 'X', AIPlayer)
+            game.add_player(name, 'O')
+        game.play_game()
+    except (EOFError, KeyboardInterrupt):
+        print("\n\nGame interrupted. Goodbye!")
+
+
+if __name__ == "__main__":
+    main()
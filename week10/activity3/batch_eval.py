@@ -0,0 +1,117 @@
+"""
+Vectorised Tic-Tac-Toe evaluation
+Computes winners, full boards and legal moves for many positions at once.
+
+Positions are an (N, size, size) int8 array with 0 for an empty cell,
+1 for X and -1 for O. Requires NumPy (pip install numpy).
+"""
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # NumPy is optional for the rest of the game
+    np = None
+
+EMPTY, X, O = 0, 1, -1
+SYMBOLS = (' ', 'X', 'O')
+
+
+def _require_numpy():
+    """Raise a helpful error when NumPy is missing."""
+    if np is None:
+        raise ImportError("batch_eval needs NumPy: pip install numpy")
+
+
+def grids_to_array(grids):
+    """Convert a sequence of Board.grid lists into an (N, size, size) int8 array."""
+    _require_numpy()
+    grids = list(grids)
+    if not grids:
+        return np.zeros((0, 0, 0), dtype=np.int8)
+    cells = np.array(grids, dtype="U1")
+    return (cells == 'X').astype(np.int8) - (cells == 'O').astype(np.int8)
+
+
+def boards_to_array(boards):
+    """Convert Board objects into an (N, size, size) int8 array.
+
+    Boards of up to 7x7 are unpacked straight from their bitboards; larger
+    ones go through their grids.
+    """
+    _require_numpy()
+    boards = list(boards)
+    if not boards:
+        return np.zeros((0, 0, 0), dtype=np.int8)
+    size = boards[0].size
+    if any(board.size != size for board in boards):
+        raise ValueError("All boards must have the same size.")
+    if size * size > 63:
+        return grids_to_array([board.grid for board in boards])
+
+    shifts = np.arange(size * size, dtype=np.int64)
+    x_masks = np.array([board.masks.get('X', 0) for board in boards], dtype=np.int64)
+    o_masks = np.array([board.masks.get('O', 0) for board in boards], dtype=np.int64)
+    cells = ((x_masks[:, None] >> shifts) & 1) - ((o_masks[:, None] >> shifts) & 1)
+    return cells.astype(np.int8).reshape(len(boards), size, size)
+
+
+def array_to_grids(positions):
+    """Convert an (N, size, size) array back into Board.grid-style lists."""
+    _require_numpy()
+    symbols = np.array(SYMBOLS)
+    return symbols[np.asarray(positions) % 3].tolist()
+
+
+def _line_sums(positions, win_length):
+    """Yield the sum of every win_length window along the four directions."""
+    k = win_length
+    yield sliding_window_view(positions, k, axis=2).sum(axis=-1)
+    yield sliding_window_view(positions, k, axis=1).sum(axis=-1)
+    squares = sliding_window_view(positions, (k, k), axis=(1, 2))
+    yield np.trace(squares, axis1=-2, axis2=-1)
+    yield np.trace(squares[..., ::-1], axis1=-2, axis2=-1)
+
+
+def winners(positions, win_length=None):
+    """Return an (N,) int8 array: 1 where X has won, -1 for O, 0 otherwise.
+
+    Each direction is a convolution-style sliding-window sum, so a line of
+    win_length X stones sums to win_length and an O line to -win_length.
+    Positions where both sides have a line report X.
+    """
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8)
+    count, size = positions.shape[0], positions.shape[1]
+    if count == 0:
+        return np.zeros(0, dtype=np.int8)
+    k = size if win_length is None else win_length
+    if not 1 <= k <= size:
+        raise ValueError("Win length must be between 1 and the board size.")
+
+    x_won = np.zeros(count, dtype=bool)
+    o_won = np.zeros(count, dtype=bool)
+    for sums in _line_sums(positions, k):
+        flat = sums.reshape(count, -1)
+        x_won |= (flat == k).any(axis=1)
+        o_won |= (flat == -k).any(axis=1)
+    return np.where(x_won, X, np.where(o_won, O, EMPTY)).astype(np.int8)
+
+
+def is_full(positions):
+    """Return an (N,) bool array that is True for boards with no empty cell."""
+    _require_numpy()
+    positions = np.asarray(positions)
+    if positions.shape[0] == 0:
+        return np.zeros(0, dtype=bool)
+    return (positions != EMPTY).reshape(positions.shape[0], -1).all(axis=1)
+
+
+def legal_moves(positions, win_length=None):
+    """Return an (N, size, size) bool mask of the cells that may be played.
+
+    Finished games (someone has won) have no legal moves.
+    """
+    _require_numpy()
+    positions = np.asarray(positions, dtype=np.int8)
+    running = winners(positions, win_length) == EMPTY
+    return (positions == EMPTY) & running[:, None, None]
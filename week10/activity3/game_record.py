@@ -0,0 +1,243 @@
+"""
+Compact game records for Tic-Tac-Toe
+A binary move-log format with streaming writer/reader classes and a fast
+replay engine that re-validates recorded games.
+
+File layout: the 8-byte MAGIC, then one record per game made of a 5-byte
+header (size, win_length, result code, move count as little-endian uint16)
+followed by one byte per move holding the cell index row * size + col.
+X always makes the first move. Boards of up to 16x16 fit in this format.
+"""
+
+import argparse
+import struct
+import time
+
+from tic_tac_toe import Board, line_tables
+
+MAGIC = b"TTTLOG1\n"
+HEADER = struct.Struct("<BBBH")
+MAX_SIZE = 16
+MAX_CELLS = MAX_SIZE * MAX_SIZE
+READ_SIZE = 1 << 20
+
+RESULT_CODES = {None: 0, 'X': 1, 'O': 2, 'draw': 3, 'timeout': 4}
+RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+
+class InvalidRecord(ValueError):
+    """Raised when a record cannot have come from a legal game."""
+
+
+class GameRecord:
+    """One recorded game: board shape, result and the cells played in order."""
+
+    __slots__ = ("size", "win_length", "result", "moves")
+
+    def __init__(self, size, win_length, result, moves):
+        """Initialize a record; moves is a bytes-like sequence of cell indices."""
+        if size * size > MAX_CELLS:
+            raise ValueError("Boards larger than 16x16 cannot be recorded.")
+        if result not in RESULT_CODES:
+            raise ValueError(f"Unknown result {result!r}.")
+        self.size = size
+        self.win_length = win_length
+        self.result = result
+        self.moves = bytes(moves)
+
+    @classmethod
+    def from_game(cls, game, result):
+        """Build a record from a TicTacToeGame's move history."""
+        size = game.board.size
+        if size > MAX_SIZE:
+            raise ValueError("Boards larger than 16x16 cannot be recorded.")
+        return cls(size, game.board.win_length, result,
+                   bytes(row * size + col for row, col in game.move_history))
+
+    def to_bytes(self):
+        """Return the record in its on-disk form."""
+        return HEADER.pack(self.size, self.win_length, RESULT_CODES[self.result],
+                           len(self.moves)) + self.moves
+
+    def coordinates(self):
+        """Return the moves as a list of (row, col)."""
+        return [divmod(cell, self.size) for cell in self.moves]
+
+    def __eq__(self, other):
+        return (isinstance(other, GameRecord)
+                and (self.size, self.win_length, self.result, self.moves)
+                == (other.size, other.win_length, other.result, other.moves))
+
+    def __repr__(self):
+        return (f"GameRecord(size={self.size}, win_length={self.win_length}, "
+                f"result={self.result!r}, moves={len(self.moves)})")
+
+
+class GameRecordWriter:
+    """Appends records to a binary file object or path."""
+
+    # games on bigger boards are refused by TicTacToeGame up front
+    max_size = MAX_SIZE
+
+    def __init__(self, target):
+        """Open target (a path or a writable binary file) and write the header."""
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, "wb") if self._owns_file else target
+        self._file.write(MAGIC)
+        self.count = 0
+
+    def write(self, record):
+        """Append one GameRecord."""
+        self._file.write(record.to_bytes())
+        self.count += 1
+
+    def write_game(self, game, result):
+        """Append the game currently held by a TicTacToeGame."""
+        self.write(GameRecord.from_game(game, result))
+
+    def close(self):
+        """Flush, and close the file if this writer opened it."""
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GameRecordReader:
+    """Streams records back from a binary file object or path."""
+
+    def __init__(self, source):
+        """Open source (a path or a readable binary file) and check the header."""
+        self._owns_file = isinstance(source, str)
+        self._file = open(source, "rb") if self._owns_file else source
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self.close()
+            raise InvalidRecord("Not a Tic-Tac-Toe game log.")
+
+    def __iter__(self):
+        """Yield GameRecords, reading the file in large blocks."""
+        buffer = b""
+        offset = 0
+        header_size = HEADER.size
+        unpack = HEADER.unpack_from
+        while True:
+            block = self._file.read(READ_SIZE)
+            if not block:
+                break
+            buffer = buffer[offset:] + block
+            offset = 0
+            end = len(buffer)
+            while end - offset >= header_size:
+                size, win_length, code, count = unpack(buffer, offset)
+                start = offset + header_size
+                if end - start < count:
+                    break
+                if code not in RESULTS:
+                    raise InvalidRecord(f"Unknown result code {code}.")
+                yield GameRecord(size, win_length, RESULTS[code], buffer[start:start + count])
+                offset = start + count
+        if offset != len(buffer):
+            raise InvalidRecord("Game log ends in the middle of a record.")
+
+    def close(self):
+        """Close the file if this reader opened it."""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def replay(record):
+    """Re-play a record on bitboards and return the result it actually reaches.
+
+    Raises InvalidRecord if a move is illegal, play continues after a win,
+    or the stored result does not match the position.
+    """
+    size = record.size
+    cells = size * size
+    if not 1 <= record.win_length <= size:
+        raise InvalidRecord("Win length does not fit the board.")
+    _, lines_through = line_tables(size, record.win_length)
+
+    masks = [0, 0]
+    occupied = 0
+    winner = None
+    for index, cell in enumerate(record.moves):
+        if winner is not None:
+            raise InvalidRecord(f"Move {index + 1} was played after the game was won.")
+        bit = 1 << cell
+        if cell >= cells or occupied & bit:
+            raise InvalidRecord(f"Move {index + 1} is not a legal move.")
+        side = index & 1
+        mask = masks[side] | bit
+        masks[side] = mask
+        occupied |= bit
+        for line in lines_through[cell]:
+            if mask & line == line:
+                winner = side
+                break
+
+    if winner is not None:
+        actual = 'O' if winner else 'X'
+    elif occupied == (1 << cells) - 1:
+        actual = 'draw'
+    else:
+        actual = None
+
+    expected = None if record.result == 'timeout' else record.result
+    if actual != expected:
+        raise InvalidRecord(f"Recorded result {record.result!r} but the moves give {actual!r}.")
+    return actual
+
+
+def replay_to_board(record):
+    """Return a Board showing the final position of a record."""
+    board = Board(record.size, record.win_length)
+    for index, (row, col) in enumerate(record.coordinates()):
+        if not board.make_move(row, col, 'O' if index & 1 else 'X'):
+            raise InvalidRecord(f"Move {index + 1} is not a legal move.")
+    return board
+
+
+def validate_log(records):
+    """Replay every record and return counts of results and invalid games."""
+    counts = {"games": 0, "invalid": 0, "X": 0, "O": 0, "draw": 0, "unfinished": 0}
+    for record in records:
+        counts["games"] += 1
+        try:
+            result = replay(record)
+        except InvalidRecord:
+            counts["invalid"] += 1
+            continue
+        counts[result or "unfinished"] += 1
+    return counts
+
+
+def main():
+    """Validate a game log from the command line."""
+    parser = argparse.ArgumentParser(description="Replay and validate a Tic-Tac-Toe game log.")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with GameRecordReader(args.path) as reader:
+        counts = validate_log(reader)
+    elapsed = time.perf_counter() - start
+    for key, value in counts.items():
+        print(f"{key}: {value}")
+    if elapsed:
+        print(f"Replayed {counts['games'] / elapsed * 60:,.0f} games per minute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Asyncio Tic-Tac-Toe server
+Hosts many concurrent games over TCP or Unix sockets using newline-delimited
+JSON. Each connected client plays against a server-side policy.
+
+Client to server:
+    {"op": "new", "size": 3, "win_length": 3, "opponent": "random", "first": true}
+    {"op": "move", "game": 1, "row": 1, "col": 1}
+
+Server to client:
+    {"op": "started", "game": 1, "symbol": "X", "size": 3, "win_length": 3}
+    {"op": "state", "game": 1, "board": ["X  ", " O ", "   "],
+     "to_move": "X", "last": [1, 1], "result": null}
+    {"op": "error", "game": 1, "message": "..."}
+
+result is null while the game runs, then "X", "O", "draw", "timeout", or
+"error" after an error message if the server failed while running the game.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+
+from tic_tac_toe import Player, TicTacToeGame
+from simulator import AIPolicy, RandomPolicy
+
+MAX_LINE = 64 * 1024
+MAX_SIZE = 25
+OPPONENTS = {
+    "random": RandomPolicy,
+    "ai": AIPolicy,
+}
+
+
+class RemotePlayer(Player):
+    """A player whose moves arrive over the network instead of from input()."""
+
+    def __init__(self, name, symbol):
+        """Initialize the player with a one-slot move queue."""
+        super().__init__(name, symbol)
+        self.moves = asyncio.Queue(maxsize=1)
+        self.waiting = False
+
+    async def next_move(self, timeout):
+        """Wait up to timeout seconds for the client's next (row, col)."""
+        try:
+            return await asyncio.wait_for(self.moves.get(), timeout)
+        finally:
+            self.waiting = False
+
+
+class PolicyPlayer(Player):
+    """A server-side player driven by a simulator policy."""
+
+    def __init__(self, name, symbol, policy, rng):
+        """Initialize the player with a move policy and its random source."""
+        super().__init__(name, symbol)
+        self.policy = policy
+        self.rng = rng
+
+    def get_move(self, board=None):
+        """Return the policy's (row, col) for board."""
+        return self.policy(board, self.symbol, self.rng)
+
+
+class Connection:
+    """One client socket; serialises writes and waits for the socket to drain."""
+
+    def __init__(self, reader, writer):
+        """Wrap the stream pair of an accepted connection."""
+        self.reader = reader
+        self.writer = writer
+        self.games = {}
+        self._write_lock = asyncio.Lock()
+
+    async def send(self, message):
+        """Write one JSON line, applying backpressure from a slow reader."""
+        data = json.dumps(message, separators=(",", ":")).encode() + b"\n"
+        async with self._write_lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+
+class GameServer:
+    """Runs TicTacToeGame rounds for many clients on one event loop."""
+
+    def __init__(self, move_timeout=30.0, game_timeout=600.0, max_games=10_000,
+                 max_games_per_connection=100, seed=None, recorder=None):
+        """Initialize the server limits.
+
+        move_timeout bounds how long a client may think, game_timeout bounds
+        a whole game, and max_games caps the games hosted at once. Finished
+        games are archived through recorder (a game_record.GameRecordWriter).
+        """
+        self.recorder = recorder
+        self.move_timeout = move_timeout
+        self.game_timeout = game_timeout
+        self.max_games = max_games
+        self.max_games_per_connection = max_games_per_connection
+        self.active_games = 0
+        self.games_played = 0
+        self._ids = itertools.count(1)
+        self._rng = random.Random(seed)
+        self._server = None
+        self._handlers = {}
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Listen on a TCP port and return the bound (host, port)."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """Listen on a Unix socket at path."""
+        self._server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE)
+
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and let open connections wind down."""
+        if self._server is not None:
+            self._server.close()
+        for connection in list(self._handlers.values()):
+            connection.writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Read and dispatch messages from one client until it disconnects."""
+        connection = Connection(reader, writer)
+        handler = asyncio.current_task()
+        self._handlers[handler] = connection
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await connection.send({"op": "error", "message": "Line too long."})
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    await connection.send({"op": "error", "message": "Invalid JSON."})
+                    continue
+                await self._dispatch(connection, message)
+        except ConnectionError:
+            pass
+        finally:
+            self._handlers.pop(handler, None)
+            for task, _ in list(connection.games.values()):
+                task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, connection, message):
+        """Act on one client message."""
+        op = message.get("op") if isinstance(message, dict) else None
+        if op == "new":
+            await self._new_game(connection, message)
+        elif op == "move":
+            await self._queue_move(connection, message)
+        else:
+            await connection.send({"op": "error", "message": f"Unknown op {op!r}."})
+
+    async def _new_game(self, connection, message):
+        """Start a game task for a "new" request."""
+        if self.active_games >= self.max_games:
+            await connection.send({"op": "error", "message": "Server is full, try again later."})
+            return
+        if len(connection.games) >= self.max_games_per_connection:
+            await connection.send({"op": "error", "message": "Too many games on this connection."})
+            return
+
+        opponent = OPPONENTS.get(message.get("opponent", "random"))
+        if opponent is None:
+            await connection.send({"op": "error", "message": "Unknown opponent."})
+            return
+        try:
+            size = int(message.get("size", 3))
+            if size > MAX_SIZE:
+                raise ValueError(f"Board size must be at most {MAX_SIZE}.")
+            game = TicTacToeGame(size, message.get("win_length"), self.recorder)
+        except (TypeError, ValueError) as e:
+            await connection.send({"op": "error", "message": str(e)})
+            return
+
+        policy = PolicyPlayer("Server", 'X', opponent(), random.Random(self._rng.getrandbits(64)))
+        client = RemotePlayer("Client", 'O')
+        if message.get("first", True):
+            client.symbol, policy.symbol = 'X', 'O'
+            game.players = [client, policy]
+        else:
+            game.players = [policy, client]
+
+        game_id = next(self._ids)
+        self.active_games += 1
+        task = asyncio.create_task(self._run_game(connection, game_id, game, client))
+        connection.games[game_id] = (task, client)
+        await connection.send({"op": "started", "game": game_id, "symbol": client.symbol,
+                               "size": game.board.size, "win_length": game.board.win_length})
+
+    async def _queue_move(self, connection, message):
+        """Hand a "move" request to the waiting game task."""
+        entry = connection.games.get(message.get("game"))
+        if entry is None:
+            await connection.send({"op": "error", "game": message.get("game"),
+                                   "message": "No such game."})
+            return
+        client = entry[1]
+        try:
+            move = (int(message["row"]), int(message["col"]))
+        except (KeyError, TypeError, ValueError):
+            await connection.send({"op": "error", "game": message.get("game"),
+                                   "message": "A move needs integer row and col."})
+            return
+        if not client.waiting or client.moves.full():
+            await connection.send({"op": "error", "game": message.get("game"),
+                                   "message": "It is not your turn."})
+            return
+        client.moves.put_nowait(move)
+
+    async def _run_game(self, connection, game_id, game, client):
+        """Drive one game to the end, reporting each position to the client."""
+        try:
+            try:
+                result = await asyncio.wait_for(
+                    self._play(connection, game_id, game, client), self.game_timeout)
+            except asyncio.TimeoutError:
+                result = "timeout"
+            # inside the outer try, so a failing recorder is reported below
+            if result == "timeout" and self.recorder is not None:
+                self.recorder.write_game(game, "timeout")
+        except ConnectionError:
+            return
+        except asyncio.CancelledError:
+            if self.recorder is not None:
+                self.recorder.write_game(game, None)
+            raise
+        except Exception as e:
+            # report the failure instead of leaving the client waiting for a result
+            result = "error"
+            try:
+                await connection.send({"op": "error", "game": game_id,
+                                       "message": f"Server error: {e}"})
+            except ConnectionError:
+                return
+        finally:
+            self.active_games -= 1
+            self.games_played += 1
+            connection.games.pop(game_id, None)
+        try:
+            await self._send_state(connection, game_id, game, None, result)
+        except ConnectionError:
+            pass
+
+    async def _play(self, connection, game_id, game, client):
+        """Alternate the two seats until the board reports a result."""
+        loop = asyncio.get_running_loop()
+        last = None
+        while True:
+            player = game.get_current_player()
+            if player is client:
+                # Accept the reply even if it arrives while we wait for drain().
+                client.waiting = True
+                await self._send_state(connection, game_id, game, last, None)
+                try:
+                    row, col = await client.next_move(self.move_timeout)
+                except asyncio.TimeoutError:
+                    return "timeout"
+                if not game.make_move(row, col):
+                    await connection.send({"op": "error", "game": game_id,
+                                           "message": "Invalid move! Cell is already "
+                                                      "occupied or out of bounds."})
+                    continue
+            elif isinstance(player.policy, RandomPolicy):
+                row, col = player.get_move(game.board)
+                game.make_move(row, col)
+            else:
+                # Searching can take a while; keep the event loop responsive.
+                row, col = await loop.run_in_executor(None, player.get_move, game.board)
+                game.make_move(row, col)
+            last = [row, col]
+
+            result, winner = game.check_game_over()
+            if result != "continue":
+                game.record_result(result, winner)
+                return winner or "draw"
+            game.switch_player()
+
+    async def _send_state(self, connection, game_id, game, last, result):
+        """Send the position of one game."""
+        await connection.send({
+            "op": "state",
+            "game": game_id,
+            "board": ["".join(row) for row in game.board.grid],
+            "to_move": game.get_current_player().symbol,
+            "last": last,
+            "result": result,
+        })
+
+
+async def run_server(host, port, unix_path=None, **options):
+    """Start a GameServer and serve until cancelled."""
+    server = GameServer(**options)
+    if unix_path:
+        await server.start_unix(unix_path)
+        print(f"Serving Tic-Tac-Toe on {unix_path}")
+    else:
+        host, port = await server.start(host, port)
+        print(f"Serving Tic-Tac-Toe on {host}:{port}")
+    await server.serve_forever()
+
+
+def main():
+    """Run the server from the command line."""
+    parser = argparse.ArgumentParser(description="Host Tic-Tac-Toe games over NDJSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on a Unix socket instead")
+    parser.add_argument("--move-timeout", type=float, default=30.0)
+    parser.add_argument("--game-timeout", type=float, default=600.0)
+    parser.add_argument("--max-games", type=int, default=10_000)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.unix,
+                               move_timeout=args.move_timeout,
+                               game_timeout=args.game_timeout,
+                               max_games=args.max_games))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
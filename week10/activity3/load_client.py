@@ -0,0 +1,139 @@
+"""
+Load generator for the Tic-Tac-Toe game server
+Opens many concurrent connections to game_server.py and plays random moves.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+class GameClient:
+    """A minimal NDJSON client that plays random moves against the server."""
+
+    def __init__(self, reader, writer, rng):
+        """Wrap an open connection."""
+        self.reader = reader
+        self.writer = writer
+        self.rng = rng
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, unix_path=None, seed=None):
+        """Open a TCP (or Unix socket) connection to the server."""
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, random.Random(seed))
+
+    async def send(self, message):
+        """Send one JSON line."""
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        """Read one JSON line from the server."""
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        return json.loads(line)
+
+    async def play_game(self, size=3, win_length=None, opponent="random", first=True,
+                        think=None):
+        """Play one game and return the server's final result.
+
+        think, if given, is called with each state message and returns the
+        (row, col) to play; by default a random empty cell is chosen.
+        """
+        await self.send({"op": "new", "size": size, "win_length": win_length,
+                         "opponent": opponent, "first": first})
+        started = await self.receive()
+        if started["op"] != "started":
+            raise RuntimeError(started.get("message", "Game did not start."))
+        symbol = started["symbol"]
+
+        while True:
+            message = await self.receive()
+            if message["op"] == "error":
+                raise RuntimeError(message["message"])
+            if message["result"] is not None:
+                return message["result"]
+            if message["to_move"] == symbol:
+                row, col = (think or self.random_move)(message)
+                await self.send({"op": "move", "game": started["game"], "row": row, "col": col})
+
+    def random_move(self, state):
+        """Pick a random empty cell from a state message."""
+        empties = [(row, col) for row, line in enumerate(state["board"])
+                   for col, cell in enumerate(line) if cell == ' ']
+        return self.rng.choice(empties)
+
+    async def close(self):
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_load(connections=100, games=10, host="127.0.0.1", port=8765, unix_path=None,
+                   size=3, win_length=None, opponent="random", seed=0):
+    """Play games games on each of connections concurrent connections.
+
+    Returns a dictionary of results (from the clients' side) and throughput.
+    """
+    results = {"games": 0, "wins": 0, "draws": 0, "losses": 0, "timeouts": 0, "errors": 0}
+
+    async def player(index):
+        """Play one connection's games in sequence."""
+        client = await GameClient.connect(host, port, unix_path, seed=f"{seed}:{index}")
+        try:
+            for number in range(games):
+                first = (index + number) % 2 == 0
+                try:
+                    result = await client.play_game(size, win_length, opponent, first)
+                except RuntimeError:
+                    results["errors"] += 1
+                    continue
+                results["games"] += 1
+                mine = 'X' if first else 'O'
+                if result == "draw":
+                    results["draws"] += 1
+                elif result == "timeout":
+                    results["timeouts"] += 1
+                elif result == mine:
+                    results["wins"] += 1
+                else:
+                    results["losses"] += 1
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player(index) for index in range(connections)))
+    elapsed = time.perf_counter() - start
+    results["seconds"] = elapsed
+    results["games_per_second"] = results["games"] / elapsed if elapsed else 0.0
+    return results
+
+
+def main():
+    """Run the load generator from the command line."""
+    parser = argparse.ArgumentParser(description="Generate load against game_server.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="connect to a Unix socket instead")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--games", type=int, default=10, help="games per connection")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--opponent", default="random")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args.connections, args.games, args.host, args.port,
+                                   args.unix, args.size, args.win_length, args.opponent))
+    for key, value in results.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Perfect-play table for 3x3 Tic-Tac-Toe
+Enumerates every reachable position once and stores its game-theoretic value
+and best move in a memory-mappable file indexed by a base-3 position code.
+"""
+
+import mmap
+import os
+import tempfile
+
+from tic_tac_toe import Player, line_tables
+
+MAGIC = b"TTTBOOK1"
+CELLS = 9
+TABLE_SIZE = 3 ** CELLS
+NO_MOVE = 0x0F
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# TERNARY[mask] is the base-3 code of a mask with every set cell worth 1,
+# so a position's code is TERNARY[x_mask] + 2 * TERNARY[o_mask].
+TERNARY = tuple(
+    sum(3 ** cell for cell in range(CELLS) if mask >> cell & 1)
+    for mask in range(1 << CELLS)
+)
+
+
+def position_code(x_mask, o_mask):
+    """Return the base-3 code of a position (empty=0, X=1, O=2 per cell)."""
+    return TERNARY[x_mask] + 2 * TERNARY[o_mask]
+
+
+def encode_entry(value, move):
+    """Pack a value (-1, 0, 1) and move (0-8 or NO_MOVE) into one byte."""
+    return (value + 2) << 4 | move
+
+
+def decode_entry(entry):
+    """Unpack a table byte into (value, move); move is None at game end."""
+    move = entry & 0x0F
+    return (entry >> 4) - 2, None if move == NO_MOVE else move
+
+
+def build_table():
+    """Solve every reachable 3x3 position and return the packed table.
+
+    Entries are indexed by position_code; unreachable positions stay 0.
+    Values are from the point of view of the side to move, and the stored
+    move wins as fast as possible or loses as slowly as possible.
+    """
+    _, lines_through = line_tables(3, 3)
+    full = (1 << CELLS) - 1
+    table = bytearray(TABLE_SIZE)
+    scores = {}
+
+    def solve(mover, opponent, x_to_move, last_cell):
+        """Return the score for the side to move, filling table on the way."""
+        x_mask, o_mask = (mover, opponent) if x_to_move else (opponent, mover)
+        code = position_code(x_mask, o_mask)
+        if code in scores:
+            return scores[code]
+
+        empties = full & ~(mover | opponent)
+        if last_cell is not None and any(
+                opponent & line == line for line in lines_through[last_cell]):
+            # The previous move won; the side to move has lost.
+            score = -(1 + bin(empties).count("1"))
+            table[code] = encode_entry(-1, NO_MOVE)
+        elif not empties:
+            score = 0
+            table[code] = encode_entry(0, NO_MOVE)
+        else:
+            score, best_move = None, None
+            for cell in range(CELLS):
+                if empties >> cell & 1:
+                    child = -solve(opponent, mover | (1 << cell), not x_to_move, cell)
+                    if score is None or child > score:
+                        score, best_move = child, cell
+            value = (score > 0) - (score < 0)
+            table[code] = encode_entry(value, best_move)
+        scores[code] = score
+        return score
+
+    solve(0, 0, True, None)
+    return table
+
+
+def write_table(path=DEFAULT_PATH):
+    """Generate the table and atomically put it at path.
+
+    The table is written to a temporary file next to path and renamed over
+    it, so processes that already mapped an older file keep a valid map and
+    concurrent writers never expose a partly written table.
+    """
+    table = build_table()
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".opening_book-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(table)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return sum(1 for entry in table if entry)
+
+
+def ensure_table(path=DEFAULT_PATH):
+    """Write the table at path unless it already exists."""
+    if not os.path.exists(path):
+        write_table(path)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a table written by write_table."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """Map the table at path."""
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC or len(self._map) != len(MAGIC) + TABLE_SIZE:
+            self._map.close()
+            raise ValueError(f"{path} is not a Tic-Tac-Toe opening book.")
+
+    def lookup(self, x_mask, o_mask):
+        """Return (value, move) for the side to move in a position."""
+        entry = self._map[len(MAGIC) + TERNARY[x_mask] + 2 * TERNARY[o_mask]]
+        if not entry:
+            raise ValueError("Position is not reachable in a legal game.")
+        return decode_entry(entry)
+
+    def lookup_board(self, board):
+        """Return (value, move) for a 3x3 Board with X and O on it."""
+        if board.size != 3 or board.win_length != 3:
+            raise ValueError("The opening book only covers the 3x3 game.")
+        return self.lookup(board.masks.get('X', 0), board.masks.get('O', 0))
+
+    def close(self):
+        """Release the memory map."""
+        self._map.close()
+
+
+class BookPlayer(Player):
+    """A perfect 3x3 player that answers every move with one table lookup."""
+
+    def __init__(self, name, symbol, path=DEFAULT_PATH):
+        """Initialize the player, generating the table at path if missing."""
+        super().__init__(name, symbol)
+        ensure_table(path)
+        self.book = OpeningBook(path)
+
+    def get_move(self, board=None):
+        """Return the stored best (row, col) for the board."""
+        if board is None:
+            raise ValueError("BookPlayer needs the board to choose a move.")
+        _, move = self.book.lookup_board(board)
+        if move is None:
+            raise ValueError("The game is already over.")
+        return divmod(move, 3)
+
+
+if __name__ == "__main__":
+    positions = write_table()
+    print(f"Wrote {positions} positions to {DEFAULT_PATH}")
@@ -0,0 +1,238 @@
+"""
+Headless Tic-Tac-Toe simulator
+Plays many games between pluggable move policies with no I/O and spreads the
+batches over a process pool.
+"""
+
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from tic_tac_toe import Board
+
+
+class RandomPolicy:
+    """Plays a uniformly random empty cell."""
+
+    def __call__(self, board, symbol, rng):
+        """Return a random valid (row, col)."""
+        occupied = board.occupied
+        empties = [cell for cell in range(board.size * board.size) if not occupied >> cell & 1]
+        return divmod(rng.choice(empties), board.size)
+
+
+class ScriptedPolicy:
+    """Plays the first still-empty move from a fixed list, then random moves."""
+
+    def __init__(self, moves):
+        """Initialize with a list of (row, col) moves in order of preference."""
+        self.moves = list(moves)
+        self._fallback = RandomPolicy()
+
+    def __call__(self, board, symbol, rng):
+        """Return the next scripted move that is still valid."""
+        for row, col in self.moves:
+            if board.is_valid_move(row, col):
+                return row, col
+        return self._fallback(board, symbol, rng)
+
+
+class AIPolicy:
+    """Plays with ai_player.AIPlayer; the engine is built lazily per process."""
+
+    def __init__(self, max_depth=None, time_limit=None):
+        """Initialize with the AIPlayer search limits."""
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self._players = {}
+
+    def __getstate__(self):
+        """Drop the search tables when the policy is sent to a worker."""
+        state = self.__dict__.copy()
+        state["_players"] = {}
+        return state
+
+    def __call__(self, board, symbol, rng):
+        """Return the searched (row, col) for symbol."""
+        player = self._players.get(symbol)
+        if player is None:
+            from ai_player import AIPlayer
+            player = AIPlayer("AI", symbol, self.max_depth, self.time_limit)
+            self._players[symbol] = player
+        return player.get_move(board)
+
+
+class BookPolicy:
+    """Plays from the opening_book table (3x3 only)."""
+
+    def __init__(self, path=None):
+        """Initialize with the table path (default: opening_book.DEFAULT_PATH)."""
+        self.path = path
+        self._player = None
+
+    def __getstate__(self):
+        """Drop the memory map when the policy is sent to a worker."""
+        state = self.__dict__.copy()
+        state["_player"] = None
+        return state
+
+    def prepare(self):
+        """Write the table if it is missing, before workers start mapping it."""
+        from opening_book import DEFAULT_PATH, ensure_table
+        ensure_table(self.path or DEFAULT_PATH)
+
+    def __call__(self, board, symbol, rng):
+        """Return the table's best (row, col)."""
+        if self._player is None:
+            from opening_book import BookPlayer, DEFAULT_PATH
+            self._player = BookPlayer("Book", symbol, self.path or DEFAULT_PATH)
+        return self._player.get_move(board)
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "ai": AIPolicy,
+    "book": BookPolicy,
+}
+
+
+class SimulationStats:
+    """Aggregate results of simulated games, from the first policy's side."""
+
+    def __init__(self, wins=0, draws=0, losses=0, moves=0):
+        """Initialize the counters."""
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+        self.moves = moves
+
+    @property
+    def games(self):
+        """Total number of games played."""
+        return self.wins + self.draws + self.losses
+
+    def merge(self, other):
+        """Add another batch's counts to these and return self."""
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.moves += other.moves
+        return self
+
+    def as_dict(self):
+        """Return the counts as a plain dictionary."""
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "moves": self.moves,
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, SimulationStats) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return (f"SimulationStats(wins={self.wins}, draws={self.draws}, "
+                f"losses={self.losses}, moves={self.moves})")
+
+
+def play_headless(board, first, second, rng, symbols=('X', 'O')):
+    """Play one game on an empty board and return (winner_index, moves).
+
+    winner_index is 0 or 1 for the policy that won, or None for a draw.
+    """
+    policies = (first, second)
+    index = 0
+    moves = 0
+    while True:
+        row, col = policies[index](board, symbols[index], rng)
+        if not board.make_move(row, col, symbols[index]):
+            raise ValueError(f"Policy {policies[index]!r} played an invalid move {row},{col}.")
+        moves += 1
+        if board.check_winner() is not None:
+            return index, moves
+        if board.is_full():
+            return None, moves
+        index = 1 - index
+
+
+def run_batch(games, first, second, size=3, win_length=None, seed=0):
+    """Play games games in this process and return their SimulationStats."""
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    board = Board(size, win_length)
+    for _ in range(games):
+        board.clear()
+        winner, moves = play_headless(board, first, second, rng)
+        stats.moves += moves
+        if winner is None:
+            stats.draws += 1
+        elif winner == 0:
+            stats.wins += 1
+        else:
+            stats.losses += 1
+    return stats
+
+
+def _run_batch_args(args):
+    """Unpack a batch description for ProcessPoolExecutor.map."""
+    return run_batch(*args)
+
+
+def simulate(games, first, second, size=3, win_length=None, workers=None,
+             seed=0, batch_size=10_000):
+    """Play games games of first (X) against second (O).
+
+    Games are cut into batches of batch_size; every batch gets its own seed
+    derived from seed and its index, so results are reproducible no matter
+    how many workers run them. workers=1 plays in this process, otherwise a
+    ProcessPoolExecutor with workers processes (default: all CPUs) is used.
+    """
+    if games < 0:
+        raise ValueError("Number of games must not be negative.")
+    batches = []
+    for index, start in enumerate(range(0, games, batch_size)):
+        count = min(batch_size, games - start)
+        batches.append((count, first, second, size, win_length, f"{seed}:{index}"))
+
+    total = SimulationStats()
+    if workers == 1 or len(batches) <= 1:
+        for batch in batches:
+            total.merge(_run_batch_args(batch))
+        return total
+
+    # one-time setup such as BookPolicy's table happens here, not in every worker
+    for policy in (first, second):
+        if hasattr(policy, "prepare"):
+            policy.prepare()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for stats in executor.map(_run_batch_args, batches):
+            total.merge(stats)
+    return total
+
+
+def main():
+    """Run a simulation from the command line."""
+    parser = argparse.ArgumentParser(description="Simulate Tic-Tac-Toe games without I/O.")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--first", choices=POLICIES, default="random", help="policy playing X")
+    parser.add_argument("--second", choices=POLICIES, default="random", help="policy playing O")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    stats = simulate(args.games, POLICIES[args.first](), POLICIES[args.second](),
+                     args.size, args.win_length, args.workers, args.seed, args.batch_size)
+    print(f"Games: {stats.games}")
+    print(f"{args.first} (X) wins: {stats.wins}")
+    print(f"Draws: {stats.draws}")
+    print(f"{args.second} (O) wins: {stats.losses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Test script for the Tic-Tac-Toe AI player
+Tests the negamax search on solved and larger boards
+"""
+
+import sys
+import time
+from tic_tac_toe import Board, TicTacToeGame
+from ai_player import AIPlayer, NegamaxEngine
+
+
+def play_out(board, players):
+    """Let players alternate on board until the game ends."""
+    index = 0
+    while board.check_winner() is None and not board.is_full():
+        row, col = players[index].get_move(board)
+        assert board.make_move(row, col, players[index].symbol)
+        index = 1 - index
+    return board.check_winner()
+
+
+def test_perfect_play_draws():
+    """Test that two perfect players always draw on 3x3."""
+    print("Testing perfect play...")
+    start = time.perf_counter()
+    assert play_out(Board(), [AIPlayer("A", 'X'), AIPlayer("B", 'O')]) == None
+    assert time.perf_counter() - start < 1.0
+    print("✓ Perfect play test passed")
+
+
+def test_takes_win_and_blocks():
+    """Test that the AI completes its own line before blocking."""
+    print("Testing win and block...")
+    board = Board()
+    board.make_move(0, 0, 'X')
+    board.make_move(1, 0, 'O')
+    board.make_move(0, 1, 'X')
+    board.make_move(1, 1, 'O')
+    # X to move can win at (0,2); O would win at (1,2)
+    assert AIPlayer("AI", 'X').get_move(board) == (0, 2)
+
+    board = Board()
+    board.make_move(0, 0, 'X')
+    board.make_move(1, 1, 'O')
+    board.make_move(0, 1, 'X')
+    assert AIPlayer("AI", 'O').get_move(board) == (0, 2)
+    print("✓ Win and block test passed")
+
+
+def test_symmetry_shrinks_table():
+    """Test that folding symmetric positions gives the same value in fewer entries."""
+    print("Testing symmetry folding...")
+    folded = NegamaxEngine(3, 3, use_symmetry=True)
+    plain = NegamaxEngine(3, 3, use_symmetry=False)
+    _, folded_value = folded.search(0, 0, 0)
+    _, plain_value = plain.search(0, 0, 0)
+    assert folded_value == plain_value == 0
+    assert len(folded.table) < len(plain.table)
+    print("✓ Symmetry folding test passed")
+
+
+def test_depth_limited_search():
+    """Test depth-limited and timed search on larger boards."""
+    print("Testing depth-limited search...")
+    board = Board(9, 4)
+    for col in range(3):
+        board.make_move(4, col + 2, 'X')
+    board.make_move(0, 0, 'O')
+    board.make_move(8, 8, 'O')
+    player = AIPlayer("AI", 'X', max_depth=2)
+    row, col = player.get_move(board)
+    board.make_move(row, col, 'X')
+    assert board.check_winner() == 'X'
+
+    start = time.perf_counter()
+    row, col = AIPlayer("AI", 'X', max_depth=50, time_limit=0.2).get_move(Board(9, 4))
+    assert time.perf_counter() - start < 2.0
+    assert Board(9, 4).is_valid_move(row, col)
+    print("✓ Depth-limited search test passed")
+
+
+def test_long_lines_do_not_outscore_wins():
+    """Test that evaluate() stays below a win when K is large."""
+    print("Testing long win lines...")
+    board = Board(19, 7)
+    for col in range(3, 9):
+        board.make_move(9, col, 'X')
+    for col in (0, 5, 10, 12, 15, 18):
+        board.make_move(0, col, 'O')
+    player = AIPlayer("AI", 'X', max_depth=2)
+    assert player.get_move(board) in [(9, 2), (9, 9)]
+    engine = player.engine
+    assert abs(engine.evaluate(board.masks['X'], board.masks['O'])) < engine.win_score
+    print("✓ Long win lines test passed")
+
+
+def test_game_accepts_ai_player():
+    """Test that TicTacToeGame can seat a computer player."""
+    print("Testing AI seat...")
+    game = TicTacToeGame()
+    game.add_player("Human", 'X')
+    game.add_player("Computer", 'O', AIPlayer, max_depth=3)
+    assert isinstance(game.players[1], AIPlayer)
+    assert game.players[1].max_depth == 3
+    print("✓ AI seat test passed")
+
+
+def test_board_hash_matches_engine():
+    """Test that Board.hash is the engine's key for the unrotated position."""
+    print("Testing board hash...")
+    board = Board()
+    for row, col, symbol in [(0, 0, 'X'), (1, 1, 'O'), (2, 2, 'X')]:
+        board.make_move(row, col, symbol)
+    engine = NegamaxEngine(3, 3)
+    x_mask, o_mask = board.masks['X'], board.masks['O']
+    hashes = engine.hashes(o_mask, x_mask, 1)
+    assert hashes[0] == board.hash ^ engine.side_key
+    assert engine.hashes(o_mask, x_mask, 1, board.hash) == hashes
+    print("✓ Board hash test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe AI Tests")
+    print("=" * 40)
+
+    try:
+        test_perfect_play_draws()
+        test_takes_win_and_blocks()
+        test_symmetry_shrinks_table()
+        test_depth_limited_search()
+        test_long_lines_do_not_outscore_wins()
+        test_game_accepts_ai_player()
+        test_board_hash_matches_engine()
+
+        print("\n" + "=" * 40)
+        print("🎉 All AI tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+"""
+Test script for vectorised Tic-Tac-Toe evaluation
+Checks the NumPy batch results against Board, position by position
+"""
+
+import sys
+import random
+from tic_tac_toe import Board
+from batch_eval import (array_to_grids, boards_to_array, grids_to_array,
+                        is_full, legal_moves, np, winners)
+
+
+def random_boards(count, size, win_length, seed):
+    """Play random games and stop each one at a random point."""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board(size, win_length)
+        symbol = 'X'
+        for _ in range(rng.randint(0, size * size)):
+            if board.check_winner() is not None or board.is_full():
+                break
+            empties = [(r, c) for r in range(size) for c in range(size) if board.is_valid_move(r, c)]
+            board.make_move(*rng.choice(empties), symbol)
+            symbol = 'O' if symbol == 'X' else 'X'
+        boards.append(board)
+    return boards
+
+
+def check_against_boards(boards, win_length):
+    """Compare every batch result with the Board methods."""
+    positions = boards_to_array(boards)
+    assert np.array_equal(positions, grids_to_array([board.grid for board in boards]))
+
+    expected_winner = [{'X': 1, 'O': -1, None: 0}[board.check_winner()] for board in boards]
+    assert winners(positions, win_length).tolist() == expected_winner
+    assert is_full(positions).tolist() == [board.is_full() for board in boards]
+
+    moves = legal_moves(positions, win_length)
+    for index, board in enumerate(boards):
+        for row in range(board.size):
+            for col in range(board.size):
+                expected = board.is_valid_move(row, col) and board.check_winner() is None
+                assert bool(moves[index, row, col]) == expected
+
+
+def test_three_by_three():
+    """Test batch evaluation of classic boards."""
+    print("Testing 3x3 batch evaluation...")
+    if np is None:
+        print("NumPy not installed, skipping")
+        return
+    check_against_boards(random_boards(500, 3, 3, seed=1), 3)
+    print("✓ 3x3 batch evaluation test passed")
+
+
+def test_k_in_a_row():
+    """Test batch evaluation of larger K-in-a-row boards."""
+    print("Testing K-in-a-row batch evaluation...")
+    if np is None:
+        print("NumPy not installed, skipping")
+        return
+    check_against_boards(random_boards(200, 7, 4, seed=2), 4)
+    check_against_boards(random_boards(20, 10, 5, seed=3), 5)
+    print("✓ K-in-a-row batch evaluation test passed")
+
+
+def test_grid_round_trip():
+    """Test conversion to and from the Board.grid format."""
+    print("Testing grid round trip...")
+    if np is None:
+        print("NumPy not installed, skipping")
+        return
+    grids = [board.grid for board in random_boards(50, 3, 3, seed=4)]
+    assert array_to_grids(grids_to_array(grids)) == grids
+    assert grids_to_array([]).shape == (0, 0, 0)
+    print("✓ Grid round trip test passed")
+
+
+def test_empty_batch():
+    """Test that an empty batch gives empty results."""
+    print("Testing empty batch...")
+    if np is None:
+        print("NumPy not installed, skipping")
+        return
+    for positions in (grids_to_array([]), np.zeros((0, 3, 3), dtype=np.int8)):
+        assert winners(positions).shape == (0,)
+        assert is_full(positions).shape == (0,)
+        assert legal_moves(positions).shape == positions.shape
+    print("✓ Empty batch test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe Batch Evaluation Tests")
+    print("=" * 40)
+
+    try:
+        test_three_by_three()
+        test_k_in_a_row()
+        test_grid_round_trip()
+        test_empty_batch()
+
+        print("\n" + "=" * 40)
+        print("🎉 All batch evaluation tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,193 @@
+"""
+Test script for Tic-Tac-Toe game records
+Tests the binary log format, streaming I/O and replay validation
+"""
+
+import asyncio
+import io
+import os
+import random
+import sys
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from tic_tac_toe import TicTacToeGame
+from game_record import (GameRecord, GameRecordReader, GameRecordWriter, InvalidRecord,
+                         MAGIC, replay, replay_to_board, validate_log)
+from game_server import GameServer
+from load_client import GameClient, run_load
+from simulator import RandomPolicy
+
+
+def random_records(count, size=3, win_length=None, seed=0):
+    """Play random games through TicTacToeGame and return their records."""
+    rng = random.Random(seed)
+    policy = RandomPolicy()
+    records = []
+    game = TicTacToeGame(size, win_length)
+    game.add_player("A", 'X')
+    game.add_player("B", 'O')
+    for _ in range(count):
+        game.reset_game()
+        while True:
+            row, col = policy(game.board, game.get_current_player().symbol, rng)
+            game.make_move(row, col)
+            result, winner = game.check_game_over()
+            if result != "continue":
+                break
+            game.switch_player()
+        records.append(GameRecord.from_game(game, winner or "draw"))
+    return records
+
+
+def test_record_round_trip():
+    """Test writing and streaming back many records."""
+    print("Testing record round trip...")
+    records = random_records(500) + random_records(50, 15, 5, seed=1)
+    stream = io.BytesIO()
+    with GameRecordWriter(stream) as writer:
+        for record in records:
+            writer.write(record)
+    assert writer.count == len(records)
+
+    data = stream.getvalue()
+    assert data.startswith(MAGIC)
+    assert len(data) == len(MAGIC) + sum(5 + len(record.moves) for record in records)
+    assert list(GameRecordReader(io.BytesIO(data))) == records
+
+    try:
+        list(GameRecordReader(io.BytesIO(data[:-1])))
+        assert False, "a truncated log should be rejected"
+    except InvalidRecord:
+        pass
+    print("✓ Record round trip test passed")
+
+
+def test_replay_validation():
+    """Test that replay accepts real games and rejects broken ones."""
+    print("Testing replay validation...")
+    counts = validate_log(random_records(300, seed=2))
+    assert counts["games"] == 300 and counts["invalid"] == 0
+    assert counts["X"] + counts["O"] + counts["draw"] == 300
+
+    # X wins along the top row on move 5
+    win = GameRecord(3, 3, 'X', [0, 3, 1, 4, 2])
+    assert replay(win) == 'X'
+    assert replay_to_board(win).grid[0] == ['X', 'X', 'X']
+
+    broken = [
+        GameRecord(3, 3, 'X', [0, 3, 1, 4, 2, 5]),  # move after the win
+        GameRecord(3, 3, None, [0, 0]),              # occupied cell
+        GameRecord(3, 3, None, [9]),                 # off the board
+        GameRecord(3, 3, 'O', [0, 3, 1, 4, 2]),      # wrong result
+        GameRecord(3, 3, 'draw', [4]),               # not finished
+    ]
+    for record in broken:
+        try:
+            replay(record)
+            assert False, f"{record!r} should be rejected"
+        except InvalidRecord:
+            pass
+    assert validate_log(broken)["invalid"] == len(broken)
+    print("✓ Replay validation test passed")
+
+
+def test_game_records_its_rounds():
+    """Test that an interactive session archives every round."""
+    print("Testing session recording...")
+    stream = io.BytesIO()
+    writer = GameRecordWriter(stream)
+    game = TicTacToeGame(recorder=writer)
+    inputs = ["Alice", "Bob", "0,0", "1,0", "0,1", "1,1", "0,2", "y",
+              "1,1", "0,0", "2,2", "0,1", "2,0", "0,2", "n"]
+    with patch('builtins.input', side_effect=inputs), patch('sys.stdout', new=StringIO()):
+        game.play_game()
+
+    stream.seek(0)
+    records = list(GameRecordReader(stream))
+    assert records == [GameRecord(3, 3, 'X', [0, 3, 1, 4, 2]),
+                       GameRecord(3, 3, 'O', [4, 0, 8, 1, 6, 2])]
+    print("✓ Session recording test passed")
+
+
+def test_server_archives_games():
+    """Test that the game server writes a record for every finished game."""
+    print("Testing server archive...")
+
+    async def scenario(writer):
+        server = GameServer(seed=3, recorder=writer)
+        host, port = await server.start()
+        await run_load(connections=10, games=3, host=host, port=port)
+        await server.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.log")
+        with GameRecordWriter(path) as writer:
+            asyncio.run(scenario(writer))
+        with GameRecordReader(path) as reader:
+            counts = validate_log(reader)
+    assert counts["games"] == 30
+    assert counts["invalid"] == 0 and counts["unfinished"] == 0
+    print("✓ Server archive test passed")
+
+
+def test_large_boards_are_refused():
+    """Test that boards over 16x16 are refused before any round is played."""
+    print("Testing large boards...")
+    writer = GameRecordWriter(io.BytesIO())
+    try:
+        TicTacToeGame(19, 5, recorder=writer)
+        assert False, "a 19x19 game should not accept a recorder"
+    except ValueError:
+        pass
+    game = TicTacToeGame(20, 5)
+    game.move_history.append((19, 19))
+    try:
+        GameRecord.from_game(game, None)
+        assert False, "a 20x20 game cannot be recorded"
+    except ValueError as e:
+        assert "16x16" in str(e)
+
+    async def scenario():
+        server = GameServer(recorder=writer)
+        host, port = await server.start()
+        client = await GameClient.connect(host, port)
+        await client.send({"op": "new", "size": 20})
+        reply = await client.receive()
+        await client.close()
+        await server.close()
+        return reply
+
+    reply = asyncio.run(scenario())
+    assert reply["op"] == "error" and "16x16" in reply["message"]
+    print("✓ Large boards test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe Game Record Tests")
+    print("=" * 40)
+
+    try:
+        test_record_round_trip()
+        test_replay_validation()
+        test_game_records_its_rounds()
+        test_server_archives_games()
+        test_large_boards_are_refused()
+
+        print("\n" + "=" * 40)
+        print("🎉 All game record tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,195 @@
+"""
+Test script for the asyncio Tic-Tac-Toe server
+Runs the server and load generator together on localhost
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from game_server import GameServer
+from load_client import GameClient, run_load
+
+
+def test_concurrent_games():
+    """Test many clients playing at the same time."""
+    print("Testing concurrent games...")
+
+    async def scenario():
+        server = GameServer(seed=1)
+        host, port = await server.start()
+        results = await run_load(connections=50, games=4, host=host, port=port)
+        await server.close()
+        return server, results
+
+    server, results = asyncio.run(scenario())
+    assert results["games"] == 200
+    assert results["errors"] == 0 and results["timeouts"] == 0
+    assert results["wins"] + results["draws"] + results["losses"] == 200
+    assert server.games_played == 200
+    assert server.active_games == 0
+    print("✓ Concurrent games test passed")
+
+
+def test_move_timeout():
+    """Test that a client who stops moving forfeits on time."""
+    print("Testing move timeout...")
+
+    async def scenario():
+        server = GameServer(move_timeout=0.05)
+        host, port = await server.start()
+        client = await GameClient.connect(host, port)
+        await client.send({"op": "new", "first": True})
+        started = await client.receive()
+        state = await client.receive()
+        final = await client.receive()
+        await client.close()
+        await server.close()
+        return started, state, final
+
+    started, state, final = asyncio.run(scenario())
+    assert started["symbol"] == 'X'
+    assert state["result"] is None and state["to_move"] == 'X'
+    assert final["result"] == "timeout"
+    print("✓ Move timeout test passed")
+
+
+def test_protocol_errors():
+    """Test invalid moves, moves out of turn and bad requests."""
+    print("Testing protocol errors...")
+
+    async def scenario():
+        server = GameServer()
+        host, port = await server.start()
+        client = await GameClient.connect(host, port)
+        replies = []
+
+        await client.send({"op": "dance"})
+        replies.append(await client.receive())
+        await client.send({"op": "new", "size": 3, "win_length": 5})
+        replies.append(await client.receive())
+
+        await client.send({"op": "new", "first": True})
+        game = (await client.receive())["game"]
+        await client.receive()
+        await client.send({"op": "move", "game": game, "row": 5, "col": 5})
+        replies.append(await client.receive())
+        replies.append(await client.receive())  # the position is sent again
+        await client.send({"op": "move", "game": game, "row": 1, "col": 1})
+        await client.send({"op": "move", "game": game, "row": 0, "col": 0})
+        replies.append(await client.receive())
+        await client.close()
+        await server.close()
+        return replies
+
+    unknown, bad_board, invalid, resent, out_of_turn = asyncio.run(scenario())
+    assert unknown["op"] == "error"
+    assert bad_board["op"] == "error"
+    assert invalid["op"] == "error" and "Invalid move" in invalid["message"]
+    assert resent["op"] == "state" and resent["to_move"] == 'X'
+    assert out_of_turn["op"] == "error" and "not your turn" in out_of_turn["message"]
+    print("✓ Protocol errors test passed")
+
+
+def test_server_error_is_reported():
+    """Test that a failure inside a game reaches the client as an error result."""
+    print("Testing server errors...")
+
+    class BrokenRecorder:
+        def write_game(self, game, result):
+            raise OSError("disk full")
+
+    async def scenario():
+        server = GameServer(recorder=BrokenRecorder())
+        host, port = await server.start()
+        client = await GameClient.connect(host, port)
+        await client.send({"op": "new", "first": True})
+        game = (await client.receive())["game"]
+        replies = []
+        while not replies or replies[-1]["op"] != "state" or replies[-1]["result"] is None:
+            reply = await asyncio.wait_for(client.receive(), 5)
+            if reply["op"] == "state" and reply["result"] is None:
+                row, col = next((row, col) for row, line in enumerate(reply["board"])
+                                for col, cell in enumerate(line) if cell == ' ')
+                await client.send({"op": "move", "game": game, "row": row, "col": col})
+                continue
+            replies.append(reply)
+        await client.close()
+        await server.close()
+        return server, replies
+
+    server, replies = asyncio.run(scenario())
+    error, final = replies[-2:]
+    assert error["op"] == "error" and "disk full" in error["message"]
+    assert final["op"] == "state" and final["result"] == "error"
+    assert server.active_games == 0
+
+    async def timeout_scenario():
+        server = GameServer(move_timeout=0.05, recorder=BrokenRecorder())
+        host, port = await server.start()
+        client = await GameClient.connect(host, port)
+        await client.send({"op": "new", "first": True})
+        replies = [await asyncio.wait_for(client.receive(), 5) for _ in range(4)]
+        await client.close()
+        await server.close()
+        return server, replies
+
+    # a timed-out game whose record cannot be written still gets its final state
+    server, replies = asyncio.run(timeout_scenario())
+    started, state, error, final = replies
+    assert started["op"] == "started" and state["result"] is None
+    assert error["op"] == "error" and "disk full" in error["message"]
+    assert final["op"] == "state" and final["result"] == "error"
+    assert server.active_games == 0
+    print("✓ Server errors test passed")
+
+
+def test_unix_socket():
+    """Test serving games over a Unix socket."""
+    print("Testing Unix socket...")
+    if not hasattr(asyncio, "start_unix_server"):
+        print("Unix sockets not available, skipping")
+        return
+
+    async def scenario(path):
+        server = GameServer()
+        await server.start_unix(path)
+        results = await run_load(connections=5, games=2, unix_path=path, opponent="ai")
+        await server.close()
+        return results
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = asyncio.run(scenario(os.path.join(directory, "ttt.sock")))
+    assert results["games"] == 10
+    assert results["wins"] == 0
+    print("✓ Unix socket test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe Server Tests")
+    print("=" * 40)
+
+    try:
+        test_concurrent_games()
+        test_move_timeout()
+        test_protocol_errors()
+        test_server_error_is_reported()
+        test_unix_socket()
+
+        print("\n" + "=" * 40)
+        print("🎉 All server tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
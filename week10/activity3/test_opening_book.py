@@ -0,0 +1,159 @@
+"""
+Test script for the Tic-Tac-Toe opening book
+Tests the generated perfect-play table against the search engine
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+from tic_tac_toe import Board
+from ai_player import AIPlayer, NegamaxEngine
+from opening_book import (BookPlayer, OpeningBook, TABLE_SIZE, build_table,
+                          decode_entry, write_table)
+from simulator import BookPolicy, RandomPolicy, simulate
+
+
+def decode_code(code):
+    """Turn a base-3 position code back into (x_mask, o_mask)."""
+    x_mask = o_mask = 0
+    for cell in range(9):
+        code, digit = divmod(code, 3)
+        if digit == 1:
+            x_mask |= 1 << cell
+        elif digit == 2:
+            o_mask |= 1 << cell
+    return x_mask, o_mask
+
+
+def test_reachable_positions():
+    """Test that exactly the 5,478 legal positions are stored."""
+    print("Testing reachable positions...")
+    table = build_table()
+    assert len(table) == TABLE_SIZE
+    assert sum(1 for entry in table if entry) == 5478
+    assert decode_entry(table[0]) == (0, 0)
+    print("✓ Reachable positions test passed")
+
+
+def test_values_match_search():
+    """Test every stored value against the negamax engine."""
+    print("Testing values against search...")
+    table = build_table()
+    engine = NegamaxEngine(3, 3)
+    for code, entry in enumerate(table):
+        value, move = decode_entry(entry)
+        if not entry or move is None:
+            continue
+        x_mask, o_mask = decode_code(code)
+        x_to_move = bin(x_mask).count("1") == bin(o_mask).count("1")
+        mover, opponent = (x_mask, o_mask) if x_to_move else (o_mask, x_mask)
+        _, score = engine.search(mover, opponent, 0 if x_to_move else 1)
+        assert value == (score > 0) - (score < 0)
+        assert not (mover | opponent) >> move & 1
+    print("✓ Values against search test passed")
+
+
+def test_book_player():
+    """Test that the book player never loses and reads the file it wrote."""
+    print("Testing book player...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.bin")
+        players = [BookPlayer("Book", 'X', path), AIPlayer("AI", 'O')]
+        assert os.path.exists(path)
+
+        board = Board()
+        index = 0
+        while board.check_winner() is None and not board.is_full():
+            row, col = players[index].get_move(board)
+            assert board.make_move(row, col, players[index].symbol)
+            index = 1 - index
+        assert board.check_winner() == None
+
+        # X has just completed the top row: O to move has lost
+        book = OpeningBook(path)
+        board = Board()
+        for row, col, symbol in [(0, 0, 'X'), (1, 0, 'O'), (0, 1, 'X'),
+                                 (1, 1, 'O'), (0, 2, 'X')]:
+            board.make_move(row, col, symbol)
+        assert book.lookup_board(board) == (-1, None)
+        book.close()
+        players[0].book.close()
+    print("✓ Book player test passed")
+
+
+def test_rejects_bad_file():
+    """Test that a file without the book header is refused."""
+    print("Testing bad book file...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bad.bin")
+        with open(path, "wb") as handle:
+            handle.write(b"not a book")
+        try:
+            OpeningBook(path)
+            assert False, "a bad file should be rejected"
+        except ValueError:
+            pass
+        assert write_table(path) == 5478
+        OpeningBook(path).close()
+    print("✓ Bad book file test passed")
+
+
+def _start_player(path):
+    """Create a BookPlayer in a child process and look up the empty board."""
+    player = BookPlayer("Book", 'X', path)
+    move = player.get_move(Board())
+    player.book.close()
+    return move
+
+
+def test_concurrent_writers():
+    """Test that processes creating the table at once all get a valid book."""
+    print("Testing concurrent table writers...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.bin")
+        with multiprocessing.get_context("spawn").Pool(8) as pool:
+            moves = pool.map(_start_player, [path] * 8)
+        assert len(set(moves)) == 1
+        assert os.listdir(directory) == ["book.bin"]
+
+        # rewriting the table must not disturb an existing map
+        book = OpeningBook(path)
+        write_table(path)
+        assert book.lookup(0, 0) == decode_entry(build_table()[0])
+        book.close()
+
+        fresh = os.path.join(directory, "fresh.bin")
+        stats = simulate(40, BookPolicy(fresh), RandomPolicy(), workers=4, batch_size=10)
+        assert stats.games == 40 and stats.losses == 0
+    print("✓ Concurrent table writers test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe Opening Book Tests")
+    print("=" * 40)
+
+    try:
+        test_reachable_positions()
+        test_values_match_search()
+        test_book_player()
+        test_rejects_bad_file()
+        test_concurrent_writers()
+
+        print("\n" + "=" * 40)
+        print("🎉 All opening book tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,93 @@
+"""
+Test script for the headless Tic-Tac-Toe simulator
+Tests policies, seeding and the process pool
+"""
+
+import sys
+import random
+from tic_tac_toe import Board
+from simulator import (AIPolicy, RandomPolicy, ScriptedPolicy, SimulationStats,
+                       play_headless, simulate)
+
+
+def test_random_games_are_reproducible():
+    """Test that the same seed gives the same statistics."""
+    print("Testing reproducible random games...")
+    first = simulate(2000, RandomPolicy(), RandomPolicy(), workers=1, seed=7, batch_size=500)
+    second = simulate(2000, RandomPolicy(), RandomPolicy(), workers=1, seed=7, batch_size=500)
+    assert first == second
+    assert first.games == 2000
+    # Random play on 3x3 favours the first player
+    assert first.wins > first.losses > first.draws
+    print("✓ Reproducible random games test passed")
+
+
+def test_process_pool_matches_inline():
+    """Test that splitting batches across processes changes nothing."""
+    print("Testing process pool...")
+    inline = simulate(1000, RandomPolicy(), RandomPolicy(), workers=1, seed=3, batch_size=100)
+    pooled = simulate(1000, RandomPolicy(), RandomPolicy(), workers=2, seed=3, batch_size=100)
+    assert inline == pooled
+    print("✓ Process pool test passed")
+
+
+def test_ai_never_loses():
+    """Test that the AI policy never loses to random play."""
+    print("Testing AI policy...")
+    stats = simulate(100, RandomPolicy(), AIPolicy(), workers=1, seed=1)
+    assert stats.games == 100
+    assert stats.wins == 0
+    print("✓ AI policy test passed")
+
+
+def test_scripted_policy():
+    """Test that a scripted policy follows its move list."""
+    print("Testing scripted policy...")
+    script = ScriptedPolicy([(0, 0), (0, 1), (0, 2)])
+    blocker = ScriptedPolicy([(1, 0), (1, 1), (2, 2)])
+    winner, moves = play_headless(Board(), script, blocker, random.Random(0))
+    assert winner == 0
+    assert moves == 5
+
+    stats = SimulationStats(wins=1).merge(SimulationStats(draws=2, losses=1, moves=9))
+    assert stats.as_dict() == {"games": 4, "wins": 1, "draws": 2, "losses": 1, "moves": 9}
+    print("✓ Scripted policy test passed")
+
+
+def test_larger_boards():
+    """Test simulating K-in-a-row variants."""
+    print("Testing larger boards...")
+    stats = simulate(50, RandomPolicy(), RandomPolicy(), size=7, win_length=4, workers=1)
+    assert stats.games == 50
+    assert stats.moves >= 50 * 7
+    print("✓ Larger board test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tic-Tac-Toe Simulator Tests")
+    print("=" * 40)
+
+    try:
+        test_random_games_are_reproducible()
+        test_process_pool_matches_inline()
+        test_ai_never_loses()
+        test_scripted_policy()
+        test_larger_boards()
+
+        print("\n" + "=" * 40)
+        print("🎉 All simulator tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -103,6 +103,70 @@ def test_draw_detection():
     print("✓ Draw detection test passed")
 
 
+def test_bitboard_state():
+    """Test that the bitboard masks stay in step with the grid."""
+    print("Testing bitboard state...")
+    board = Board()
+    board.make_move(0, 0, 'X')
+    board.make_move(1, 1, 'O')
+    board.make_move(2, 2, 'X')
+
+    assert board.masks['X'] == (1 << 0) | (1 << 8)
+    assert board.masks['O'] == 1 << 4
+    assert board.occupied == board.masks['X'] | board.masks['O']
+    for row in range(3):
+        for col in range(3):
+            bit = 1 << (row * 3 + col)
+            expected = 'X' if board.masks['X'] & bit else 'O' if board.masks['O'] & bit else ' '
+            assert board.grid[row][col] == expected
+
+    # A rejected move must leave every mask untouched
+    assert board.make_move(1, 1, 'X') == False
+    assert board.masks['X'] == (1 << 0) | (1 << 8)
+    assert board.check_winner() == None
+    print("✓ Bitboard state test passed")
+
+
+def test_large_board():
+    """Test N x N boards won by K in a row."""
+    print("Testing large boards...")
+    board = Board(15, 5)
+    assert board.size == 15
+    assert len(board.grid) == 15
+    assert board.is_valid_move(14, 14) == True
+    assert board.is_valid_move(15, 0) == False
+
+    # Four in a row is not enough, the fifth stone wins
+    for col in range(3, 7):
+        board.make_move(7, col, 'X')
+    assert board.check_winner() == None
+    board.make_move(7, 7, 'X')
+    assert board.check_winner() == 'X'
+
+    # Diagonal away from the main diagonal
+    board = Board(15, 5)
+    for k in range(5):
+        board.make_move(2 + k, 10 - k, 'O')
+    assert board.check_winner() == 'O'
+
+    # Broken lines do not count
+    board = Board(6, 4)
+    for row in (0, 1, 3, 4):
+        board.make_move(row, 2, 'X')
+    assert board.check_winner() == None
+
+    try:
+        Board(3, 4)
+        assert False, "win length larger than the board should be rejected"
+    except ValueError:
+        pass
+
+    game = TicTacToeGame(size=19, win_length=5)
+    assert game.board.size == 19
+    assert game.board.win_length == 5
+    print("✓ Large board test passed")
+
+
 def test_player_creation():
     """Test player creation."""
     print("Testing player creation...")
@@ -149,6 +213,114 @@ def test_input_validation():
     print("✓ Input validation test passed")
 
 
+def test_session_loop():
+    """Test that several rounds reuse the board and players and keep scores."""
+    print("Testing session loop...")
+    game = TicTacToeGame()
+    board = game.board
+    inputs = [
+        "Alice", "Bob",
+        "0,0", "1,0", "0,1", "1,1", "0,2", "y",                      # Alice wins
+        "0,0", "0,1", "0,2", "1,1", "1,0", "1,2", "2,1", "2,0", "2,2",  # draw
+        "y",
+        "1,1", "0,0", "2,2", "0,1", "2,0", "0,2", "n",               # Bob wins
+    ]
+    with patch('builtins.input', side_effect=inputs), patch('sys.stdout', new=StringIO()):
+        game.play_game()
+
+    assert len(game.players) == 2
+    assert game.board is board
+    assert game.scores == {'X': 1, 'O': 1}
+    assert game.draws == 1
+    assert game.score_summary() == "Score: Alice 1, Bob 1, draws 1"
+
+    game.reset_game()
+    assert game.board is board
+    assert all(cell == ' ' for row in board.grid for cell in row)
+    assert board.occupied == 0
+    assert board.check_winner() == None
+    print("✓ Session loop test passed")
+
+
+def test_unmake_move():
+    """Test that taking moves back restores the board exactly."""
+    print("Testing unmake move...")
+    board = Board()
+    empty_hash = board.hash
+    moves = [(0, 0, 'X'), (1, 1, 'O'), (0, 1, 'X'), (2, 2, 'O'), (0, 2, 'X')]
+    snapshots = []
+    for row, col, symbol in moves:
+        snapshots.append(([r[:] for r in board.grid], dict(board.masks), board.occupied,
+                          board.hash, board.check_winner()))
+        board.make_move(row, col, symbol)
+    assert board.check_winner() == 'X'
+
+    for row, col, symbol in reversed(moves):
+        assert board.unmake_move() == (row, col, symbol)
+        grid, masks, occupied, key, winner = snapshots.pop()
+        assert board.grid == grid
+        assert all(board.masks.get(s, 0) == masks.get(s, 0) for s in 'XO')
+        assert board.occupied == occupied
+        assert board.hash == key
+        assert board.check_winner() == winner
+    assert board.hash == empty_hash
+
+    # The same position reached in a different order hashes the same
+    first, second = Board(), Board()
+    for row, col, symbol in [(0, 0, 'X'), (1, 1, 'O'), (2, 2, 'X')]:
+        first.make_move(row, col, symbol)
+    for row, col, symbol in [(2, 2, 'X'), (1, 1, 'O'), (0, 0, 'X')]:
+        second.make_move(row, col, symbol)
+    assert first.hash == second.hash
+
+    try:
+        Board().unmake_move()
+        assert False, "an empty board has nothing to take back"
+    except ValueError:
+        pass
+    print("✓ Unmake move test passed")
+
+
+def test_undo_redo():
+    """Test undo and redo on the board and the game."""
+    print("Testing undo and redo...")
+    game = TicTacToeGame()
+    game.add_player("Alice", 'X')
+    game.add_player("Bob", 'O')
+    for row, col in [(1, 1), (0, 0), (2, 2)]:
+        game.make_move(row, col)
+        game.switch_player()
+    assert game.get_current_player().name == "Bob"
+
+    assert game.undo() == True
+    assert game.undo() == True
+    assert game.get_current_player().name == "Bob"
+    assert game.move_history == [(1, 1)]
+    assert game.board.grid[0][0] == ' '
+
+    assert game.redo() == True
+    assert game.board.grid[0][0] == 'O'
+    assert game.get_current_player().name == "Alice"
+
+    # A new move drops whatever was left to redo
+    game.make_move(0, 2)
+    assert game.redo() == False
+    assert game.move_history == [(1, 1), (0, 0), (0, 2)]
+    assert game.undo() and game.undo() and game.undo()
+    assert game.undo() == False
+    assert game.board.occupied == 0
+
+    # unmake_move() also drops undone moves: they followed another position
+    board = Board()
+    board.make_move(0, 0, 'X')
+    board.make_move(1, 1, 'O')
+    board.undo()
+    board.unmake_move()
+    assert board.redo() is None
+    assert board.occupied == 0
+    print("✓ Undo and redo test passed")
+
+
 def run_all_tests():
     """Run all tests."""
     print("Running Tic-Tac-Toe Game Tests")
@@ -159,9 +331,14 @@ def run_all_tests():
         test_valid_moves()
         test_win_detection()
         test_draw_detection()
+        test_bitboard_state()
+        test_large_board()
         test_player_creation()
         test_game_initialization()
         test_input_validation()
+        test_session_loop()
+        test_unmake_move()
+        test_undo_redo()
         
         print("\n" + "=" * 40)
         print("🎉 All tests passed! The game is working correctly.")
@@ -1,66 +1,221 @@
 """
 Tic-Tac-Toe Game Implementation
-A complete OOP implementation of the classic 3x3 Tic-Tac-Toe game.
+A complete OOP implementation of the classic 3x3 Tic-Tac-Toe game,
+generalised to N x N boards won by K in a row (e.g. 15x15 Gomoku).
 """
 
+import argparse
+import random
 
-class Board:
-    """Represents the game board and handles board operations."""
 
-    def __init__(self):
-        """Initialize an empty 3x3 board."""
-        self.grid = [[' ' for _ in range(3)] for _ in range(3)]
-        self.size = 3
+def _build_win_masks(size, win_length):
+    """Return the bitmask of every win_length-long line on a size x size board."""
+    lines = []
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in directions:
+                end_row = row + d_row * (win_length - 1)
+                end_col = col + d_col * (win_length - 1)
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+                lines.append(sum(
+                    1 << ((row + d_row * k) * size + col + d_col * k)
+                    for k in range(win_length)
+                ))
+    return tuple(lines)
 
-    def display(self):
-        """Display the current state of the board."""
-        print("\n  0   1   2")
+
+def _build_lines_through(size, win_masks):
+    """Return, for each cell index, the winning lines that pass through it."""
+    through = [[] for _ in range(size * size)]
+    for mask in win_masks:
+        cell = 0
+        remaining = mask
+        while remaining:
+            if remaining & 1:
+                through[cell].append(mask)
+            remaining >>= 1
+            cell += 1
+    return tuple(tuple(lines) for lines in through)
+
+
+_LINE_TABLES = {}
+
+
+def line_tables(size, win_length):
+    """Return (win_masks, lines_through) for a board shape, building it once."""
+    key = (size, win_length)
+    if key not in _LINE_TABLES:
+        win_masks = _build_win_masks(size, win_length)
+        _LINE_TABLES[key] = (win_masks, _build_lines_through(size, win_masks))
+    return _LINE_TABLES[key]
+
+
+_ZOBRIST_KEYS = {}
+
+
+def zobrist_keys(size, seed=0):
+    """Return (cell_keys, side_key), the Zobrist keys of a size x size board.
+
+    cell_keys[cell] holds the 64-bit keys of X and O on that cell, and
+    side_key marks O to move. Board.hash and ai_player.NegamaxEngine share
+    these keys, so a board's hash is the engine's key for the position.
+    """
+    key = (size, seed)
+    if key not in _ZOBRIST_KEYS:
+        rng = random.Random(seed)
+        cell_keys = tuple((rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size * size))
+        _ZOBRIST_KEYS[key] = (cell_keys, rng.getrandbits(64))
+    return _ZOBRIST_KEYS[key]
+
+
+class Board:
+    """Represents the game board and handles board operations.
+
+    The position is held as bitboards: one integer mask per symbol plus an
+    occupancy mask, where bit ``row * size + col`` stands for a cell.
+    ``grid`` is kept in step with the masks as a list-of-lists view.
+
+    Every move is pushed on ``history`` so unmake_move can take it back in
+    constant time, restoring the masks, the cached winner and the Zobrist
+    ``hash`` without copying the board.
+    """
+
+    def __init__(self, size=3, win_length=None):
+        """Initialize an empty size x size board won by win_length in a row.
+
+        win_length defaults to size, which gives the classic 3x3 game.
+        """
+        if win_length is None:
+            win_length = size
+        if size < 1:
+            raise ValueError("Board size must be at least 1.")
+        if not 1 <= win_length <= size:
+            raise ValueError("Win length must be between 1 and the board size.")
+
+        self.size = size
+        self.win_length = win_length
+        self.grid = [[' ' for _ in range(size)] for _ in range(size)]
+        self.masks = {}
+        self.occupied = 0
+        self.full_mask = (1 << (size * size)) - 1
+        self.win_masks, self._lines_through = line_tables(size, win_length)
+        self._winner = None
+        self._zobrist = zobrist_keys(size)[0]
+        self.hash = 0
+        self.history = []
+        self._redo = []
+
+    def render(self):
+        """Return the board as text, with row and column numbers."""
+        width = len(str(self.size - 1))
+        indent = " " * (width + 1)
+        lines = [indent + "   ".join(f"{col:<{width}}" for col in range(self.size))]
         for i in range(self.size):
-            print(f"{i} {self.grid[i][0]} | {self.grid[i][1]} | {self.grid[i][2]}")
+            cells = " | ".join(f"{cell:<{width}}" for cell in self.grid[i])
+            lines.append(f"{i:>{width}} {cells}")
             if i < self.size - 1:
-                print("  ---------")
+                lines.append(indent + "-" * (self.size * (width + 3) - 3))
+        return "\n".join(lines)
+
+    def display(self):
+        """Display the current state of the board."""
+        print("\n" + self.render())
         print()
 
+    def clear(self):
+        """Empty the board in place so it can be reused for a new round."""
+        for row in self.grid:
+            for col in range(self.size):
+                row[col] = ' '
+        self.masks.clear()
+        self.occupied = 0
+        self._winner = None
+        self.hash = 0
+        self.history.clear()
+        self._redo.clear()
+
     def is_valid_move(self, row, col):
         """Check if a move is valid (within bounds and empty cell)."""
         if not (0 <= row < self.size and 0 <= col < self.size):
             return False
-        return self.grid[row][col] == ' '
+        return not self.occupied >> (row * self.size + col) & 1
 
     def make_move(self, row, col, symbol):
         """Make a move on the board."""
-        if self.is_valid_move(row, col):
-            self.grid[row][col] = symbol
-            return True
-        return False
+        if not self.is_valid_move(row, col):
+            return False
+        if self._redo:
+            self._redo.clear()
+        self._place(row, col, symbol)
+        return True
+
+    def _place(self, row, col, symbol):
+        """Put symbol on an empty cell and update the incremental state."""
+        cell = row * self.size + col
+        bit = 1 << cell
+        mask = self.masks.get(symbol, 0) | bit
+        self.masks[symbol] = mask
+        self.occupied |= bit
+        self.grid[row][col] = symbol
+        self.hash ^= self._zobrist[cell][symbol != 'X']
+        self.history.append((row, col, symbol, self._winner))
+
+        # Only the lines through the new cell can have just been completed,
+        # so a move costs O(win_length) instead of a full-board rescan.
+        if self._winner is None:
+            for line in self._lines_through[cell]:
+                if mask & line == line:
+                    self._winner = symbol
+                    break
+
+    def unmake_move(self):
+        """Take back the last move and return it as (row, col, symbol).
+
+        Unlike undo(), the move cannot be redone; moves undone earlier are
+        dropped too, since they were made from a different position.
+        """
+        if not self.history:
+            raise ValueError("There is no move to take back.")
+        self._redo.clear()
+        return self._take_back()
+
+    def _take_back(self):
+        """Remove the last move from the board and the incremental state."""
+        row, col, symbol, winner = self.history.pop()
+        cell = row * self.size + col
+        bit = 1 << cell
+        self.masks[symbol] ^= bit
+        self.occupied ^= bit
+        self.grid[row][col] = ' '
+        self.hash ^= self._zobrist[cell][symbol != 'X']
+        self._winner = winner
+        return row, col, symbol
+
+    def undo(self):
+        """Take back the last move so it can be redone; return it or None."""
+        if not self.history:
+            return None
+        move = self._take_back()
+        self._redo.append(move)
+        return move
+
+    def redo(self):
+        """Replay the last undone move; return it or None."""
+        if not self._redo:
+            return None
+        move = self._redo.pop()
+        self._place(*move)
+        return move
 
     def is_full(self):
         """Check if the board is full."""
-        for row in self.grid:
-            for cell in row:
-                if cell == ' ':
-                    return False
-        return True
+        return self.occupied == self.full_mask
 
     def check_winner(self):
         """Check if there's a winner and return the winning symbol."""
-        # Check rows
-        for row in self.grid:
-            if row[0] == row[1] == row[2] != ' ':
-                return row[0]
-
-        # Check columns
-        for col in range(self.size):
-            if self.grid[0][col] == self.grid[1][col] == self.grid[2][col] != ' ':
-                return self.grid[0][col]
-
-        # Check diagonals
-        if self.grid[0][0] == self.grid[1][1] == self.grid[2][2] != ' ':
-            return self.grid[0][0]
-        if self.grid[0][2] == self.grid[1][1] == self.grid[2][0] != ' ':
-            return self.grid[0][2]
-
-        return None
+        return self._winner
 
 
 class Player:
@@ -71,8 +226,12 @@ class Player:
         self.name = name
         self.symbol = symbol
 
-    def get_move(self):
-        """Get player's move input."""
+    def get_move(self, board=None):
+        """Get player's move input.
+
+        board is the current Board; human players read from the keyboard and
+        ignore it, computer players (see ai_player.py) search it.
+        """
         while True:
             try:
                 move = input(f"{self.name} ({self.symbol}), enter your move (row,col): ")
@@ -96,15 +255,32 @@ class Player:
 class TicTacToeGame:
     """Main game class that manages the Tic-Tac-Toe game."""
 
-    def __init__(self):
-        """Initialize the game with board and players."""
-        self.board = Board()
+    def __init__(self, size=3, win_length=None, recorder=None):
+        """Initialize the game with board and players.
+
+        recorder, if given, receives every finished round through
+        write_game(game, result); see game_record.GameRecordWriter. Sizes
+        above the recorder's max_size are rejected here rather than when the
+        first round ends.
+        """
+        max_size = getattr(recorder, "max_size", None)
+        if max_size is not None and size > max_size:
+            raise ValueError(f"Games larger than {max_size}x{max_size} cannot be recorded.")
+        self.board = Board(size, win_length)
         self.players = []
         self.current_player_index = 0
+        self.scores = {}
+        self.draws = 0
+        self.move_history = []
+        self.recorder = recorder
+
+    def add_player(self, name, symbol, player_class=Player, **options):
+        """Add a player to the game.
 
-    def add_player(self, name, symbol):
-        """Add a player to the game."""
-        self.players.append(Player(name, symbol))
+        player_class lets a computer opponent such as ai_player.AIPlayer take
+        a seat; options are passed through to its constructor.
+        """
+        self.players.append(player_class(name, symbol, **options))
 
     def get_current_player(self):
         """Get the current player."""
@@ -114,6 +290,32 @@ class TicTacToeGame:
         """Switch to the next player."""
         self.current_player_index = (self.current_player_index + 1) % len(self.players)
 
+    def make_move(self, row, col):
+        """Place the current player's symbol and record the move."""
+        if self.board.make_move(row, col, self.get_current_player().symbol):
+            self.move_history.append((row, col))
+            return True
+        return False
+
+    def undo(self):
+        """Take back the last move and give the turn back to its player."""
+        move = self.board.undo()
+        if move is None:
+            return False
+        if self.move_history:
+            self.move_history.pop()
+        self.current_player_index = len(self.board.history) % len(self.players)
+        return True
+
+    def redo(self):
+        """Replay the last undone move and pass the turn on."""
+        move = self.board.redo()
+        if move is None:
+            return False
+        self.move_history.append(move[:2])
+        self.current_player_index = len(self.board.history) % len(self.players)
+        return True
+
     def play_turn(self):
         """Handle one turn of the game."""
         current_player = self.get_current_player()
@@ -121,8 +323,8 @@ class TicTacToeGame:
 
         while True:
             try:
-                row, col = current_player.get_move()
-                if self.board.make_move(row, col, current_player.symbol):
+                row, col = current_player.get_move(self.board)
+                if self.make_move(row, col):
                     break
                 print("Invalid move! Cell is already occupied or out of bounds.")
             except (EOFError, KeyboardInterrupt):
@@ -144,21 +346,33 @@ class TicTacToeGame:
         """Main game loop."""
         print("Welcome to Tic-Tac-Toe!")
         print("Enter moves as row,col (e.g., 1,2 for row 1, column 2)")
+        print(f"Get {self.board.win_length} in a row on the "
+              f"{self.board.size}x{self.board.size} board to win.")
 
-        # Setup players
-        player1_name = input("Enter Player 1 name: ").strip() or "Player 1"
-        player2_name = input("Enter Player 2 name: ").strip() or "Player 2"
+        if not self.players:
+            self.setup_players()
 
-        self.add_player(player1_name, 'X')
-        self.add_player(player2_name, 'O')
+        print(f"\n{self.players[0].name} is X, {self.players[1].name} is O")
 
-        print(f"\n{player1_name} is X, {player2_name} is O")
-        print("Let's start the game!")
+        # Session loop: the players and the board are reused for every round
+        while True:
+            print("Let's start the game!")
+            outcome = self.play_round()
+            if outcome is None:
+                return
+
+            self.record_result(*outcome)
+            print(self.score_summary())
+
+            if not self.play_again():
+                break
+            self.reset_game()
 
-        # Game loop
+    def play_round(self):
+        """Play one round and return (result, winner), or None if interrupted."""
         while True:
             if not self.play_turn():
-                return
+                return None
 
             result, winner = self.check_game_over()
 
@@ -166,39 +380,64 @@ class TicTacToeGame:
                 self.board.display()
                 winner_name = next(p.name for p in self.players if p.symbol == winner)
                 print(f"🎉 Congratulations {winner_name}! You won!")
-                break
+                return result, winner
             if result == "draw":
                 self.board.display()
                 print("🤝 It's a draw! Well played both players!")
-                break
+                return result, winner
 
             self.switch_player()
 
-        self.play_again()
+    def record_result(self, result, winner):
+        """Add a finished round to the session scores."""
+        if result == "winner":
+            self.scores[winner] = self.scores.get(winner, 0) + 1
+        elif result == "draw":
+            self.draws += 1
+        if self.recorder is not None:
+            self.recorder.write_game(self, winner if result == "winner" else "draw")
+
+    def score_summary(self):
+        """Return the session scores as a printable line."""
+        wins = ", ".join(f"{p.name} {self.scores.get(p.symbol, 0)}" for p in self.players)
+        return f"Score: {wins}, draws {self.draws}"
+
+    def setup_players(self):
+        """Ask for both player names and add them to the game."""
+        player1_name = input("Enter Player 1 name: ").strip() or "Player 1"
+        player2_name = input("Enter Player 2 name: ").strip() or "Player 2"
+
+        self.add_player(player1_name, 'X')
+        self.add_player(player2_name, 'O')
 
     def play_again(self):
-        """Ask if players want to play again."""
+        """Ask if players want to play again and return their answer."""
         while True:
             choice = input("\nWould you like to play again? (y/n): ").lower().strip()
             if choice in ['y', 'yes']:
-                self.reset_game()
-                self.play_game()
-                break
+                return True
             if choice in ['n', 'no']:
                 print("Thanks for playing! Goodbye!")
-                break
+                return False
             print("Please enter 'y' for yes or 'n' for no.")
 
     def reset_game(self):
-        """Reset the game for a new round."""
-        self.board = Board()
+        """Reset the game for a new round, keeping players and scores."""
+        self.board.clear()
+        self.move_history.clear()
         self.current_player_index = 0
 
 
 def main():
     """Main function to start the game."""
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe in the terminal.")
+    parser.add_argument("--size", type=int, default=3, help="board size (default 3)")
+    parser.add_argument("--win-length", type=int, default=None,
+                        help="symbols in a row needed to win (default: board size)")
+    args = parser.parse_args()
+
     try:
-        game = TicTacToeGame()
+        game = TicTacToeGame(args.size, args.win_length)
         game.play_game()
     except (EOFError, KeyboardInterrupt):
         print("\n\nGame interrupted. Goodbye!")
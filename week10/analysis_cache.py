@@ -0,0 +1,225 @@
+''' analysis_cache.py
+an opt-in cache of analysis results keyed by a hash of the content, with an
+in-memory LRU and optional SQLite persistence.
+'''
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from analyzer import TextAnalyser
+
+# bytes hashed at a time when a file has to be read.
+READ_SIZE = 1 << 20
+
+
+def content_hash(data) -> str:
+    '''Return a short hex digest of a str or bytes-like object.'''
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(path) -> str:
+    '''Return the content_hash() of a file's bytes, read in blocks.'''
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while True:
+            block = handle.read(READ_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def options_key(metrics=(), top_k: int = 0, approximate: bool = False,
+                tokenizer: str = None) -> str:
+    '''Return the part of a cache key that describes the analyze() options.'''
+    if not all(isinstance(name, str) for name in metrics):
+        raise ValueError("Only metrics given by name can be cached.")
+    if tokenizer is not None and not isinstance(tokenizer, str):
+        raise ValueError("Only tokenizers given by name can be cached.")
+    return json.dumps([list(metrics), top_k, bool(approximate), tokenizer],
+                      separators=(",", ":"))
+
+
+def _decode(value: str) -> dict:
+    '''Load a stored result, restoring the (word, count) pairs JSON turned into lists.'''
+    result = json.loads(value)
+    if "top_words" in result:
+        result["top_words"] = [tuple(pair) for pair in result["top_words"]]
+    return result
+
+
+class AnalysisCache:
+    '''Caches analyze() results for texts and files.
+
+    Results are keyed by a blake2b hash of the content plus the analyze()
+    options. For files, the (path, mtime, size) of the last lookup is kept
+    as a pre-key so an unchanged file is not even read again. The newest
+    max_entries results, up to max_bytes of stored JSON, stay in memory;
+    with a path the cache is also kept in an SQLite file.
+    '''
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 16 << 20, path=None):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.file_hits = 0
+        self.evictions = 0
+        self._results = OrderedDict()
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # one small commit per result; WAL keeps those from syncing the file each time.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, "
+                             "mtime_ns INTEGER, size INTEGER, digest TEXT)")
+            self._db.commit()
+
+    # look up a stored result.
+    def get(self, key: str):
+        '''Return the result stored under key, or None.'''
+        with self._lock:
+            value = self._results.get(key)
+            if value is not None:
+                self._results.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None:
+                    value = row[0]
+                    self.disk_hits += 1
+                    self._remember(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _decode(value)
+
+    def put(self, key: str, result: dict) -> None:
+        '''Store a result under key.'''
+        value = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, value))
+                self._db.commit()
+
+    def _remember(self, key: str, value: str) -> None:
+        '''Add a value to the in-memory LRU and evict down to the limits.'''
+        old = self._results.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._results[key] = value
+        self.size += len(value)
+        while self._results and (len(self._results) > self.max_entries
+                                 or self.size > self.max_bytes):
+            _, evicted = self._results.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    # key a file, reading it only if it changed since the last lookup.
+    def file_key(self, path, **options) -> str:
+        '''Return the cache key for a file analysed with the given options.'''
+        path = os.path.abspath(path)
+        status = os.stat(path)
+        prekey = (status.st_mtime_ns, status.st_size)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT mtime_ns, size, digest FROM files WHERE path = ?",
+                                       (path,)).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1]), row[2]
+            if entry is not None and entry[0] == prekey:
+                self.file_hits += 1
+                self._files[path] = entry
+                self._files.move_to_end(path)
+                digest = entry[1]
+            else:
+                digest = None
+        if digest is None:
+            digest = file_hash(path)
+            with self._lock:
+                self._files[path] = (prekey, digest)
+                if len(self._files) > self.max_entries:
+                    self._files.popitem(last=False)
+                if self._db is not None:
+                    self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                     (path, prekey[0], prekey[1], digest))
+                    self._db.commit()
+        return f"file:{digest}:{options_key(**options)}"
+
+    @staticmethod
+    def text_key(text: str, **options) -> str:
+        '''Return the cache key for a text analysed with the given options.'''
+        # file bytes and str texts differ by newline translation, so they are kept apart.
+        return f"text:{content_hash(text)}:{options_key(**options)}"
+
+    def analyze(self, text: str, **options) -> dict:
+        '''Return TextAnalyser(text).analyze(**options), from the cache when possible.'''
+        key = self.text_key(text, **options)
+        result = self.get(key)
+        if result is None:
+            result = TextAnalyser(text).analyze(**options)
+            self.put(key, result)
+        return result
+
+    def analyze_file(self, path, workers: int = 1, **options) -> dict:
+        '''Return TextAnalyser.analyze_stream(path, **options), from the cache when possible.'''
+        key = self.file_key(path, **options)
+        result = self.get(key)
+        if result is None:
+            result = TextAnalyser.analyze_stream(path, workers=workers, **options)
+            self.put(key, result)
+        return result
+
+    def stats(self) -> dict:
+        '''Return hit/miss counters and the in-memory size.'''
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "disk_hits": self.disk_hits,
+                "file_hits": self.file_hits,
+                "evictions": self.evictions,
+                "entries": len(self._results),
+                "bytes": self.size,
+            }
+
+    def clear(self) -> None:
+        '''Drop every cached result, in memory and on disk.'''
+        with self._lock:
+            self._results.clear()
+            self._files.clear()
+            self.size = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("DELETE FROM files")
+                self._db.commit()
+
+    def close(self) -> None:
+        '''Close the SQLite file, if any.'''
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
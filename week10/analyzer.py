@@ -1,6 +1,41 @@
 ''' analyzer.py
 provide a object-oriented approach to analyze text inputs.
 '''
+import copy
+import os
+
+import parallel
+from metrics import (ApproximateWordFrequency, FusedAnalysis, TokenCount, UppercaseTokenCount,
+                     WordFrequency, create_metrics)
+
+# characters read per chunk when streaming a file.
+CHUNK_SIZE = 1 << 20
+
+# analyze() keys and the metrics that compute them.
+RESULT_METRICS = {
+    "total_words": "characters",
+    "upper_words": "uppercase",
+}
+
+
+def iter_chunks(source, chunk_size: int = CHUNK_SIZE):
+    '''Yield str chunks from a file path, a text file object or an iterable of str.'''
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as handle:
+            yield from iter_chunks(handle, chunk_size)
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in source:
+            if not isinstance(chunk, str):
+                raise ValueError("Chunks must be strings.")
+            yield chunk
+
+
 class TextAnalyser:
     '''A class to analyze input_text.'''
     def __init__(self, input_text):
@@ -9,6 +44,49 @@ class TextAnalyser:
             
         self.text = input_text
 
+    @property
+    def text(self) -> str:
+        '''The text analysed so far; appended parts are joined on first access.'''
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0]
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._parts = [value]
+        # running engines and cached analyze() results, keyed by analyze() options.
+        self._engines = {}
+        self._results = {}
+
+    # add new text without rescanning the old.
+    def append(self, text: str) -> None:
+        '''Add text to the end; analyze() then only processes the new part.
+
+        A word cut off at the old end is completed by the new text.
+        '''
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string.")
+        if not text:
+            return
+        self._parts.append(text)
+        for engine in self._engines.values():
+            engine.feed(text)
+        self._results.clear()
+
+    def update(self, text: str) -> None:
+        '''Replace the text with a grown version of it, such as a longer transcript.
+
+        When text starts with the current text only the new suffix is
+        processed; otherwise the analyser starts over.
+        '''
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string.")
+        current = self.text
+        if text.startswith(current):
+            self.append(text[len(current):])
+        else:
+            self.text = text
+
 
     # calculate the total number of words.
     def count_words(self) -> int:
@@ -25,11 +103,75 @@ class TextAnalyser:
 
         return total
     
-    def analyze(self):
-        '''Perform a comprehensive analysis of the text.'''
-        total_words = self.count_words()
-        upper_words = self.count_upper_words()
-        return {
-            "total_words": total_words,
-            "upper_words": upper_words
-        }
+    def analyze(self, metrics=(), workers: int = 1, top_k: int = 0, approximate: bool = False,
+                tokenizer: str = None):
+        '''Perform a comprehensive analysis of the text.
+
+        All values, including any extra metrics named in metrics (see
+        metrics.METRICS), are computed together in a single pass. With
+        workers other than 1 (None for every CPU) large texts are analysed
+        in a process pool; the result is the same. A top_k adds the most
+        common words and the vocabulary size, estimated in bounded memory
+        when approximate is set. A tokenizer (see text_tokenizers.TOKENIZERS)
+        adds "tokens" and "uppercase_tokens" and is used for top_k; without
+        one, words are split at whitespace. The result is cached until the
+        text grows.
+        '''
+        key = (tuple(metrics), top_k, approximate, tokenizer)
+        if key not in self._results:
+            specs, reported = _metric_specs(metrics, top_k, approximate, tokenizer)
+            engine = self._engines.get(key)
+            if engine is None:
+                # only the first scan uses the pool; the engine is kept running
+                # so append() only has to feed it new text.
+                engine = parallel.text_engine(self.text, specs, workers)
+                self._engines[key] = engine
+            self._results[key] = _to_analysis(engine.snapshot(), metrics, reported)
+        # a copy, so callers changing top_words cannot corrupt the cache.
+        return copy.deepcopy(self._results[key])
+
+    # analyse a file or stream without loading it into memory.
+    @staticmethod
+    def analyze_stream(source, chunk_size: int = CHUNK_SIZE, metrics=(), workers: int = 1,
+                       top_k: int = 0, approximate: bool = False, tokenizer: str = None) -> dict:
+        '''Analyse a file path, text file object or iterable of str chunks.
+
+        Memory stays bounded by chunk_size, and the result is identical to
+        TextAnalyser(whole_text).analyze(). A regular file path is
+        memory-mapped and counted on bytes where the text is ASCII, on
+        workers cores when workers is not 1.
+        '''
+        specs, reported = _metric_specs(metrics, top_k, approximate, tokenizer)
+        if isinstance(source, (str, os.PathLike)) and os.path.isfile(source):
+            results = parallel.analyze_file(source, specs, workers)
+        else:
+            results = FusedAnalysis(create_metrics(specs)).run(iter_chunks(source, chunk_size))
+        return _to_analysis(results, metrics, reported)
+
+
+def _metric_specs(metrics=(), top_k: int = 0, approximate: bool = False, tokenizer=None):
+    '''Return the metrics to run and the option-driven metrics among them.'''
+    specs = list(RESULT_METRICS.values())
+    specs += [spec for spec in metrics if spec not in specs]
+    reported = []
+    if tokenizer is not None:
+        reported += [TokenCount(tokenizer), UppercaseTokenCount(tokenizer)]
+    if top_k:
+        frequency = ApproximateWordFrequency if approximate else WordFrequency
+        reported.append(frequency(top_k, tokenizer=tokenizer))
+    return specs + reported, reported
+
+
+def _to_analysis(results: dict, metrics=(), reported=()) -> dict:
+    '''Turn engine results into the analyze() dictionary.'''
+    analysis = {key: results[name] for key, name in RESULT_METRICS.items()}
+    for spec in metrics:
+        name = spec if isinstance(spec, str) else spec.name
+        analysis[name] = results[name]
+    for metric in reported:
+        if isinstance(metric, (WordFrequency, ApproximateWordFrequency)):
+            # adds "top_words" and "vocabulary".
+            analysis.update(results[metric.name])
+        else:
+            analysis[metric.name] = results[metric.name]
+    return analysis
@@ -0,0 +1,219 @@
+''' benchmark.py
+throughput and peak-memory benchmarks for the text analysers, with JSON
+baselines to catch regressions.
+
+    python benchmark.py --size 8 --save baseline.json
+    python benchmark.py --size 8 --compare baseline.json --threshold 0.15
+'''
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from activaty_1 import TextAnlyser
+from analyzer import TextAnalyser
+from text_tokenizers import TOKENIZERS, get_tokenizer
+
+# character pools for the synthetic corpora.
+ALPHABETS = {
+    "ascii": "abcdefghijklmnopqrstuvwxyz",
+    "latin": "abcdefghijklmnopqrstuvwxyzàáâäçèéêëìíîïñòóôöùúûüß",
+    "greek": "αβγδεζηθικλμνξοπρστυφχψω",
+    "cjk": "的一是不了人我在有他这中大来上个国到说们为子和你地出道也时年",
+}
+PUNCTUATION = ".,;:!?\"'()-"
+
+
+def generate_corpus(size: int, mix: dict = None, upper: float = 0.1,
+                    punctuation: float = 0.05, seed: int = 0) -> str:
+    '''Return about size characters of word-like text.
+
+    mix maps ALPHABETS names to weights (default: all ASCII); upper is the
+    share of words written in capitals and punctuation the share of words
+    followed by a punctuation mark. CJK words get no spaces around them
+    half of the time, as in real CJK text.
+    '''
+    rng = random.Random(seed)
+    mix = mix or {"ascii": 1.0}
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    words = []
+    length = 0
+    while length < size:
+        name = rng.choices(names, weights)[0]
+        word = "".join(rng.choices(ALPHABETS[name], k=rng.randint(1, 2 if name == "cjk" else 9)))
+        if rng.random() < upper:
+            word = word.upper()
+        if rng.random() < punctuation:
+            word += rng.choice(PUNCTUATION)
+        if name == "cjk" and rng.random() < 0.5:
+            separator = ""
+        else:
+            separator = "\n" if rng.random() < 0.08 else " "
+        words.append(word + separator)
+        length += len(word) + len(separator)
+    return "".join(words)[:size]
+
+
+def parse_mix(value: str) -> dict:
+    '''Parse "ascii=3,cjk=1" (or just "ascii") into a weight dictionary.'''
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ALPHABETS:
+            raise argparse.ArgumentTypeError(f"Unknown alphabet {name!r}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _legacy(text, path):
+    '''The original per-character TextAnalyser methods.'''
+    analyser = TextAnalyser(text)
+    return analyser.count_words(), analyser.count_upper_words()
+
+
+def _activity_split(text, path):
+    '''activaty_1.TextAnlyser, which splits the text once per count.'''
+    analyser = TextAnlyser(text)
+    return analyser.count_words(), analyser.count_upper_words()
+
+
+# analysis modes: name -> function(text, path) doing one full analysis.
+MODES = {
+    "legacy_loop": _legacy,
+    "analyze": lambda text, path: TextAnalyser(text).analyze(),
+    "analyze_words": lambda text, path: TextAnalyser(text).analyze(["words", "uppercase_words"]),
+    "analyze_parallel": lambda text, path: TextAnalyser(text).analyze(workers=None),
+    "stream_file": lambda text, path: TextAnalyser.analyze_stream(path),
+    "stream_file_words": lambda text, path: TextAnalyser.analyze_stream(
+        path, metrics=["words", "uppercase_words"]),
+    "parallel_file": lambda text, path: TextAnalyser.analyze_stream(path, workers=None),
+    "top_words_exact": lambda text, path: TextAnalyser.analyze_stream(path, top_k=10),
+    "top_words_approximate": lambda text, path: TextAnalyser.analyze_stream(
+        path, top_k=10, approximate=True),
+    "activity_split": _activity_split,
+    "activity_analyze": lambda text, path: TextAnlyser(text).analyze(),
+}
+# the raw cost of each tokenizer, and of counting with it inside analyze().
+for _name in TOKENIZERS:
+    MODES[f"tokenize_{_name}"] = (lambda text, path, name=_name:
+                                  get_tokenizer(name).count(text))
+    MODES[f"analyze_tokens_{_name}"] = (lambda text, path, name=_name:
+                                        TextAnalyser(text).analyze(tokenizer=name))
+
+
+def measure(function, text: str, path: str, repeat: int = 3) -> dict:
+    '''Return the best time, throughput and Python peak memory of function.
+
+    Memory is measured in a separate run under tracemalloc, which only sees
+    allocations of this process, so worker processes are not counted.
+    '''
+    size = len(text.encode("utf-8"))
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(text, path)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(text, path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "mb_per_s": size / best / 1e6 if best else float("inf"),
+            "peak_bytes": peak}
+
+
+def run(size: int, mix: dict, modes=None, repeat: int = 3, seed: int = 0) -> dict:
+    '''Benchmark the given modes (default: all) on one synthetic corpus.'''
+    text = generate_corpus(size, mix, seed=seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.txt")
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+        for name in modes or MODES:
+            results[name] = measure(MODES[name], text, path, repeat)
+    return {
+        "corpus": {"characters": size, "bytes": len(text.encode("utf-8")),
+                   "mix": mix, "seed": seed},
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.1) -> list:
+    '''Return a message per mode that got slower or bigger than baseline by threshold.'''
+    regressions = []
+    if current["corpus"] != baseline["corpus"]:
+        regressions.append("Corpus settings differ from the baseline; results are not comparable.")
+        return regressions
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        if result["mb_per_s"] < old["mb_per_s"] * (1 - threshold):
+            regressions.append(f"{name}: {result['mb_per_s']:.1f} MB/s, "
+                               f"baseline {old['mb_per_s']:.1f} MB/s")
+        if result["peak_bytes"] > old["peak_bytes"] * (1 + threshold):
+            regressions.append(f"{name}: peak {result['peak_bytes']:,} bytes, "
+                               f"baseline {old['peak_bytes']:,} bytes")
+    return regressions
+
+
+def _print_report(report: dict) -> None:
+    '''Print the results as a table.'''
+    corpus = report["corpus"]
+    print(f"Corpus: {corpus['characters']:,} characters, {corpus['bytes']:,} bytes, "
+          f"mix {corpus['mix']}")
+    print(f"{'mode':<24}{'seconds':>10}{'MB/s':>10}{'peak MiB':>10}")
+    for name, result in report["results"].items():
+        print(f"{name:<24}{result['seconds']:>10.4f}{result['mb_per_s']:>10.1f}"
+              f"{result['peak_bytes'] / (1 << 20):>10.2f}")
+
+
+def main(argv=None) -> int:
+    '''Run the benchmarks from the command line.'''
+    parser = argparse.ArgumentParser(description="Benchmark the text analysers.")
+    parser.add_argument("--size", type=float, default=4,
+                        help="corpus size in millions of characters (default: 4)")
+    parser.add_argument("--mix", type=parse_mix, default={"ascii": 1.0},
+                        help="alphabet weights, e.g. ascii=3,cjk=1 (choices: %s)"
+                             % ", ".join(ALPHABETS))
+    parser.add_argument("--mode", action="append", choices=MODES,
+                        help="mode to run; may be repeated (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown or memory growth (default: 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    report = run(int(args.size * 1_000_000), args.mix, args.mode, args.repeat, args.seed)
+    _print_report(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
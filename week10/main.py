@@ -1,18 +1,230 @@
+import argparse
+import csv
+import fnmatch
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from analyzer import TextAnalyser
+from analysis_cache import AnalysisCache
+from metrics import METRICS
+from text_tokenizers import TOKENIZERS
+
+# name used for text read from standard input.
+STDIN = "-"
+# files handed to a pool worker at a time.
+CHUNKSIZE = 16
 
 def _parse_input() -> str:
     '''Parse input from the user.'''
     return input("Enter text to analyze: ")
 
-def main():
+def _parse_args(argv=None) -> argparse.Namespace:
+    '''Parse the command line options.'''
+    parser = argparse.ArgumentParser(
+        description="Analyse text typed in, piped in or read from many files.")
+    parser.add_argument("paths", nargs="*",
+                        help="files, directories or glob patterns; - reads standard input")
+    parser.add_argument("--pattern", default="*",
+                        help="glob files must match inside directories (default: all)")
+    parser.add_argument("--format", choices=("text", "jsonl", "csv"), default="text",
+                        help="output format (default: text)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="files analysed at once (default: one per CPU)")
+    parser.add_argument("--pool", choices=("process", "thread"), default="process",
+                        help="processes for CPU-bound text, threads for slow disks or networks")
+    parser.add_argument("--metric", action="append", default=[], choices=METRICS,
+                        help="extra metric to report; may be repeated")
+    parser.add_argument("--top", type=int, default=0, metavar="K",
+                        help="also show the K most common words and the vocabulary size")
+    parser.add_argument("--approximate", action="store_true",
+                        help="estimate --top in bounded memory (Count-Min sketch, HyperLogLog)")
+    parser.add_argument("--tokenizer", choices=TOKENIZERS, default=None,
+                        help="also count tokens with this strategy and use it for --top")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="reuse results stored in this SQLite file and add new ones")
+    parser.add_argument("--cache-size", type=int, default=4096, metavar="N",
+                        help="results kept in memory by --cache (default: 4096)")
+    return parser.parse_args(argv)
+
+def iter_paths(sources, pattern: str = "*"):
+    '''Yield files named by paths, directories (walked recursively) and glob patterns.'''
+    for source in sources:
+        if source == STDIN or os.path.isfile(source):
+            yield source
+        elif os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if fnmatch.fnmatch(name, pattern):
+                        yield os.path.join(root, name)
+        else:
+            matches = sorted(glob.glob(source, recursive=True))
+            if not matches:
+                # reported as an error record by _analyse_path().
+                yield source
+            for match in matches:
+                if os.path.isfile(match):
+                    yield match
+
+def _analyse_path(path: str, options: dict, workers: int = 1) -> dict:
+    '''Analyse one file (or standard input) and return a result record.'''
+    try:
+        if path == STDIN:
+            result = TextAnalyser.analyze_stream(sys.stdin, **options)
+        else:
+            result = TextAnalyser.analyze_stream(path, workers=workers, **options)
+    except (OSError, UnicodeDecodeError) as e:
+        return {"path": path, "error": str(e)}
+    return {"path": path, **result}
+
+def _analyse_task(args) -> dict:
+    '''Unpack a (path, options) pair for Executor.map.'''
+    return _analyse_path(*args)
+
+def _cache_key(cache: AnalysisCache, path: str, options: dict):
+    '''Return the cache key of a file, or None if it cannot be read.'''
+    try:
+        return cache.file_key(path, **options)
+    except OSError:
+        return None
+
+def analyse_paths(paths, options: dict, jobs: int = None, pool: str = "process",
+                  cache: AnalysisCache = None):
+    '''Yield a result record per path, in order, analysing up to jobs files at once.
+
+    A single file gets all jobs to itself; standard input is always read
+    in this process. With a cache, files are hashed on a thread pool first
+    and only the files missing from the cache are analysed.
+    '''
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    files = [path for path in paths if path != STDIN]
+    keys = {}
+    if cache is not None:
+        with ThreadPoolExecutor(jobs) as executor:
+            keys = dict(zip(files, executor.map(lambda path: _cache_key(cache, path, options),
+                                                files)))
+        cached = {path: cache.get(key) for path, key in keys.items() if key is not None}
+        files = [path for path in files if cached.get(path) is None]
+    if jobs == 1 or len(files) <= 1:
+        results = (_analyse_path(path, options, jobs if pool == "process" else 1)
+                   for path in files)
+        executor = None
+    else:
+        executor_class = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+        executor = executor_class(jobs)
+        results = executor.map(_analyse_task, [(path, options) for path in files],
+                               chunksize=CHUNKSIZE)
+    try:
+        for path in paths:
+            if path == STDIN:
+                yield _analyse_path(path, options)
+            elif cache is not None and cached.get(path) is not None:
+                yield {"path": path, **cached[path]}
+            else:
+                record = next(results)
+                if keys.get(path) is not None and "error" not in record:
+                    cache.put(keys[path], {key: value for key, value in record.items()
+                                           if key != "path"})
+                yield record
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def _add_to_totals(totals: dict, record: dict) -> None:
+    '''Add the integer fields of a successful record to totals.'''
+    if "error" in record:
+        totals["errors"] += 1
+        return
+    totals["files"] += 1
+    for key, value in record.items():
+        # vocabularies of separate files cannot be added up.
+        if isinstance(value, int) and key != "vocabulary":
+            totals[key] = totals.get(key, 0) + value
+
+def _fields(options: dict) -> list:
+    '''Return the CSV columns for the given analysis options.'''
+    fields = ["path", "total_words", "upper_words"]
+    fields += [name for name in options["metrics"] if name not in fields]
+    if options["tokenizer"]:
+        fields += ["tokens", "uppercase_tokens"]
+    if options["top_k"]:
+        fields += ["vocabulary", "top_words"]
+    return fields + ["files", "errors", "error"]
+
+def _write_records(records, output_format: str, options: dict, stream=None) -> int:
+    '''Write each record as it arrives, then the totals; return the number of errors.'''
+    stream = stream or sys.stdout
+    totals = {"path": "<total>", "files": 0, "errors": 0, "total_words": 0, "upper_words": 0}
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, _fields(options), extrasaction="ignore")
+        writer.writeheader()
+    for record in records:
+        _add_to_totals(totals, record)
+        if output_format == "jsonl":
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif output_format == "csv":
+            writer.writerow({key: json.dumps(value, ensure_ascii=False)
+                             if isinstance(value, (list, dict)) else value
+                             for key, value in record.items()})
+        else:
+            print(f"{record['path']}:", file=stream)
+            if "error" in record:
+                print(f"Error: {record['error']}", file=stream)
+            else:
+                _print_result(record, stream)
+    if output_format == "jsonl":
+        stream.write(json.dumps(totals) + "\n")
+    elif output_format == "csv":
+        writer.writerow(totals)
+    elif totals["files"] + totals["errors"] > 1:
+        print(f"Total ({totals['files']} files, {totals['errors']} errors):", file=stream)
+        _print_result(totals, stream)
+    return totals["errors"]
+
+def main(argv=None):
     '''Main function to run the text analyzer.'''
+    args = _parse_args(argv)
+    options = {"metrics": args.metric, "top_k": args.top, "approximate": args.approximate,
+               "tokenizer": args.tokenizer}
+    # piped input is analysed like a file; only a terminal gets the prompt.
+    if not args.paths and not sys.stdin.isatty():
+        args.paths = [STDIN]
+    if args.paths:
+        cache = AnalysisCache(args.cache_size, path=args.cache) if args.cache else None
+        try:
+            records = analyse_paths(iter_paths(args.paths, args.pattern), options,
+                                    args.jobs, args.pool, cache)
+            errors = _write_records(records, args.format, options)
+        finally:
+            if cache is not None:
+                stats = cache.stats()
+                print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['file_hits']} files unchanged", file=sys.stderr)
+                cache.close()
+        return 1 if errors else 0
+
     input_text = _parse_input()
     analyser = TextAnalyser(input_text)
-    analysis_result = analyser.analyze()
-    
-    print("Analysis Result:")
-    print(f"Total words: {analysis_result['total_words']}")
-    print(f"Total uppercase words: {analysis_result['upper_words']}")
+    analysis_result = analyser.analyze(**options)
+    _print_result(analysis_result)
+    return 0
+
+def _print_result(analysis_result: dict, stream=None) -> None:
+    '''Print an analysis result.'''
+    print("Analysis Result:", file=stream)
+    print(f"Total words: {analysis_result['total_words']}", file=stream)
+    print(f"Total uppercase words: {analysis_result['upper_words']}", file=stream)
+    if "tokens" in analysis_result:
+        print(f"Tokens: {analysis_result['tokens']}", file=stream)
+        print(f"Uppercase tokens: {analysis_result['uppercase_tokens']}", file=stream)
+    if "top_words" in analysis_result:
+        print(f"Vocabulary size: {analysis_result['vocabulary']}", file=stream)
+        print("Most common words:", file=stream)
+        for word, count in analysis_result["top_words"]:
+            print(f"  {word}: {count}", file=stream)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,541 @@
+''' metrics.py
+pluggable metric accumulators and a single-pass engine that runs them together.
+'''
+
+import heapq
+import math
+from collections import Counter
+from hashlib import blake2b
+
+from text_tokenizers import get_tokenizer
+
+# characters handed to the metrics at a time.
+PIECE_SIZE = 1 << 16
+# bytes handed to the metrics at a time by feed_bytes().
+BYTE_PIECE_SIZE = 1 << 20
+
+# bytes a piece may end after without splitting a word; not b"\r", which
+# must stay next to a following b"\n" for newline translation.
+_CUT_BYTES = (b" ", b"\n", b"\t")
+# ASCII bytes that bytes and str treat differently: b"\r" is translated to
+# "\n" in text mode and \x1c-\x1f are whitespace to str.split() only.
+_UNSAFE_BYTES = (b"\r", b"\x1c", b"\x1d", b"\x1e", b"\x1f")
+_UNSAFE_CHARS = ("\x1c", "\x1d", "\x1e", "\x1f")
+
+_UPPER = bytes(range(ord("A"), ord("Z") + 1))
+_LOWER = bytes(range(ord("a"), ord("z") + 1))
+_DIGITS = b"0123456789"
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+# maps the whitespace bytes.split() uses to b" " and everything else to b"x".
+_WORD_TABLE = bytes(0x20 if byte in b" \t\n\r\x0b\x0c" else 0x78 for byte in range(256))
+
+
+class Metric:
+    '''Base class for a value accumulated over word-aligned pieces of text.
+
+    Subclasses set name, set needs_words if they use the piece's words, and
+    implement update(), merge() and result(). merge() must be associative so
+    partial results from separate chunks can be combined in order.
+    '''
+    name = ""
+    needs_words = False
+    needs_byte_words = False
+
+    def update(self, piece: str, words) -> None:
+        '''Add one piece of text; words is piece.split() or None.'''
+        raise NotImplementedError
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        '''Add one piece of plain ASCII bytes; words is piece.split() or None.
+
+        Metrics override this with bulk bytes operations and set
+        needs_byte_words if they use words; the default decodes and calls
+        update().
+        '''
+        text = piece.decode("ascii")
+        self.update(text, text.split() if self.needs_words else None)
+
+    def merge(self, other: "Metric") -> None:
+        '''Fold in the state of the same metric run over the following text.'''
+        raise NotImplementedError
+
+    def result(self):
+        '''Return the accumulated value.'''
+        raise NotImplementedError
+
+    def spawn(self) -> "Metric":
+        '''Return an empty metric with the same settings.'''
+        return type(self)()
+
+
+class _Counter(Metric):
+    '''Base class for metrics that are a single running count.'''
+    def __init__(self):
+        self.count = 0
+
+    def merge(self, other: Metric) -> None:
+        self.count += other.count
+
+    def result(self) -> int:
+        return self.count
+
+
+class CharacterCount(_Counter):
+    '''Number of characters.'''
+    name = "characters"
+
+    def update(self, piece: str, words) -> None:
+        self.count += len(piece)
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        self.count += len(piece)
+
+
+class UppercaseCount(_Counter):
+    '''Number of uppercase characters.'''
+    name = "uppercase"
+
+    def update(self, piece: str, words) -> None:
+        self.count += sum(map(str.isupper, piece))
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        self.count += len(piece) - len(piece.translate(None, _UPPER))
+
+
+class WordCount(_Counter):
+    '''Number of whitespace-separated words.'''
+    name = "words"
+    needs_words = True
+
+    def update(self, piece: str, words) -> None:
+        self.count += len(words)
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        # a word starts at every space-to-letter step of the normalised piece.
+        marks = piece.translate(_WORD_TABLE)
+        self.count += marks.count(b" x") + marks.startswith(b"x")
+
+
+class UppercaseWordCount(_Counter):
+    '''Number of words whose cased characters are all uppercase.'''
+    name = "uppercase_words"
+    needs_words = True
+    needs_byte_words = True
+
+    def update(self, piece: str, words) -> None:
+        self.count += sum(map(str.isupper, words))
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        self.count += sum(map(bytes.isupper, words))
+
+
+class TokenCount(_Counter):
+    '''Number of tokens found by a text_tokenizers.TOKENIZERS strategy.'''
+    name = "tokens"
+
+    def __init__(self, tokenizer="unicode"):
+        super().__init__()
+        self.tokenizer = get_tokenizer(tokenizer)
+
+    def update(self, piece: str, words) -> None:
+        self.count += self.tokenizer.count(piece)
+
+    def spawn(self) -> Metric:
+        return type(self)(self.tokenizer)
+
+
+class UppercaseTokenCount(TokenCount):
+    '''Number of tokens whose cased characters are all uppercase.'''
+    name = "uppercase_tokens"
+
+    def update(self, piece: str, words) -> None:
+        self.count += sum(map(str.isupper, self.tokenizer.tokenize(piece)))
+
+
+class LineCount(Metric):
+    '''Number of lines, counting a final line without a newline.'''
+    name = "lines"
+
+    def __init__(self):
+        self.newlines = 0
+        self.last_char = ""
+
+    def update(self, piece: str, words) -> None:
+        if piece:
+            self.newlines += piece.count("\n")
+            self.last_char = piece[-1]
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        if piece:
+            self.newlines += piece.count(b"\n")
+            self.last_char = chr(piece[-1])
+
+    def merge(self, other: Metric) -> None:
+        self.newlines += other.newlines
+        self.last_char = other.last_char or self.last_char
+
+    def result(self) -> int:
+        return self.newlines + (1 if self.last_char and self.last_char != "\n" else 0)
+
+
+class CharacterClasses(Metric):
+    '''Counts of letters, digits, whitespace, upper/lowercase and other characters.'''
+    name = "character_classes"
+
+    def __init__(self):
+        self.counts = dict.fromkeys(
+            ("letters", "digits", "whitespace", "uppercase", "lowercase", "other"), 0)
+
+    def update(self, piece: str, words) -> None:
+        counts = self.counts
+        letters = sum(map(str.isalpha, piece))
+        digits = sum(map(str.isdigit, piece))
+        whitespace = sum(map(str.isspace, piece))
+        counts["letters"] += letters
+        counts["digits"] += digits
+        counts["whitespace"] += whitespace
+        counts["uppercase"] += sum(map(str.isupper, piece))
+        counts["lowercase"] += sum(map(str.islower, piece))
+        counts["other"] += len(piece) - letters - digits - whitespace
+
+    def update_bytes(self, piece: bytes, words) -> None:
+        counts = self.counts
+        size = len(piece)
+        uppercase = size - len(piece.translate(None, _UPPER))
+        lowercase = size - len(piece.translate(None, _LOWER))
+        digits = size - len(piece.translate(None, _DIGITS))
+        whitespace = size - len(piece.translate(None, _WHITESPACE))
+        counts["letters"] += uppercase + lowercase
+        counts["digits"] += digits
+        counts["whitespace"] += whitespace
+        counts["uppercase"] += uppercase
+        counts["lowercase"] += lowercase
+        counts["other"] += size - uppercase - lowercase - digits - whitespace
+
+    def merge(self, other: Metric) -> None:
+        for key, value in other.counts.items():
+            self.counts[key] += value
+
+    def result(self) -> dict:
+        return dict(self.counts)
+
+
+def _hash64(word: str) -> int:
+    '''Return a 64-bit hash of word that is the same in every process.'''
+    return int.from_bytes(blake2b(word.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+                          "little")
+
+
+class WordFrequency(Metric):
+    '''Exact count of every distinct word, reported as the top_k most common.
+
+    Words come from str.split() unless a tokenizer is given. Memory grows
+    with the vocabulary; see ApproximateWordFrequency for a bounded
+    alternative.
+    '''
+    name = "word_frequency"
+
+    def __init__(self, top_k: int = 10, tokenizer=None):
+        self.top_k = top_k
+        self.tokenizer = None if tokenizer is None else get_tokenizer(tokenizer)
+        self.needs_words = self.tokenizer is None
+        self.counts = Counter()
+
+    def update(self, piece: str, words) -> None:
+        self.counts.update(words if self.tokenizer is None else self.tokenizer.tokenize(piece))
+
+    def merge(self, other: Metric) -> None:
+        self.counts.update(other.counts)
+
+    # look up a single word.
+    def count(self, word: str) -> int:
+        '''Return how often word occurred.'''
+        return self.counts[word]
+
+    def result(self) -> dict:
+        return {"top_words": self.counts.most_common(self.top_k),
+                "vocabulary": len(self.counts)}
+
+    def spawn(self) -> Metric:
+        return type(self)(self.top_k, self.tokenizer)
+
+
+class DistinctWords(Metric):
+    '''HyperLogLog estimate of the number of distinct words in fixed memory.
+
+    2 ** precision one-byte registers give a typical error of about
+    1.04 / sqrt(2 ** precision), 0.8% at the default precision.
+    '''
+    name = "distinct_words"
+    needs_words = True
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("Precision must be between 4 and 18.")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def update(self, piece: str, words) -> None:
+        self.add_hashes(map(_hash64, set(words)))
+
+    def add_hashes(self, hashes) -> None:
+        '''Add words given by their _hash64() values.'''
+        registers = self.registers
+        shift = 64 - self.precision
+        low = (1 << shift) - 1
+        for value in hashes:
+            index = value >> shift
+            rank = shift - (value & low).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: Metric) -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def result(self) -> int:
+        registers = self.registers
+        size = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # linear counting is more accurate for small sets.
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def spawn(self) -> Metric:
+        return type(self)(self.precision)
+
+
+class ApproximateWordFrequency(Metric):
+    '''Top-k words in bounded memory from a Count-Min sketch.
+
+    Word counts go into a depth x width Count-Min sketch, which never
+    underestimates and overestimates by at most e/width of all words with
+    probability 1 - exp(-depth). Only the current top_k candidates are kept
+    as words, so among words with nearly equal counts the ones reported can
+    depend on how the text was chunked; a HyperLogLog estimates the
+    vocabulary.
+    '''
+    name = "approximate_word_frequency"
+
+    def __init__(self, top_k: int = 10, width: int = 1 << 16, depth: int = 4,
+                 precision: int = 14, tokenizer=None):
+        self.top_k = top_k
+        self.tokenizer = None if tokenizer is None else get_tokenizer(tokenizer)
+        self.needs_words = self.tokenizer is None
+        self.width = width
+        self.depth = depth
+        # rows are allocated on first use so empty metrics are cheap to pickle.
+        self.table = None
+        self.candidates = {}
+        # the smallest kept estimate after the last prune.
+        self._floor = 0
+        self.distinct = DistinctWords(precision)
+
+    def update(self, piece: str, words) -> None:
+        if self.tokenizer is not None:
+            words = list(self.tokenizer.tokenize(piece))
+        if not words:
+            return
+        if self.table is None:
+            self.table = [[0] * self.width for _ in range(self.depth)]
+        table = self.table
+        width = self.width
+        candidates = self.candidates
+        floor = self._floor
+        hashes = []
+        for word, number in Counter(words).items():
+            value = _hash64(word)
+            hashes.append(value)
+            first, second = value & 0xFFFFFFFF, value >> 32 | 1
+            estimate = None
+            for row, cells in enumerate(table):
+                column = (first + row * second) % width
+                cells[column] += number
+                if estimate is None or cells[column] < estimate:
+                    estimate = cells[column]
+            # only words that can enter the top_k become candidates.
+            if estimate > floor or word in candidates:
+                candidates[word] = estimate
+        self.distinct.add_hashes(hashes)
+        self._prune()
+
+    def _estimate(self, value: int) -> int:
+        '''Return the sketch's count for a word hash.'''
+        table = self.table
+        if table is None:
+            return 0
+        first, second = value & 0xFFFFFFFF, value >> 32 | 1
+        return min(cells[(first + row * second) % self.width] for row, cells in enumerate(table))
+
+    def _prune(self) -> None:
+        '''Keep a heap-selected top_k candidates once the set grows too large.'''
+        if len(self.candidates) > 4 * self.top_k + 64:
+            self.candidates = dict(heapq.nlargest(self.top_k, self.candidates.items(),
+                                                  key=lambda item: item[1]))
+            self._floor = min(self.candidates.values(), default=0)
+
+    def merge(self, other: Metric) -> None:
+        if other.table is not None:
+            if self.table is None:
+                self.table = [row[:] for row in other.table]
+            else:
+                self.table = [[a + b for a, b in zip(mine, theirs)]
+                              for mine, theirs in zip(self.table, other.table)]
+        self.distinct.merge(other.distinct)
+        for word in list(self.candidates) + list(other.candidates):
+            self.candidates[word] = self.count(word)
+        self._prune()
+
+    # look up a single word.
+    def count(self, word: str) -> int:
+        '''Return the estimated count of word; never below the true count.'''
+        return self._estimate(_hash64(word))
+
+    def result(self) -> dict:
+        top = heapq.nlargest(self.top_k, ((self.count(word), word) for word in self.candidates))
+        return {"top_words": [(word, number) for number, word in top],
+                "vocabulary": self.distinct.result()}
+
+    def spawn(self) -> Metric:
+        return type(self)(self.top_k, self.width, self.depth, self.distinct.precision,
+                          self.tokenizer)
+
+
+METRICS = {cls.name: cls for cls in (
+    CharacterCount, UppercaseCount, WordCount, UppercaseWordCount, TokenCount,
+    UppercaseTokenCount, LineCount, CharacterClasses, WordFrequency, DistinctWords,
+    ApproximateWordFrequency,
+)}
+
+
+def create_metrics(specs) -> list:
+    '''Return fresh metrics for a list of metric names and/or Metric instances.'''
+    return [METRICS[spec]() if isinstance(spec, str) else spec.spawn() for spec in specs]
+
+
+class FusedAnalysis:
+    '''Compute any number of metrics in a single pass over the text.
+
+    Text is cut into word-aligned pieces of about PIECE_SIZE characters; each
+    piece is split into words at most once and handed to every metric while
+    it is still hot, so adding a metric never adds a pass over the data and
+    no text-sized intermediate list is built.
+    '''
+    def __init__(self, metrics=("characters", "uppercase")):
+        self.metrics = [METRICS[m]() if isinstance(m, str) else m for m in metrics]
+        self._needs_words = any(metric.needs_words for metric in self.metrics)
+        self._needs_byte_words = any(metric.needs_byte_words for metric in self.metrics)
+        # bytes pieces only pay off when no metric falls back to decoding them.
+        self._bytes_ready = all(type(metric).update_bytes is not Metric.update_bytes
+                                for metric in self.metrics)
+        self._carry = []
+
+    # feed the next part of the text.
+    def feed(self, text: str) -> None:
+        '''Add text; a word cut off at the end is held back for the next call.'''
+        for start in range(0, len(text), PIECE_SIZE):
+            piece = text[start:start + PIECE_SIZE]
+            cut = len(piece)
+            while cut and not piece[cut - 1].isspace():
+                cut -= 1
+            if not cut:
+                self._carry.append(piece)
+                continue
+            head = piece[:cut]
+            if self._carry:
+                head = "".join(self._carry) + head
+                self._carry.clear()
+            self._update(head)
+            if cut < len(piece):
+                self._carry.append(piece[cut:])
+
+    # feed UTF-8 bytes, counting ASCII pieces without decoding them.
+    def feed_bytes(self, data, start: int = 0, end: int = None) -> None:
+        '''Add UTF-8 encoded text from data[start:end] (bytes or an mmap).
+
+        Plain ASCII pieces are counted with bulk bytes operations; any piece
+        holding other UTF-8, b"\r" or \x1c-\x1f is decoded (with text-mode
+        newline translation) and fed as str, so results match feed() on the
+        decoded text. A b"\r\n" pair must not be split between calls.
+        '''
+        end = len(data) if end is None else end
+        while start < end:
+            stop = min(start + BYTE_PIECE_SIZE, end)
+            if stop < end:
+                cut = max(data.rfind(byte, start, stop) for byte in _CUT_BYTES)
+                if cut < start:
+                    found = [data.find(byte, stop, end) for byte in _CUT_BYTES]
+                    cut = min((offset for offset in found if offset != -1), default=end - 1)
+                stop = cut + 1
+            piece = data[start:stop]
+            start = stop
+            tail = b""
+            if not piece[-1:].isspace():
+                # the end of the data may hold half a word: leave it to feed().
+                cut = max(piece.rfind(byte) for byte in _CUT_BYTES) + 1
+                piece, tail = piece[:cut], piece[cut:]
+            if piece:
+                if (self._carry or not self._bytes_ready or not piece.isascii()
+                        or any(byte in piece for byte in _UNSAFE_BYTES)):
+                    self.feed(_decode(piece))
+                else:
+                    self._update_bytes(piece)
+            if tail:
+                self.feed(_decode(tail))
+
+    def _update_bytes(self, piece: bytes) -> None:
+        '''Hand one word-aligned ASCII piece to every metric.'''
+        words = piece.split() if self._needs_byte_words else None
+        for metric in self.metrics:
+            metric.update_bytes(piece, words)
+
+    def _update(self, piece: str) -> None:
+        '''Hand one word-aligned piece to every metric.'''
+        # ASCII text is counted faster as bytes; \x1c-\x1f split str words only.
+        if (self._bytes_ready and piece.isascii()
+                and not any(char in piece for char in _UNSAFE_CHARS)):
+            self._update_bytes(piece.encode("ascii"))
+            return
+        words = piece.split() if self._needs_words else None
+        for metric in self.metrics:
+            metric.update(piece, words)
+
+    def close(self) -> None:
+        '''Flush the held-back word at the end of the text.'''
+        if self._carry:
+            tail = "".join(self._carry)
+            self._carry.clear()
+            self._update(tail)
+
+    def results(self) -> dict:
+        '''Finish the text and return {metric name: value}.'''
+        self.close()
+        return {metric.name: metric.result() for metric in self.metrics}
+
+    def snapshot(self) -> dict:
+        '''Return the results so far without finishing the text, so feeding can go on.'''
+        current = FusedAnalysis([metric.spawn() for metric in self.metrics])
+        for copy, metric in zip(current.metrics, self.metrics):
+            copy.merge(metric)
+        current.feed("".join(self._carry))
+        return current.results()
+
+    def merge(self, other: "FusedAnalysis") -> None:
+        '''Fold in a finished analysis of the text that follows this one.'''
+        self.close()
+        other.close()
+        for metric, later in zip(self.metrics, other.metrics):
+            metric.merge(later)
+
+    def run(self, chunks) -> dict:
+        '''Feed every chunk of an iterable and return the results.'''
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.results()
+
+
+def _decode(data: bytes) -> str:
+    '''Decode UTF-8 bytes the way a text-mode file read would.'''
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
@@ -0,0 +1,182 @@
+''' parallel.py
+multi-core text analysis: the input is cut at whitespace, the pieces are
+analysed in a process pool and the partial metric results are merged in order.
+'''
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import FusedAnalysis, create_metrics
+
+# inputs smaller than this are analysed in the calling process.
+MIN_PARALLEL_SIZE = 1 << 22
+# ranges per worker, so a slow range does not leave the other cores idle.
+RANGES_PER_WORKER = 4
+
+# whitespace bytes a range may end after; never b"\r", so b"\r\n" stays whole
+# and newline translation gives the same text as reading the file in text mode.
+_CUT_BYTES = (b" ", b"\n", b"\t")
+_WHITESPACE = re.compile(r"\s")
+_TRAILING_WORD = re.compile(r"\S*\Z")
+
+# text of the analyze_text() call a forked worker belongs to, set by its initializer.
+_shared_text = None
+
+
+def byte_boundaries(data, parts: int, start: int = 0, end: int = None) -> list:
+    '''Return offsets cutting data[start:end] into about parts whitespace-aligned ranges.
+
+    Every offset falls just after an ASCII space, tab or newline, so no word
+    and no UTF-8 sequence is split between ranges.
+    '''
+    end = len(data) if end is None else end
+    step = max(1, (end - start) // max(1, parts))
+    offsets = [start]
+    target = start + step
+    while target < end:
+        found = [data.find(byte, target, end) for byte in _CUT_BYTES]
+        found = [offset for offset in found if offset != -1]
+        if not found:
+            break
+        cut = min(found) + 1
+        if cut >= end:
+            break
+        offsets.append(cut)
+        target = cut + step
+    offsets.append(end)
+    return offsets
+
+
+def text_boundaries(text: str, parts: int) -> list:
+    '''Return offsets cutting text into about parts ranges that end after whitespace.'''
+    step = max(1, len(text) // max(1, parts))
+    offsets = [0]
+    target = step
+    while target < len(text):
+        match = _WHITESPACE.search(text, target - 1)
+        if match is None or match.end() >= len(text):
+            break
+        cut = match.end()
+        offsets.append(cut)
+        target = cut + step
+    offsets.append(len(text))
+    return offsets
+
+
+def analyse_file_range(path, start: int, end: int, metrics) -> list:
+    '''Analyse bytes start:end of a UTF-8 file and return the metric objects.
+
+    The file is memory-mapped in the worker, so only the offsets cross the
+    process boundary, and ASCII text is counted without being decoded.
+    '''
+    engine = FusedAnalysis(create_metrics(metrics))
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return engine.metrics
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            engine.feed_bytes(data, start, end)
+    engine.close()
+    return engine.metrics
+
+
+def _share_text(text: str) -> None:
+    '''Pool initializer: keep the text a forked worker inherited from its parent.'''
+    global _shared_text
+    _shared_text = text
+
+
+def analyse_text_range(start: int, end: int, metrics, text: str = None) -> list:
+    '''Analyse text[start:end] (the worker's _shared_text by default) and return the metrics.'''
+    text = _shared_text if text is None else text
+    engine = FusedAnalysis(create_metrics(metrics))
+    engine.feed(text[start:end])
+    engine.close()
+    return engine.metrics
+
+
+def _combine(parts, metrics) -> FusedAnalysis:
+    '''Merge per-range metric lists in input order into one engine.'''
+    total = FusedAnalysis(create_metrics(metrics))
+    for metric_list in parts:
+        total.merge(FusedAnalysis(metric_list))
+    return total
+
+
+def _merge(parts, metrics) -> dict:
+    '''Merge per-range metric lists in input order and return the results.'''
+    return _combine(parts, metrics).results()
+
+
+def _executor(workers: int, fork: bool = False, initializer=None,
+              initargs=()) -> ProcessPoolExecutor:
+    '''Return a process pool, forking when asked and the platform allows it.
+
+    initializer only runs in forked pools, where initargs are inherited
+    rather than pickled.
+    '''
+    if fork and "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"),
+                                   initializer=initializer, initargs=initargs)
+    return ProcessPoolExecutor(workers)
+
+
+def analyze_file(path, metrics=("characters", "uppercase"), workers: int = None) -> dict:
+    '''Analyse a UTF-8 file on all cores and return {metric name: value}.
+
+    The result equals FusedAnalysis(metrics).run() over the file read in text
+    mode with universal newlines.
+    '''
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if workers == 1 or size < MIN_PARALLEL_SIZE:
+        return _merge([analyse_file_range(path, 0, size, metrics)], metrics)
+
+    with open(path, "rb") as handle, \
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offsets = byte_boundaries(data, workers * RANGES_PER_WORKER)
+    with _executor(workers) as executor:
+        futures = [executor.submit(analyse_file_range, os.fspath(path), start, end, metrics)
+                   for start, end in zip(offsets, offsets[1:])]
+        return _merge((future.result() for future in futures), metrics)
+
+
+def analyze_text(text: str, metrics=("characters", "uppercase"), workers: int = None) -> dict:
+    '''Analyse an in-memory string on all cores and return {metric name: value}.'''
+    return text_engine(text, metrics, workers).results()
+
+
+def text_engine(text: str, metrics=("characters", "uppercase"),
+                workers: int = None) -> FusedAnalysis:
+    '''Analyse text on all cores and return the engine, open for more text.
+
+    As with FusedAnalysis.feed(), a word cut off at the end of text is held
+    back, so feeding the engine what follows continues that word. Where the
+    platform can fork, workers inherit the string through their pool's
+    initializer instead of receiving pickled copies of their ranges; each
+    call has its own pool, so concurrent calls do not share the text.
+    '''
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(text) < MIN_PARALLEL_SIZE:
+        engine = FusedAnalysis(create_metrics(metrics))
+        engine.feed(text)
+        return engine
+
+    # the pool covers text up to its last whitespace; the rest is fed here.
+    head = _TRAILING_WORD.search(text).start()
+    offsets = text_boundaries(text, workers * RANGES_PER_WORKER)
+    offsets = [offset for offset in offsets[:-1] if offset < head] + [head]
+    ranges = list(zip(offsets, offsets[1:]))
+    forked = "fork" in multiprocessing.get_all_start_methods()
+    with _executor(workers, fork=True, initializer=_share_text, initargs=(text,)) as executor:
+        if forked:
+            futures = [executor.submit(analyse_text_range, start, end, metrics)
+                       for start, end in ranges]
+        else:
+            futures = [executor.submit(analyse_text_range, 0, end - start, metrics,
+                                       text[start:end])
+                       for start, end in ranges]
+        engine = _combine((future.result() for future in futures), metrics)
+    engine.feed(text[head:])
+    return engine
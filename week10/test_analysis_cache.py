@@ -0,0 +1,147 @@
+"""
+Test script for the analysis result cache
+Checks hits and misses, file pre-keys, eviction and SQLite persistence
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import analysis_cache
+from analysis_cache import AnalysisCache
+from analyzer import TextAnalyser
+from metrics import create_metrics
+
+TEXT = "the cat and THE hat and the bat\n"
+
+
+def test_text_hits_and_misses():
+    """Test that repeated texts hit and different options miss."""
+    print("Testing text cache...")
+    cache = AnalysisCache()
+    expected = TextAnalyser(TEXT).analyze(top_k=2)
+    assert cache.analyze(TEXT, top_k=2) == expected
+    assert cache.analyze(TEXT, top_k=2) == expected
+    # top_words come back as (word, count) tuples, as analyze() returns them
+    assert cache.analyze(TEXT, top_k=2)["top_words"] == [("the", 2), ("and", 2)]
+    assert cache.analyze(TEXT, top_k=3) == TextAnalyser(TEXT).analyze(top_k=3)
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["entries"] == 2
+    assert AnalysisCache.text_key(TEXT) != AnalysisCache.text_key(TEXT, metrics=["lines"])
+    print("✓ Text cache test passed")
+
+
+def test_file_prekey():
+    """Test that unchanged files are not read again and changed ones are."""
+    print("Testing file keys...")
+    cache = AnalysisCache()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "text.txt")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(TEXT)
+        first = cache.analyze_file(path, metrics=["lines"])
+        with patch.object(analysis_cache, "file_hash",
+                          side_effect=AssertionError("file read again")):
+            assert cache.analyze_file(path, metrics=["lines"]) == first
+        assert cache.stats()["file_hits"] == 1 and cache.stats()["hits"] == 1
+
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write("MORE words\n")
+        changed = cache.analyze_file(path, metrics=["lines"])
+        assert changed == TextAnalyser(TEXT + "MORE words\n").analyze(["lines"])
+        assert cache.stats()["misses"] == 2
+    print("✓ File keys test passed")
+
+
+def test_eviction():
+    """Test the entry and byte limits of the in-memory LRU."""
+    print("Testing eviction...")
+    cache = AnalysisCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+
+    cache = AnalysisCache(max_bytes=20)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] <= 20
+    cache.put("c", {"n": 3})
+    assert cache.stats()["entries"] == 2 and cache.get("a") is None
+
+    for limits in ((0, 1), (1, 0)):
+        try:
+            AnalysisCache(*limits)
+            assert False, "limits below 1 should be rejected"
+        except ValueError:
+            pass
+    print("✓ Eviction test passed")
+
+
+def test_sqlite_persistence():
+    """Test that results and file digests survive reopening the cache."""
+    print("Testing SQLite persistence...")
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "cache.db")
+        path = os.path.join(directory, "text.txt")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(TEXT)
+        with AnalysisCache(path=db_path) as cache:
+            expected = cache.analyze_file(path, top_k=2)
+            cache.analyze(TEXT, top_k=2)
+
+        with AnalysisCache(max_entries=1, path=db_path) as cache:
+            with patch.object(analysis_cache, "file_hash",
+                              side_effect=AssertionError("file read again")):
+                assert cache.analyze_file(path, top_k=2) == expected
+            assert cache.analyze(TEXT, top_k=2)["top_words"] == [("the", 2), ("and", 2)]
+            stats = cache.stats()
+            assert stats["disk_hits"] == 2 and stats["file_hits"] == 1
+            assert stats["misses"] == 0
+            cache.clear()
+            assert cache.get(cache.text_key(TEXT, top_k=2)) is None
+    print("✓ SQLite persistence test passed")
+
+
+def test_unkeyable_options():
+    """Test that metric objects cannot be part of a key."""
+    print("Testing unkeyable options...")
+    try:
+        AnalysisCache.text_key(TEXT, metrics=create_metrics(["lines"]))
+        assert False, "metric objects should be rejected"
+    except ValueError:
+        pass
+    print("✓ Unkeyable options test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Analysis Cache Tests")
+    print("=" * 40)
+
+    try:
+        test_text_hits_and_misses()
+        test_file_prekey()
+        test_eviction()
+        test_sqlite_persistence()
+        test_unkeyable_options()
+
+        print("\n" + "=" * 40)
+        print("🎉 All analysis cache tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,123 @@
+"""
+Test script for TextAnalyser
+Checks streaming analysis against analyzing the whole text at once
+"""
+
+import io
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import parallel
+from analyzer import TextAnalyser
+
+TEXT = "Hello World. THIS is a TEST.\nPython is GREAT, ÉTÉ déjà vu.\r\nend"
+
+
+def test_stream_matches_analyze():
+    """Test paths, file objects and chunk iterables against analyze()."""
+    print("Testing streaming analysis...")
+    metrics = ["words", "uppercase_words", "lines"]
+    expected = TextAnalyser(TEXT.replace("\r\n", "\n")).analyze(metrics)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "text.txt")
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            handle.write(TEXT)
+        assert TextAnalyser.analyze_stream(path, metrics=metrics) == expected
+        for chunk_size in (1, 2, 3, 7, 64):
+            with open(path, encoding="utf-8") as handle:
+                assert TextAnalyser.analyze_stream(handle, chunk_size, metrics) == expected
+
+    text = TEXT.replace("\r\n", "\n")
+    for size in (1, 4, 5, 100):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert TextAnalyser.analyze_stream(chunks, metrics=metrics) == expected
+    assert TextAnalyser.analyze_stream(io.StringIO(text), 3, metrics) == expected
+    print("✓ Streaming analysis test passed")
+
+
+def test_stream_rejects_bytes():
+    """Test that chunk iterables must hold strings."""
+    print("Testing bad chunks...")
+    try:
+        TextAnalyser.analyze_stream([b"bytes"])
+        assert False, "bytes chunks should be rejected"
+    except ValueError:
+        pass
+    assert TextAnalyser.analyze_stream([]) == TextAnalyser("").analyze()
+    print("✓ Bad chunks test passed")
+
+
+def test_append_only_scans_new_text():
+    """Test that analyze() after append() matches a fresh analyser, one scan each."""
+    print("Testing incremental analysis...")
+    metrics = ["words", "uppercase_words", "lines"]
+    parts = ["Hello WOR", "LD and more\n", "words ", "", "AT THE en", "d"]
+    texts = ["start "]
+    for part in parts + [" UPDATED tail"]:
+        texts.append(texts[-1] + part)
+    expected = [TextAnalyser(text).analyze(metrics, top_k=3) for text in texts]
+    original = parallel.text_engine
+    for workers in (1, 2):
+        analyser = TextAnalyser("")
+        scans = []
+
+        def counting_engine(text, *args):
+            scans.append(len(text))
+            return original(text, *args)
+
+        results = []
+        with patch.object(parallel, "MIN_PARALLEL_SIZE", 1), \
+                patch.object(parallel, "text_engine", counting_engine):
+            analyser.append("start ")
+            results.append(analyser.analyze(metrics, workers, top_k=3))
+            for part in parts:
+                analyser.append(part)
+                results.append(analyser.analyze(metrics, workers, top_k=3))
+            analyser.update(texts[-1])
+            results.append(analyser.analyze(metrics, workers, top_k=3))
+        assert results == expected
+        assert scans == [len("start ")]
+    print("✓ Incremental analysis test passed")
+
+
+def test_results_are_copies():
+    """Test that changing a returned result leaves the cached one alone."""
+    print("Testing cached result copies...")
+    analyser = TextAnalyser("a b a c a b")
+    result = analyser.analyze(["character_classes"], top_k=2)
+    result["top_words"].append(("x", 99))
+    result["character_classes"]["letters"] = -1
+    again = analyser.analyze(["character_classes"], top_k=2)
+    assert again["top_words"] == [("a", 3), ("b", 2)]
+    assert again["character_classes"]["letters"] == 6
+    print("✓ Cached result copies test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Text Analyser Tests")
+    print("=" * 40)
+
+    try:
+        test_stream_matches_analyze()
+        test_stream_rejects_bytes()
+        test_append_only_scans_new_text()
+        test_results_are_copies()
+
+        print("\n" + "=" * 40)
+        print("🎉 All text analyser tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+"""
+Test script for the benchmark suite
+Checks the synthetic corpus, baseline comparison and a tiny full run
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import benchmark
+
+
+def test_generate_corpus():
+    """Test corpus size, determinism and alphabets."""
+    print("Testing corpus generation...")
+    text = benchmark.generate_corpus(5000, seed=1)
+    assert len(text) == 5000
+    assert text == benchmark.generate_corpus(5000, seed=1)
+    assert text != benchmark.generate_corpus(5000, seed=2)
+    assert set(text.lower()) <= set(benchmark.ALPHABETS["ascii"] + benchmark.PUNCTUATION + " \n")
+    assert any(word.isupper() for word in text.split())
+
+    mixed = benchmark.generate_corpus(5000, {"ascii": 1, "cjk": 1}, upper=0)
+    assert any(character in benchmark.ALPHABETS["cjk"] for character in mixed)
+    assert not any(word.isupper() for word in mixed.split())
+    assert benchmark.generate_corpus(0) == ""
+    print("✓ Corpus generation test passed")
+
+
+def test_parse_mix():
+    """Test alphabet weight parsing."""
+    print("Testing mix parsing...")
+    assert benchmark.parse_mix("ascii") == {"ascii": 1.0}
+    assert benchmark.parse_mix("ascii=3,cjk=0.5") == {"ascii": 3.0, "cjk": 0.5}
+    try:
+        benchmark.parse_mix("ascii,klingon=2")
+        assert False, "unknown alphabets should be rejected"
+    except argparse.ArgumentTypeError:
+        pass
+    print("✓ Mix parsing test passed")
+
+
+def test_compare():
+    """Test that only slowdowns and memory growth beyond the threshold are reported."""
+    print("Testing baseline comparison...")
+    corpus = {"characters": 10, "bytes": 10, "mix": {"ascii": 1.0}, "seed": 0}
+    baseline = {"corpus": corpus, "results": {
+        "fast": {"mb_per_s": 100.0, "peak_bytes": 1000},
+        "small": {"mb_per_s": 100.0, "peak_bytes": 1000},
+    }}
+    current = {"corpus": corpus, "results": {
+        "fast": {"mb_per_s": 85.0, "peak_bytes": 1050},
+        "small": {"mb_per_s": 95.0, "peak_bytes": 1200},
+        "new": {"mb_per_s": 1.0, "peak_bytes": 10 ** 9},
+    }}
+    regressions = benchmark.compare(current, baseline, threshold=0.1)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("fast: 85.0 MB/s")
+    assert regressions[1].startswith("small: peak 1,200 bytes")
+    assert benchmark.compare(current, baseline, threshold=0.25) == []
+
+    other = dict(current, corpus=dict(corpus, seed=1))
+    assert len(benchmark.compare(other, baseline)) == 1
+    print("✓ Baseline comparison test passed")
+
+
+def test_tiny_run():
+    """Test every mode on a tiny corpus and a save/compare round trip."""
+    print("Testing a tiny run...")
+    report = benchmark.run(2000, {"ascii": 1.0, "latin": 1.0}, repeat=1)
+    assert list(report["results"]) == list(benchmark.MODES)
+    for result in report["results"].values():
+        assert result["seconds"] >= 0 and result["peak_bytes"] >= 0
+    assert report["corpus"]["characters"] == 2000
+    assert report["corpus"]["bytes"] > 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "baseline.json")
+        argv = ["--size", "0.001", "--mode", "analyze", "--repeat", "1"]
+        assert benchmark.main(argv + ["--save", path]) == 0
+        with open(path, encoding="utf-8") as handle:
+            assert list(json.load(handle)["results"]) == ["analyze"]
+        # a huge threshold makes the comparison independent of timing noise
+        assert benchmark.main(argv + ["--compare", path, "--threshold", "1000"]) == 0
+    print("✓ Tiny run test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Benchmark Tests")
+    print("=" * 40)
+
+    try:
+        test_generate_corpus()
+        test_parse_mix()
+        test_compare()
+        test_tiny_run()
+
+        print("\n" + "=" * 40)
+        print("🎉 All benchmark tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,136 @@
+"""
+Test script for the batch command line
+Checks path expansion, output formats, totals, standard input and exit codes
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import main
+from analyzer import TextAnalyser
+
+FILES = {
+    "a.txt": "Hello WORLD\n",
+    "b.md": "one TWO three\n",
+    os.path.join("sub", "c.txt"): "ÉTÉ déjà vu\n",
+}
+
+
+def make_tree(directory):
+    """Write FILES under directory."""
+    for name, text in FILES.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+
+
+def run_main(argv, stdin=""):
+    """Run main() with argv and return (exit code, stdout, stderr)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with patch.object(sys, "stdin", io.StringIO(stdin)), \
+            patch.object(sys, "stdout", stdout), patch.object(sys, "stderr", stderr):
+        code = main.main(argv)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+def test_iter_paths():
+    """Test files, directories, patterns, globs and missing paths."""
+    print("Testing path expansion...")
+    with tempfile.TemporaryDirectory() as directory:
+        make_tree(directory)
+        a, b, c = (os.path.join(directory, name) for name in FILES)
+        assert list(main.iter_paths([directory])) == [a, b, c]
+        assert list(main.iter_paths([directory], "*.txt")) == [a, c]
+        assert list(main.iter_paths([os.path.join(directory, "**", "*.txt")])) == [a, c]
+        missing = os.path.join(directory, "missing.txt")
+        assert list(main.iter_paths([b, main.STDIN, missing])) == [b, main.STDIN, missing]
+    print("✓ Path expansion test passed")
+
+
+def test_jsonl_output():
+    """Test one JSON record per file in order, an error record and the totals."""
+    print("Testing JSONL output...")
+    with tempfile.TemporaryDirectory() as directory:
+        make_tree(directory)
+        missing = os.path.join(directory, "missing.txt")
+        for jobs, pool in (("1", "process"), ("2", "process"), ("2", "thread")):
+            code, out, _ = run_main([directory, missing, "--format", "jsonl",
+                                     "--jobs", jobs, "--pool", pool, "--metric", "lines"])
+            records = [json.loads(line) for line in out.splitlines()]
+            assert code == 1
+            assert [record["path"] for record in records[:3]] == \
+                [os.path.join(directory, name) for name in FILES]
+            for record, text in zip(records, FILES.values()):
+                expected = TextAnalyser(text).analyze(["lines"])
+                assert {key: record[key] for key in expected} == expected
+            assert records[3]["path"] == missing and "error" in records[3]
+            totals = records[4]
+            assert totals["path"] == "<total>"
+            assert totals["files"] == 3 and totals["errors"] == 1
+            assert totals["lines"] == 3
+            assert totals["total_words"] == sum(record["total_words"] for record in records[:3])
+    print("✓ JSONL output test passed")
+
+
+def test_csv_and_text_output():
+    """Test the CSV columns and the text report with its total."""
+    print("Testing CSV and text output...")
+    with tempfile.TemporaryDirectory() as directory:
+        make_tree(directory)
+        code, out, _ = run_main([directory, "--format", "csv", "--jobs", "1", "--top", "2"])
+        rows = list(csv.DictReader(io.StringIO(out)))
+        assert code == 0
+        assert list(rows[0]) == ["path", "total_words", "upper_words", "vocabulary",
+                                 "top_words", "files", "errors", "error"]
+        assert json.loads(rows[0]["top_words"]) == [["Hello", 1], ["WORLD", 1]]
+        assert rows[-1]["path"] == "<total>" and rows[-1]["files"] == "3"
+
+        code, out, _ = run_main([directory, "--jobs", "1"])
+        assert code == 0
+        assert out.count("Analysis Result:") == 4
+        assert "Total (3 files, 0 errors):" in out
+    print("✓ CSV and text output test passed")
+
+
+def test_stdin():
+    """Test that piped input is analysed as the - path."""
+    print("Testing standard input...")
+    code, out, _ = run_main(["--format", "jsonl"], stdin="Piped TEXT in\n")
+    record = json.loads(out.splitlines()[0])
+    assert code == 0
+    assert record == {"path": main.STDIN, **TextAnalyser("Piped TEXT in\n").analyze()}
+    print("✓ Standard input test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Batch CLI Tests")
+    print("=" * 40)
+
+    try:
+        test_iter_paths()
+        test_jsonl_output()
+        test_csv_and_text_output()
+        test_stdin()
+
+        print("\n" + "=" * 40)
+        print("🎉 All batch CLI tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
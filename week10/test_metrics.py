@@ -0,0 +1,268 @@
+"""
+Test script for the fused text metrics
+Checks every metric against a direct computation on the whole text
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+import metrics
+from analyzer import TextAnalyser
+from metrics import (ApproximateWordFrequency, DistinctWords, FusedAnalysis, Metric,
+                     WordFrequency)
+
+BASIC = ["characters", "uppercase", "words", "uppercase_words", "lines", "character_classes"]
+ALPHABET = "abcXYZ019 \n\t.,'-éÉßΣπ的"
+# ASCII text with the characters the bytes fast path must handle with care
+ASCII_ALPHABET = "abcXYZ019 \n\t.," + "\r\n" * 3 + "\r\x1c\x1d\x1e\x1f\x0b\x0c"
+
+
+def random_text(rng, size, alphabet=ALPHABET):
+    """Return size random characters drawn from alphabet."""
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+def reference(text):
+    """Compute the BASIC metrics directly on the whole text."""
+    words = text.split()
+    letters = sum(map(str.isalpha, text))
+    digits = sum(map(str.isdigit, text))
+    whitespace = sum(map(str.isspace, text))
+    return {
+        "characters": len(text),
+        "uppercase": sum(map(str.isupper, text)),
+        "words": len(words),
+        "uppercase_words": sum(map(str.isupper, words)),
+        "lines": text.count("\n") + (1 if text and not text.endswith("\n") else 0),
+        "character_classes": {
+            "letters": letters,
+            "digits": digits,
+            "whitespace": whitespace,
+            "uppercase": sum(map(str.isupper, text)),
+            "lowercase": sum(map(str.islower, text)),
+            "other": len(text) - letters - digits - whitespace,
+        },
+    }
+
+
+def chunked(text, size):
+    """Cut text into chunks of size characters, splitting words anywhere."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_metrics_match_reference():
+    """Test every basic metric over many chunkings and piece sizes."""
+    print("Testing metrics against reference...")
+    rng = random.Random(1)
+    old_piece = metrics.PIECE_SIZE
+    try:
+        for piece_size in (1, 3, 16, old_piece):
+            metrics.PIECE_SIZE = piece_size
+            for _ in range(20):
+                text = random_text(rng, rng.randint(0, 300))
+                expected = reference(text)
+                for size in (1, 2, 7, 1000):
+                    engine = FusedAnalysis(BASIC)
+                    assert engine.run(chunked(text, size)) == expected
+    finally:
+        metrics.PIECE_SIZE = old_piece
+    print("✓ Metrics against reference test passed")
+
+
+class DigitCount(Metric):
+    """A metric defined outside metrics.py."""
+    name = "digits"
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, piece, words):
+        self.count += sum(map(str.isdigit, piece))
+
+    def merge(self, other):
+        self.count += other.count
+
+    def result(self):
+        return self.count
+
+
+def test_custom_metric():
+    """Test that Metric instances can be mixed with metric names."""
+    print("Testing custom metric...")
+    results = FusedAnalysis(["words", DigitCount()]).run(["a1 b22", " c333\n"])
+    assert results == {"words": 3, "digits": 6}
+    try:
+        FusedAnalysis(["no_such_metric"])
+        assert False, "unknown metric names should be rejected"
+    except KeyError:
+        pass
+    print("✓ Custom metric test passed")
+
+
+def text_mode(text):
+    """Return text as reading its UTF-8 encoding in text mode would give it."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def test_bytes_match_text():
+    """Test feed_bytes() against analyzing the decoded text."""
+    print("Testing bytes fast path...")
+    rng = random.Random(3)
+    old_sizes = metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE
+    try:
+        for piece_size, byte_piece_size in ((1, 1), (3, 2), (16, 5), (7, 64), old_sizes):
+            metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE = piece_size, byte_piece_size
+            for alphabet in (ASCII_ALPHABET, ASCII_ALPHABET + "é的", "ab \r\n"):
+                for _ in range(15):
+                    text = random_text(rng, rng.randint(0, 200), alphabet)
+                    data = text.encode("utf-8")
+                    engine = FusedAnalysis(BASIC)
+                    engine.feed_bytes(data)
+                    assert engine.results() == reference(text_mode(text)), repr(text)
+    finally:
+        metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE = old_sizes
+    print("✓ Bytes fast path test passed")
+
+
+def test_fast_path_is_used():
+    """Test that plain ASCII skips decoding and unsafe bytes never reach the fast path."""
+    print("Testing fast path selection...")
+    calls = []
+    engine = FusedAnalysis(["characters", "words"])
+    original = engine._update_bytes
+    engine._update_bytes = lambda piece: (calls.append(piece), original(piece))
+    parts = [b"plain ascii words\n", b"crlf line\r\n", b"sep\x1cword ",
+             "non ascii é ".encode("utf-8"), b"a\x1fb "]
+    for part in parts:
+        engine.feed_bytes(part)
+    assert calls[0] == b"plain ascii words\n"
+    # the CRLF piece is decoded and translated before it is counted as bytes
+    assert b"crlf line\n" in calls
+    for piece in calls:
+        assert piece.isascii()
+        assert not any(byte in piece for byte in (b"\r", b"\x1c", b"\x1d", b"\x1e", b"\x1f"))
+    text = text_mode(b"".join(parts).decode("utf-8"))
+    assert engine.results() == {"characters": len(text), "words": len(text.split())}
+    print("✓ Fast path selection test passed")
+
+
+def test_stream_files_match_analyze():
+    """Test analyze_stream() on files against analyze() on the decoded text."""
+    print("Testing file streaming...")
+    rng = random.Random(4)
+    old_sizes = metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE
+    metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE = 5, 8
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "text.txt")
+            for alphabet in (ASCII_ALPHABET, ALPHABET + "\r\x1c"):
+                for _ in range(15):
+                    text = random_text(rng, rng.randint(0, 300), alphabet)
+                    with open(path, "wb") as handle:
+                        handle.write(text.encode("utf-8"))
+                    expected = TextAnalyser(text_mode(text)).analyze(BASIC)
+                    assert TextAnalyser.analyze_stream(path, metrics=BASIC) == expected
+    finally:
+        metrics.PIECE_SIZE, metrics.BYTE_PIECE_SIZE = old_sizes
+    print("✓ File streaming test passed")
+
+
+def zipf_words(rng, count, vocabulary):
+    """Return count words drawn with Zipf-like frequencies from w0..w{vocabulary-1}."""
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices([f"w{rank}" for rank in range(vocabulary)], weights, k=count)
+
+
+def test_exact_word_frequency():
+    """Test exact top-k words and vocabulary against Counter."""
+    print("Testing exact word frequency...")
+    rng = random.Random(5)
+    words = zipf_words(rng, 5000, 300)
+    text = " ".join(words)
+    expected = Counter(words)
+    metric = WordFrequency(top_k=5)
+    FusedAnalysis([metric]).run(chunked(text, 97))
+    assert metric.result()["vocabulary"] == len(expected)
+    assert [count for _, count in metric.result()["top_words"]] == \
+        [count for _, count in expected.most_common(5)]
+    assert all(metric.count(word) == number for word, number in expected.items())
+    assert TextAnalyser(text).analyze(top_k=3)["top_words"] == expected.most_common(3)
+    print("✓ Exact word frequency test passed")
+
+
+def test_approximate_word_frequency():
+    """Test the sketch against exact counts, in one run and merged from parts."""
+    print("Testing approximate word frequency...")
+    rng = random.Random(6)
+    words = zipf_words(rng, 40000, 5000)
+    expected = Counter(words)
+    top = [word for word, _ in expected.most_common(5)]
+
+    single = ApproximateWordFrequency(top_k=5, width=1 << 12)
+    FusedAnalysis([single]).run(chunked(" ".join(words) + " ", 1000))
+    merged = single.spawn()
+    for start in range(0, len(words), 7000):
+        part = single.spawn()
+        FusedAnalysis([part]).run([" ".join(words[start:start + 7000]) + " "])
+        merged.merge(part)
+
+    for metric in (single, merged):
+        result = metric.result()
+        assert [word for word, _ in result["top_words"]] == top
+        assert all(metric.count(word) >= number for word, number in expected.items())
+        assert abs(result["vocabulary"] - len(expected)) < 0.05 * len(expected)
+    assert merged.result() == single.result()
+    print("✓ Approximate word frequency test passed")
+
+
+def test_distinct_words():
+    """Test the HyperLogLog estimate and its merge."""
+    print("Testing distinct words...")
+    first, second = DistinctWords(), DistinctWords()
+    first.update("", [f"a{i}" for i in range(20000)])
+    second.update("", [f"a{i}" for i in range(10000, 50000)])
+    assert abs(first.result() - 20000) < 600
+    first.merge(second)
+    assert abs(first.result() - 50000) < 1500
+    assert DistinctWords().result() == 0
+    try:
+        DistinctWords(precision=3)
+        assert False, "precision below 4 should be rejected"
+    except ValueError:
+        pass
+    print("✓ Distinct words test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Text Metrics Tests")
+    print("=" * 40)
+
+    try:
+        test_metrics_match_reference()
+        test_custom_metric()
+        test_bytes_match_text()
+        test_fast_path_is_used()
+        test_stream_files_match_analyze()
+        test_exact_word_frequency()
+        test_approximate_word_frequency()
+        test_distinct_words()
+
+        print("\n" + "=" * 40)
+        print("🎉 All text metrics tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+"""
+Test script for parallel text analysis
+Checks that process-pool results match a single-process run
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import parallel
+from metrics import FusedAnalysis
+
+METRICS = ["characters", "uppercase", "words", "uppercase_words", "lines"]
+
+
+def single_process(text, metrics=METRICS):
+    """Analyse text in one FusedAnalysis, the reference result."""
+    return FusedAnalysis(metrics).run(text)
+
+
+def test_boundaries():
+    """Test that ranges cover the input and end after whitespace."""
+    print("Testing boundaries...")
+    data = b"one two\r\nthree\tfour  five\r\n" * 50
+    offsets = parallel.byte_boundaries(data, 7)
+    assert offsets[0] == 0 and offsets[-1] == len(data)
+    assert offsets == sorted(set(offsets))
+    for cut in offsets[1:-1]:
+        assert data[cut - 1:cut] in (b" ", b"\n", b"\t")
+
+    text = data.decode()
+    offsets = parallel.text_boundaries(text, 7)
+    assert offsets[0] == 0 and offsets[-1] == len(text)
+    for cut in offsets[1:-1]:
+        assert text[cut - 1].isspace()
+    print("✓ Boundaries test passed")
+
+
+def test_parallel_matches_single_process():
+    """Test analyze_file and analyze_text against one FusedAnalysis."""
+    print("Testing parallel results...")
+    old_size = parallel.MIN_PARALLEL_SIZE
+    parallel.MIN_PARALLEL_SIZE = 1
+    text = "Hello WORLD, héllo ÉTÉ\r\nsecond LINE\tend \x1cx\n" * 2000
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "text.txt")
+            with open(path, "w", encoding="utf-8", newline="") as handle:
+                handle.write(text)
+            with open(path, encoding="utf-8") as handle:
+                expected = single_process(handle.read())
+            assert parallel.analyze_file(path, METRICS, workers=3) == expected
+        assert parallel.analyze_text(text, METRICS, workers=3) == single_process(text)
+    finally:
+        parallel.MIN_PARALLEL_SIZE = old_size
+    print("✓ Parallel results test passed")
+
+
+def test_text_engine_holds_back_last_word():
+    """Test that a pool-built engine continues a word cut off at the end."""
+    print("Testing open engine...")
+    old_size = parallel.MIN_PARALLEL_SIZE
+    parallel.MIN_PARALLEL_SIZE = 1
+    text = "Alpha BETA gamma\n" * 3000 + "DEL"
+    try:
+        for workers in (1, 3):
+            engine = parallel.text_engine(text, METRICS, workers)
+            assert engine.snapshot() == single_process(text)
+            engine.feed("TA epsilon")
+            assert engine.results() == single_process(text + "TA epsilon")
+    finally:
+        parallel.MIN_PARALLEL_SIZE = old_size
+    print("✓ Open engine test passed")
+
+
+def test_concurrent_calls():
+    """Test that concurrent analyze_text calls each see their own text."""
+    print("Testing concurrent calls...")
+    old_size = parallel.MIN_PARALLEL_SIZE
+    parallel.MIN_PARALLEL_SIZE = 1
+    texts = ["lower case words\n" * 20000, "UPPER CASE WORDS\n" * 20000]
+    expected = [single_process(text, ["characters", "uppercase"]) for text in texts]
+    failures = []
+
+    def worker(index):
+        for _ in range(3):
+            result = parallel.analyze_text(texts[index], workers=2)
+            if result != expected[index]:
+                failures.append((index, result))
+
+    try:
+        threads = [threading.Thread(target=worker, args=(index,)) for index in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        parallel.MIN_PARALLEL_SIZE = old_size
+    assert failures == []
+    print("✓ Concurrent calls test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Parallel Analysis Tests")
+    print("=" * 40)
+
+    try:
+        test_boundaries()
+        test_parallel_matches_single_process()
+        test_text_engine_holds_back_last_word()
+        test_concurrent_calls()
+
+        print("\n" + "=" * 40)
+        print("🎉 All parallel analysis tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
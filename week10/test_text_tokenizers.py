@@ -0,0 +1,100 @@
+"""
+Test script for the word tokenizers
+Checks each strategy on punctuation, joiners and CJK text
+"""
+
+import pickle
+import sys
+from analyzer import TextAnalyser
+from text_tokenizers import TOKENIZERS, Tokenizer, get_tokenizer
+
+TEXT = "Hello, World. don't well-known -x- 東京に行く 123 a_b ÉTÉ co--op"
+
+
+def test_strategies():
+    """Test the tokens of each strategy."""
+    print("Testing tokenizers...")
+    assert list(get_tokenizer("whitespace")(TEXT)) == TEXT.split()
+    assert list(get_tokenizer("regex")(TEXT)) == [
+        "Hello", "World", "don't", "well-known", "x", "東京に行く", "123", "a_b", "ÉTÉ",
+        "co", "op"]
+    assert list(get_tokenizer("unicode")(TEXT)) == [
+        "Hello", "World", "don't", "well-known", "x", "東", "京", "に", "行", "く", "123",
+        "a_b", "ÉTÉ", "co", "op"]
+    for name in TOKENIZERS:
+        tokenizer = get_tokenizer(name)
+        assert tokenizer.count(TEXT) == len(list(tokenizer.tokenize(TEXT)))
+        assert list(tokenizer.tokenize("")) == []
+    print("✓ Tokenizers test passed")
+
+
+def test_pieces_match_whole_text():
+    """Test that tokenizing text cut at whitespace gives the same tokens."""
+    print("Testing tokenizing in pieces...")
+    pieces = TEXT.split(" ")
+    for name in TOKENIZERS:
+        tokenizer = get_tokenizer(name)
+        tokens = [token for piece in pieces for token in tokenizer.tokenize(piece)]
+        assert tokens == list(tokenizer.tokenize(TEXT))
+        assert not any(character.isspace() for token in tokens for character in token)
+    print("✓ Tokenizing in pieces test passed")
+
+
+def test_lookup_and_pickling():
+    """Test get_tokenizer() and that tokenizers pickle by name."""
+    print("Testing tokenizer lookup...")
+    unicode_tokenizer = get_tokenizer("unicode")
+    assert get_tokenizer("unicode") is unicode_tokenizer
+    assert get_tokenizer(unicode_tokenizer) is unicode_tokenizer
+    assert pickle.loads(pickle.dumps(unicode_tokenizer)) is unicode_tokenizer
+    try:
+        get_tokenizer("no_such_tokenizer")
+        assert False, "unknown tokenizers should be rejected"
+    except ValueError:
+        pass
+    try:
+        list(Tokenizer().tokenize(TEXT))
+        assert False, "the base class has no strategy"
+    except NotImplementedError:
+        pass
+    print("✓ Tokenizer lookup test passed")
+
+
+def test_analyze_with_tokenizer():
+    """Test the token counts and top words analyze() reports."""
+    print("Testing analyze with a tokenizer...")
+    result = TextAnalyser("the THE the, 東京 東").analyze(tokenizer="unicode", top_k=2)
+    assert result["tokens"] == 6
+    assert result["uppercase_tokens"] == 1
+    assert result["top_words"] == [("the", 2), ("東", 2)]
+    assert result["vocabulary"] == 4
+    print("✓ Analyze with a tokenizer test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Tokenizer Tests")
+    print("=" * 40)
+
+    try:
+        test_strategies()
+        test_pieces_match_whole_text()
+        test_lookup_and_pickling()
+        test_analyze_with_tokenizer()
+
+        print("\n" + "=" * 40)
+        print("🎉 All tokenizer tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
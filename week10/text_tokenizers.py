@@ -0,0 +1,143 @@
+''' text_tokenizers.py
+word tokenizers that stream tokens from text, from a plain whitespace split to
+a Unicode-category state machine that handles punctuation and CJK text.
+'''
+import re
+import unicodedata
+
+# ranges of scripts written without spaces, tokenised one character at a time.
+IDEOGRAPHIC_RANGES = (
+    (0x3040, 0x30FF),    # Hiragana, Katakana
+    (0x3400, 0x4DBF),    # CJK Extension A
+    (0x4E00, 0x9FFF),    # CJK Unified Ideographs
+    (0xF900, 0xFAFF),    # CJK Compatibility Ideographs
+    (0x20000, 0x3134F),  # CJK Extensions B-G
+)
+# characters that join two word parts, as in "don't" or "well-known".
+JOINERS = "'’-‐"
+
+# character kinds used by UnicodeTokenizer.
+_OTHER, _WORD, _JOINER, _IDEOGRAPH = range(4)
+
+_NON_SPACE = re.compile(r"\S+")
+
+
+def _classify(char: str) -> int:
+    '''Return the tokenizer kind of one character.'''
+    if char in JOINERS:
+        return _JOINER
+    code = ord(char)
+    for low, high in IDEOGRAPHIC_RANGES:
+        if low <= code <= high:
+            return _IDEOGRAPH
+    # letters, combining marks, numbers and connectors such as "_".
+    category = unicodedata.category(char)
+    if category[0] in "LMN" or category == "Pc":
+        return _WORD
+    return _OTHER
+
+
+class Tokenizer:
+    '''Base class for a tokenization strategy.
+
+    Subclasses set name and implement tokenize() as a generator. No token
+    may contain whitespace, so text cut at whitespace can be tokenised
+    piece by piece.
+    '''
+    name = ""
+
+    def tokenize(self, text: str):
+        '''Yield the tokens of text in order.'''
+        raise NotImplementedError
+
+    def count(self, text: str) -> int:
+        '''Return the number of tokens in text without keeping them.'''
+        return sum(1 for _ in self.tokenize(text))
+
+    def __call__(self, text: str):
+        return self.tokenize(text)
+
+    def __reduce__(self):
+        # tokenizers are stateless, so they travel to worker processes by name.
+        return get_tokenizer, (self.name,)
+
+
+class WhitespaceTokenizer(Tokenizer):
+    '''Runs of non-whitespace, the same words as str.split().'''
+    name = "whitespace"
+
+    def tokenize(self, text: str):
+        for match in _NON_SPACE.finditer(text):
+            yield match.group()
+
+
+class RegexTokenizer(Tokenizer):
+    '''Runs of word characters, optionally joined by an apostrophe or hyphen.
+
+    Punctuation is dropped ("World." gives "World"), but a run of CJK
+    characters stays a single token.
+    '''
+    name = "regex"
+    pattern = re.compile(r"\w+(?:[%s]\w+)*" % re.escape(JOINERS))
+
+    def tokenize(self, text: str):
+        for match in self.pattern.finditer(text):
+            yield match.group()
+
+
+class UnicodeTokenizer(Tokenizer):
+    '''A state machine over Unicode character categories.
+
+    Letters, marks, numbers and connectors form words; a single joiner
+    between two word characters keeps them together; every ideograph or
+    kana is a token of its own; anything else separates tokens.
+    '''
+    name = "unicode"
+
+    def __init__(self):
+        self._kinds = {}
+
+    def tokenize(self, text: str):
+        kinds = self._kinds
+        for match in _NON_SPACE.finditer(text):
+            chunk = match.group()
+            if chunk.isascii() and chunk.isalnum():
+                # the common case: a plain ASCII word needs no state machine.
+                yield chunk
+                continue
+            start = None
+            joiner = None
+            for index, char in enumerate(chunk):
+                kind = kinds.get(char)
+                if kind is None:
+                    kind = kinds[char] = _classify(char)
+                if kind == _WORD:
+                    if start is None:
+                        start = index
+                    joiner = None
+                elif kind == _JOINER and start is not None and joiner is None:
+                    joiner = index
+                else:
+                    if start is not None:
+                        yield chunk[start:joiner if joiner is not None else index]
+                        start = joiner = None
+                    if kind == _IDEOGRAPH:
+                        yield char
+            if start is not None:
+                yield chunk[start:joiner if joiner is not None else len(chunk)]
+
+
+TOKENIZERS = {cls.name: cls for cls in (WhitespaceTokenizer, RegexTokenizer, UnicodeTokenizer)}
+
+_instances = {}
+
+
+def get_tokenizer(tokenizer) -> Tokenizer:
+    '''Return the shared tokenizer for a TOKENIZERS name, or tokenizer itself.'''
+    if isinstance(tokenizer, Tokenizer):
+        return tokenizer
+    if tokenizer not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer {tokenizer!r}; choose from {', '.join(TOKENIZERS)}.")
+    if tokenizer not in _instances:
+        _instances[tokenizer] = TOKENIZERS[tokenizer]()
+    return _instances[tokenizer]
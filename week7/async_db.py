@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import db
+from db import OrderService, UserService
+from db_pool import get_pool
+
+
+class _Call:
+    """One query running in the executor, shared by every coalesced waiter."""
+
+    def __init__(self):
+        self.conn = None
+        self.waiters = 0
+        self.cancelled = False
+        # held while conn is set or cleared, so _cancel never interrupts a
+        # connection that is already back in the pool serving another call
+        self.lock = threading.Lock()
+
+
+class DBExecutor:
+    """Runs blocking service calls on a dedicated thread pool for asyncio code.
+
+    Calls made with the same key while one is still running share its result
+    instead of querying again. Cancelling every waiter of a call cancels it:
+    a call still queued never runs, and a running keyed call (the services
+    only use keys for reads) has its query interrupted. Calls with key=None,
+    which include every write, are never interrupted once they have started:
+    they run to their commit, so a write whose caller was cancelled may still
+    have been applied.
+    """
+
+    def __init__(self, max_workers=None):
+        # more threads than pooled connections would only wait for a connection
+        self.max_workers = max_workers or get_pool(db.DB_PATH).max_size
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="db")
+        self._calls = {}      # (loop, key) -> (future, _Call)
+        self.calls = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def _run(self, call, function, args):
+        if call.cancelled:
+            raise asyncio.CancelledError()
+        # the services' own checkouts nest inside this one and share conn;
+        # db.DB_PATH is read per call, as the services do
+        with get_pool(db.DB_PATH).connection() as conn:
+            with call.lock:
+                if call.cancelled:
+                    raise asyncio.CancelledError()
+                call.conn = conn
+            try:
+                return function(*args)
+            finally:
+                with call.lock:
+                    call.conn = None
+
+    async def run(self, key, function, *args):
+        """Await function(*args) on the executor; key=None disables coalescing."""
+        loop = asyncio.get_running_loop()
+        entry = self._calls.get((loop, key)) if key is not None else None
+        if entry is None:
+            call = _Call()
+            future = loop.run_in_executor(self._executor, self._run, call, function, args)
+            entry = (future, call)
+            self.calls += 1
+            if key is not None:
+                self._calls[(loop, key)] = entry
+                future.add_done_callback(lambda _: self._forget(loop, key, entry))
+        else:
+            self.coalesced += 1
+        future, call = entry
+
+        call.waiters += 1
+        try:
+            # shield so that one cancelled waiter does not cancel the others
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not future.done():
+                self._cancel(loop, key, entry)
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, loop, key, entry):
+        if self._calls.get((loop, key)) is entry:
+            del self._calls[(loop, key)]
+
+    def _cancel(self, loop, key, entry):
+        future, call = entry
+        self.cancelled += 1
+        self._forget(loop, key, entry)
+        future.cancel()
+        with call.lock:
+            call.cancelled = True
+            # a started write is left to commit rather than cut off part way
+            if key is not None and call.conn is not None:
+                call.conn.interrupt()
+
+    def forget(self, key):
+        """Stop new callers joining a running call for key, e.g. after a write."""
+        loop = asyncio.get_running_loop()
+        self._calls.pop((loop, key), None)
+
+    def stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced,
+                "cancelled": self.cancelled, "in_flight": len(self._calls),
+                "max_workers": self.max_workers}
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(**options):
+    """Return the shared DBExecutor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DBExecutor(**options)
+        return _executor
+
+
+class AsyncUserService:
+    """Awaitable UserService; pass a CachedUserService as service to cache reads."""
+
+    def __init__(self, service=None, executor=None):
+        self.service = service or UserService()
+        self.executor = executor or get_executor()
+
+    async def get_user(self, user_id):
+        return await self.executor.run(("user", user_id), self.service.get_user, user_id)
+
+    async def get_users(self, user_ids):
+        return await self.executor.run(None, self.service.get_users, list(user_ids))
+
+    async def get_users_with_orders(self, user_ids):
+        return await self.executor.run(None, self.service.get_users_with_orders, list(user_ids))
+
+    async def add_user(self, name, user_id=None):
+        user_id = await self.executor.run(None, self.service.add_user, name, user_id)
+        self.executor.forget(("user", user_id))
+        return user_id
+
+    async def update_user(self, user_id, name):
+        await self.executor.run(None, self.service.update_user, user_id, name)
+        self.executor.forget(("user", user_id))
+
+    async def delete_user(self, user_id):
+        await self.executor.run(None, self.service.delete_user, user_id)
+        self.executor.forget(("user", user_id))
+        self.executor.forget(("orders", user_id))
+
+
+class AsyncOrderService:
+    """Awaitable OrderService; pass a CachedOrderService as service to cache reads."""
+
+    def __init__(self, service=None, executor=None):
+        self.service = service or OrderService()
+        self.executor = executor or get_executor()
+
+    async def get_orders(self, user_id):
+        return await self.executor.run(("orders", user_id), self.service.get_orders, user_id)
+
+    async def get_orders_for_users(self, user_ids):
+        return await self.executor.run(None, self.service.get_orders_for_users, list(user_ids))
+
+    async def add_order(self, user_id, product):
+        order_id = await self.executor.run(None, self.service.add_order, user_id, product)
+        self.executor.forget(("orders", user_id))
+        return order_id
+
+    async def delete_order(self, order_id):
+        user_id = await self.executor.run(None, self.service.delete_order, order_id)
+        if user_id is not None:
+            self.executor.forget(("orders", user_id))
+        return user_id
+
+
+# benchmark: many clients each doing get_user + get_orders for random users
+
+async def _ticker(lags, stop):
+    # how late the event loop wakes up; blocking calls show up here
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _clients(clients, requests, users, lookup):
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+
+    async def client(seed):
+        rng = random.Random(seed)
+        for _ in range(requests):
+            await lookup(rng.randint(1, users))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, max(lags, default=0.0)
+
+
+def benchmark(clients=200, requests=20, users=100):
+    user_service, order_service = UserService(), OrderService()
+    async_users, async_orders = AsyncUserService(user_service), AsyncOrderService(order_service)
+
+    async def sync_lookup(user_id):
+        user_service.get_user(user_id)
+        order_service.get_orders(user_id)
+
+    async def async_lookup(user_id):
+        await asyncio.gather(async_users.get_user(user_id), async_orders.get_orders(user_id))
+
+    total = clients * requests
+    for name, lookup in (("sync", sync_lookup), ("async", async_lookup)):
+        elapsed, lag = asyncio.run(_clients(clients, requests, users, lookup))
+        print(f"{name:<6} {total / elapsed:>10.0f} requests/s  max loop lag {lag * 1000:.1f} ms")
+    print(get_executor().stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the sync and async services.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="lookups per client")
+    parser.add_argument("--users", type=int, default=100, help="ids looked up at random")
+    args = parser.parse_args()
+    db.db_init()
+    with db.db().connection() as conn:
+        conn.executemany("INSERT OR IGNORE INTO users (id, name) VALUES (?, ?)",
+                         ((i, f"user{i}") for i in range(1, args.users + 1)))
+        # fixed ids above the seed rows so reruns do not add more orders
+        conn.executemany("INSERT OR IGNORE INTO orders (id, user_id, product) VALUES (?, ?, ?)",
+                         ((1000 + i, i % args.users + 1, f"product{i}")
+                          for i in range(args.users * 5)))
+    benchmark(args.clients, args.requests, args.users)
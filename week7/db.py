@@ -1,6 +1,72 @@
 import sqlite3
 import threading
 import time
+
+from db_pool import get_pool
+
+DB_PATH = 'app.db'
+# ids per IN (...) query; SQLite allows at most 999 parameters in older builds
+IN_CHUNK_SIZE = 500
+# above this many ids, join against a temp table instead of chunked IN lists
+TEMP_TABLE_THRESHOLD = 5000
+
+# schema changes in order; PRAGMA user_version records how many have been applied
+MIGRATIONS = [
+    ["""CREATE TABLE IF NOT EXISTS users
+        (id INTEGER PRIMARY KEY, name TEXT)""",
+     """CREATE TABLE IF NOT EXISTS orders
+        (id INTEGER PRIMARY KEY, user_id INTEGER, product TEXT,
+         FOREIGN KEY(user_id) REFERENCES users(id))"""],
+    # get_orders filtered orders by user_id with a full table scan
+    ["CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders(user_id)"],
+]
+
+
+def migrate(conn):
+    """Apply the MIGRATIONS this database has not seen yet; returns the schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    # indexes can go missing after their migration ran (bulk_load drops them
+    # for big loads), and CREATE INDEX IF NOT EXISTS is safe to repeat
+    for statements in MIGRATIONS[:version]:
+        for statement in statements:
+            if statement.startswith("CREATE INDEX IF NOT EXISTS"):
+                conn.execute(statement)
+    for number, statements in enumerate(MIGRATIONS[version:], version + 1):
+        for statement in statements:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {number}")
+        version = number
+    return version
+
+
+def _int_ids(ids):
+    # rows come back with int ids, so "1" and 1 must key the same result
+    return [int(i) for i in ids]
+
+
+def _unique(ids):
+    return list(dict.fromkeys(ids))
+
+
+def _select_by_ids(conn, sql, ids):
+    """Run sql, which filters on "IN ({ids})", for every id and yield the rows.
+
+    Small lists are sent in IN_CHUNK_SIZE chunks; large ones go through a
+    temporary table so the statement is parsed only once.
+    """
+    ids = _unique(ids)
+    if len(ids) <= TEMP_TABLE_THRESHOLD:
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CHUNK_SIZE]
+            yield from conn.execute(sql.format(ids=",".join("?" * len(chunk))), chunk)
+        return
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_ids (id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM lookup_ids")
+    conn.executemany("INSERT INTO lookup_ids VALUES (?)", ((i,) for i in ids))
+    try:
+        yield from conn.execute(sql.format(ids="SELECT id FROM lookup_ids"))
+    finally:
+        conn.execute("DELETE FROM lookup_ids")
  
 class db:
     _instance = None
@@ -16,8 +82,12 @@ class db:
 
     def get_conn(self):
         if self._connection is None:
-            self._connection = sqlite3.connect('app.db',check_same_thread=False)
+            self._connection = sqlite3.connect(DB_PATH,check_same_thread=False)
         return self._connection
+
+    def connection(self):
+        # pooled checkout; use instead of sharing get_conn() between threads
+        return get_pool(DB_PATH).connection()
     
     def close_conn(self):
         if self._connection:
@@ -27,19 +97,12 @@ class db:
 class db_init(db):
     def __init__(self):
         self._connection = None
-        conn = self.get_conn()
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS users
-                          (id INTEGER PRIMARY KEY, name TEXT)''')
-        cursor.execute('''CREATE TABLE IF NOT EXISTS orders
-                          (id INTEGER PRIMARY KEY, user_id INTEGER, product TEXT,
-                           FOREIGN KEY(user_id) REFERENCES users(id))''')
-        cursor.execute("INSERT OR IGNORE INTO users (id, name) VALUES (1, 'Alice')")
-        cursor.execute("INSERT OR IGNORE INTO users (id, name) VALUES (2, 'Bob')")
-        cursor.execute("INSERT OR IGNORE INTO orders (id, user_id, product) VALUES (1, 1, 'Laptop')")
-        cursor.execute("INSERT OR IGNORE INTO orders (id, user_id, product) VALUES (2, 1, 'Mouse')")
-        cursor.execute("INSERT OR IGNORE INTO orders (id, user_id, product) VALUES (3, 2, 'Keyboard')")
-        conn.commit()
+        with self.connection() as conn:
+            migrate(conn)
+            conn.executemany("INSERT OR IGNORE INTO users (id, name) VALUES (?, ?)",
+                             [(1, 'Alice'), (2, 'Bob')])
+            conn.executemany("INSERT OR IGNORE INTO orders (id, user_id, product) VALUES (?, ?, ?)",
+                             [(1, 1, 'Laptop'), (2, 1, 'Mouse'), (3, 2, 'Keyboard')])
 
 
 class UserService:
@@ -48,21 +111,59 @@ class UserService:
         
 
     def get_user(self, user_id):
-        conn = self.db_instance.get_conn()  # Use the singleton connection
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        result = cursor.fetchone()
-        #conn.close()
+        with self.db_instance.connection() as conn:  # Pooled connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+            result = cursor.fetchone()
         return result
+
+    def get_users(self, user_ids):
+        # one query per chunk instead of one per user; missing ids map to None
+        user_ids = _int_ids(user_ids)
+        result = dict.fromkeys(user_ids)
+        with self.db_instance.connection() as conn:
+            for row in _select_by_ids(conn, "SELECT * FROM users WHERE id IN ({ids})", user_ids):
+                result[row[0]] = row
+        return result
+
+    def get_users_with_orders(self, user_ids):
+        # {user_id: (user row or None, [order rows])} from one LEFT JOIN per chunk
+        user_ids = _int_ids(user_ids)
+        result = {user_id: (None, []) for user_id in user_ids}
+        sql = ("SELECT u.id, u.name, o.id, o.user_id, o.product FROM users u "
+               "LEFT JOIN orders o ON o.user_id = u.id WHERE u.id IN ({ids}) ORDER BY u.id, o.id")
+        with self.db_instance.connection() as conn:
+            for row in _select_by_ids(conn, sql, user_ids):
+                user, orders = result[row[0]]
+                if user is None:
+                    user = row[:2]
+                    result[row[0]] = (user, orders)
+                if row[2] is not None:
+                    orders.append(row[2:])
+        return result
+
+    def add_user(self, name, user_id=None):
+        with self.db_instance.connection() as conn:
+            cursor = conn.execute("INSERT INTO users (id, name) VALUES (?, ?)", (user_id, name))
+        return cursor.lastrowid
+
+    def update_user(self, user_id, name):
+        with self.db_instance.connection() as conn:
+            conn.execute("UPDATE users SET name = ? WHERE id = ?", (name, user_id))
+
+    def delete_user(self, user_id):
+        # orders reference the user, so they go in the same transaction
+        with self.db_instance.connection() as conn:
+            conn.execute("DELETE FROM orders WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
     
 class UserService_singleton:
 
     def get_user(self, user_id):
-        conn = sqlite3.connect('app.db')  # Another new connection
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        result = cursor.fetchone()
-        conn.close()
+        with get_pool(DB_PATH).connection() as conn:  # Reused instead of a new connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+            result = cursor.fetchone()
         return result
  
 class OrderService_singleton:
@@ -70,45 +171,66 @@ class OrderService_singleton:
         self.db_instance = db()
 
     def get_orders(self, user_id):
-        #conn = sqlite3.connect('app.db')  # Another new connection
-        conn=self.db_instance.get_conn()  # Use the singleton connection
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM orders WHERE user_id = ?", (user_id,))
-        result = cursor.fetchall()
-        #conn.close()
+        with self.db_instance.connection() as conn:  # Pooled connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM orders WHERE user_id = ?", (user_id,))
+            result = cursor.fetchall()
         return result
     
 class OrderService:
 
     def get_orders(self, user_id):
-        conn = sqlite3.connect('app.db')  # Another new connection
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM orders WHERE user_id = ?", (user_id,))
-        result = cursor.fetchall()
-        conn.close()
+        with get_pool(DB_PATH).connection() as conn:  # Reused instead of a new connection
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM orders WHERE user_id = ?", (user_id,))
+            result = cursor.fetchall()
+        return result
+
+    def get_orders_for_users(self, user_ids):
+        # {user_id: [order rows]}, with an empty list for users without orders
+        user_ids = _int_ids(user_ids)
+        result = {user_id: [] for user_id in user_ids}
+        sql = "SELECT * FROM orders WHERE user_id IN ({ids}) ORDER BY user_id, id"
+        with get_pool(DB_PATH).connection() as conn:
+            for row in _select_by_ids(conn, sql, user_ids):
+                result[row[1]].append(row)
         return result
 
-   
-#db_init()  # Initialize the database and tables
-start=time.perf_counter()
-get_user=UserService()
-get_order=OrderService()
+    def add_order(self, user_id, product):
+        with get_pool(DB_PATH).connection() as conn:
+            cursor = conn.execute("INSERT INTO orders (user_id, product) VALUES (?, ?)",
+                                  (user_id, product))
+        return cursor.lastrowid
+
+    def delete_order(self, order_id):
+        # returns the owner's id, or None if there was no such order
+        with get_pool(DB_PATH).connection() as conn:
+            row = conn.execute("SELECT user_id FROM orders WHERE id = ?", (order_id,)).fetchone()
+            conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+        return row[0] if row else None
+
+
+if __name__ == "__main__":
+    #db_init()  # Initialize the database and tables
+    start=time.perf_counter()
+    get_user=UserService()
+    get_order=OrderService()
 
-print(get_user.get_user(1))
-print(get_order.get_orders(1))
+    print(get_user.get_user(1))
+    print(get_order.get_orders(1))
 
-print(f"thread count: {threading.active_count()}")
-end=time.perf_counter()
-print(f"processing time: {end - start:.6f} 秒")
+    print(f"thread count: {threading.active_count()}")
+    end=time.perf_counter()
+    print(f"processing time: {end - start:.6f} 秒")
 
-# Using singleton pattern for database connection
-start1=time.perf_counter()
-get_user_s=UserService_singleton()
-get_order_s=OrderService_singleton()
+    # Using singleton pattern for database connection
+    start1=time.perf_counter()
+    get_user_s=UserService_singleton()
+    get_order_s=OrderService_singleton()
 
-print(get_user_s.get_user(1))
-print(get_order_s.get_orders(1))
+    print(get_user_s.get_user(1))
+    print(get_order_s.get_orders(1))
 
-print(f"thread count: {threading.active_count()}")
-end1=time.perf_counter()
-print(f"processing time of singleton: {end1 - start1:.6f} 秒")
+    print(f"thread count: {threading.active_count()}")
+    end1=time.perf_counter()
+    print(f"processing time of singleton: {end1 - start1:.6f} 秒")
@@ -0,0 +1,144 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of SQLite connections.
+
+    Connections are opened lazily up to max_size, run in WAL mode so readers
+    do not block each other, and are health-checked with SELECT 1 when they
+    have been idle for check_interval seconds. A thread gets back the
+    connection it used last when it is free, and nested checkouts in one
+    thread share a connection.
+    """
+
+    def __init__(self, path='app.db', max_size=8, timeout=5.0, check_interval=30.0):
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._idle = []          # (connection, time it was returned)
+        self._size = 0
+        self._closed = False
+        self._available = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _healthy(self, conn, idle_since):
+        if time.monotonic() - idle_since < self.check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                if self._idle:
+                    # prefer the connection this thread used last
+                    last = getattr(self._local, "last", None)
+                    index = len(self._idle) - 1
+                    for i, (conn, _) in enumerate(self._idle):
+                        if conn is last:
+                            index = i
+                            break
+                    conn, idle_since = self._idle.pop(index)
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = idle_since = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._available.wait(remaining):
+                    raise TimeoutError(f"No database connection free after {self.timeout}s.")
+
+        try:
+            if conn is not None and not self._healthy(conn, idle_since):
+                conn.close()
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except BaseException:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        return conn
+
+    def _release(self, conn, broken=False):
+        with self._available:
+            if broken or self._closed:
+                conn.close()
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; commits on success and rolls back on error."""
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            # nested checkout in the same thread: share the outer connection
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.held = conn
+        broken = False
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
+            raise
+        finally:
+            self._local.held = None
+            self._local.last = conn
+            self._release(conn, broken)
+
+    def stats(self):
+        with self._available:
+            return {"size": self._size, "idle": len(self._idle),
+                    "in_use": self._size - len(self._idle), "max_size": self.max_size}
+
+    def close(self):
+        """Close idle connections now and the rest as they are returned."""
+        with self._available:
+            self._closed = True
+            for conn, _ in self._idle:
+                conn.close()
+                self._size -= 1
+            self._idle.clear()
+            self._available.notify_all()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path='app.db', **options):
+    """Return the shared pool for a database file, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None or pool._closed:
+            pool = _pools[path] = ConnectionPool(path, **options)
+        return pool
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from db import OrderService, UserService, _int_ids
+
+
+class TTLCache:
+    """A thread-safe read-through cache with per-entry TTL and LRU eviction.
+
+    Concurrent misses for the same key share one load: the first caller
+    runs the loader and the others wait for its result. Keys invalidated
+    while a load is running are not stored when it finishes; bulk loads
+    pass the version they started at to put() for the same reason.
+    """
+
+    def __init__(self, max_size=1024, ttl=60.0, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.version = 0                # bumped by every invalidation
+        self._entries = OrderedDict()   # key -> (value, expires_at)
+        self._loading = {}              # key -> Future of the running load
+        self._stale = set()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            future = self._loading.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = self._loading[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+                self._stale.discard(key)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            if key in self._stale:
+                self._stale.discard(key)
+            else:
+                self._store(key, value)
+        future.set_result(value)
+        return value
+
+    def get_many(self, keys):
+        # returns ({key: value} for fresh entries, [missing keys])
+        found = {}
+        missing = []
+        with self._lock:
+            now = self.clock()
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+                    self.misses += 1
+        return found, missing
+
+    def put(self, key, value, version=None):
+        # skipped if anything was invalidated since version was read
+        with self._lock:
+            if version is None or version == self.version:
+                self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries[key] = (value, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self.version += 1
+            self._entries.pop(key, None)
+            if key in self._loading:
+                self._stale.add(key)
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._stale.update(self._loading)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "expirations": self.expirations,
+                    "coalesced": self.coalesced, "size": len(self._entries)}
+
+
+class CachedUserService(UserService):
+    """UserService that serves user rows from a TTLCache and invalidates on writes.
+
+    Pass the same cache to CachedOrderService so deleting a user also drops
+    their cached orders.
+    """
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache or TTLCache()
+
+    def get_user(self, user_id):
+        user_id = int(user_id)
+        return self.cache.get_or_load(("user", user_id), lambda: super(CachedUserService, self).get_user(user_id))
+
+    def get_users(self, user_ids):
+        user_ids = _int_ids(user_ids)
+        version = self.cache.version
+        found, missing = self.cache.get_many([("user", user_id) for user_id in user_ids])
+        result = {user_id: found.get(("user", user_id)) for user_id in user_ids}
+        if missing:
+            loaded = super().get_users([key[1] for key in missing])
+            for user_id, row in loaded.items():
+                self.cache.put(("user", user_id), row, version)
+                result[user_id] = row
+        return result
+
+    def add_user(self, name, user_id=None):
+        user_id = super().add_user(name, user_id)
+        self.cache.invalidate(("user", user_id))
+        return user_id
+
+    def update_user(self, user_id, name):
+        super().update_user(user_id, name)
+        self.cache.invalidate(("user", int(user_id)))
+
+    def delete_user(self, user_id):
+        super().delete_user(user_id)
+        self.cache.invalidate(("user", int(user_id)))
+        self.cache.invalidate(("orders", int(user_id)))
+
+
+class CachedOrderService(OrderService):
+    """OrderService that serves each user's orders from a TTLCache.
+
+    Order lists are cached as tuples and every caller gets a list of its
+    own, so changing a result cannot change what other callers see.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or TTLCache()
+
+    def get_orders(self, user_id):
+        user_id = int(user_id)
+        return list(self.cache.get_or_load(
+            ("orders", user_id), lambda: tuple(super(CachedOrderService, self).get_orders(user_id))))
+
+    def get_orders_for_users(self, user_ids):
+        user_ids = _int_ids(user_ids)
+        version = self.cache.version
+        found, missing = self.cache.get_many([("orders", user_id) for user_id in user_ids])
+        result = {user_id: found.get(("orders", user_id)) for user_id in user_ids}
+        if missing:
+            loaded = super().get_orders_for_users([key[1] for key in missing])
+            for user_id, orders in loaded.items():
+                result[user_id] = tuple(orders)
+                self.cache.put(("orders", user_id), result[user_id], version)
+        return {user_id: list(orders) for user_id, orders in result.items()}
+
+    def add_order(self, user_id, product):
+        order_id = super().add_order(user_id, product)
+        self.cache.invalidate(("orders", int(user_id)))
+        return order_id
+
+    def delete_order(self, order_id):
+        user_id = super().delete_order(order_id)
+        if user_id is not None:
+            self.cache.invalidate(("orders", user_id))
+        return user_id
@@ -0,0 +1,274 @@
+"""
+Test script for the async services and their DB executor
+Checks call coalescing, cancellation and interrupting running queries
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+from concurrent.futures import Future
+import db
+from async_db import AsyncOrderService, AsyncUserService, DBExecutor, _Call
+from db_pool import get_pool
+from test_db import with_database
+
+# a query that runs until it is interrupted
+ENDLESS = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+           "SELECT count(*) FROM n")
+
+
+def blocking(started, release, result):
+    """Return a function that signals started, then waits for release."""
+    def function():
+        started.set()
+        release.wait()
+        return result
+    return function
+
+
+async def wait_for(event):
+    """Wait for a threading.Event without blocking the event loop."""
+    while not event.is_set():
+        await asyncio.sleep(0.001)
+
+
+@with_database
+def test_services():
+    """Test that the async services return what the sync ones do."""
+    print("Testing async services...")
+    executor = DBExecutor()
+
+    async def main():
+        users, orders = AsyncUserService(executor=executor), AsyncOrderService(executor=executor)
+        assert await users.get_user(1) == (1, "Alice")
+        assert await users.get_users([1, 9]) == {1: (1, "Alice"), 9: None}
+        assert await orders.get_orders(2) == [(3, 2, "Keyboard")]
+        order_id = await orders.add_order(2, "Cable")
+        assert await orders.delete_order(order_id) == 2
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.close()
+    print("✓ Async services test passed")
+
+
+@with_database
+def test_coalescing():
+    """Test that calls with the same key share one run."""
+    print("Testing coalescing...")
+    executor = DBExecutor()
+    started, release = threading.Event(), threading.Event()
+    function = blocking(started, release, "value")
+
+    async def main():
+        first = asyncio.create_task(executor.run("key", function))
+        await wait_for(started)
+        second = asyncio.create_task(executor.run("key", function))
+        uncoalesced = asyncio.create_task(executor.run(None, lambda: "other"))
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await first == "value" and await second == "value"
+        assert await uncoalesced == "other"
+        # the finished call is forgotten, so the next one runs again
+        assert await executor.run("key", lambda: "again") == "again"
+
+    try:
+        asyncio.run(main())
+        stats = executor.stats()
+        assert stats["calls"] == 3 and stats["coalesced"] == 1 and stats["in_flight"] == 0
+    finally:
+        executor.close()
+    print("✓ Coalescing test passed")
+
+
+@with_database
+def test_cancellation():
+    """Test that queued calls never run and one cancelled waiter does not cancel others."""
+    print("Testing cancellation...")
+    executor = DBExecutor(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    async def main():
+        busy = asyncio.create_task(executor.run("busy", blocking(started, release, "done")))
+        await wait_for(started)
+        queued = asyncio.create_task(executor.run("queued", lambda: ran.append(1)))
+        shared = [asyncio.create_task(executor.run("busy", lambda: None)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        shared[0].cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await busy == "done" and await shared[1] == "done"
+        for task in (queued, shared[0]):
+            try:
+                await task
+                assert False, "the cancelled waiter should raise"
+            except asyncio.CancelledError:
+                pass
+        # the worker thread is free again and the queued call was dropped
+        assert await executor.run(None, lambda: "next") == "next"
+
+    try:
+        asyncio.run(main())
+        assert ran == [] and executor.stats()["cancelled"] == 1
+    finally:
+        executor.close()
+    print("✓ Cancellation test passed")
+
+
+@with_database
+def test_running_query_is_interrupted():
+    """Test that cancelling a running call interrupts its query."""
+    print("Testing query interruption...")
+    executor = DBExecutor(max_workers=2)
+    started = threading.Event()
+    errors = []
+
+    def endless():
+        with get_pool(db.DB_PATH).connection() as conn:
+            # signal from inside the query, so the interrupt cannot come before it
+            conn.set_progress_handler(lambda: started.set() or 0, 1000)
+            try:
+                return conn.execute(ENDLESS).fetchone()
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+                raise
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    async def main():
+        task = asyncio.create_task(executor.run("endless", endless))
+        await wait_for(started)
+        task.cancel()
+        try:
+            await task
+            assert False, "the cancelled call should raise"
+        except asyncio.CancelledError:
+            pass
+        # the interrupted connection goes back to the pool and works
+        users = AsyncUserService(executor=executor)
+        for _ in range(5):
+            assert await users.get_user(1) == (1, "Alice")
+
+    try:
+        asyncio.run(main())
+        # the worker may still be unwinding the interrupted query
+        executor.close()
+        assert errors == ["interrupted"]
+    finally:
+        executor.close()
+    print("✓ Query interruption test passed")
+
+
+@with_database
+def test_cancelled_write_runs_to_commit():
+    """Test that cancelling a running write leaves it to finish and commit."""
+    print("Testing cancelled writes...")
+    executor = DBExecutor()
+    started = threading.Event()
+    users = db.UserService()
+
+    def slow_add():
+        with get_pool(db.DB_PATH).connection() as conn:
+            conn.execute("INSERT INTO users VALUES (10, 'Dave')")
+            # a slow statement in the same transaction, cancelled while it runs
+            conn.set_progress_handler(lambda: started.set() or 0, 1000)
+            try:
+                conn.execute(ENDLESS.replace("FROM n)", "FROM n WHERE i < 300000)")).fetchone()
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    async def main():
+        task = asyncio.create_task(executor.run(None, slow_add))
+        await wait_for(started)
+        task.cancel()
+        try:
+            await task
+            assert False, "the cancelled caller should raise"
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(main())
+        executor.close()
+        assert users.get_user(10) == (10, "Dave")
+    finally:
+        executor.close()
+    print("✓ Cancelled writes test passed")
+
+
+@with_database
+def test_late_cancel_leaves_connection_alone():
+    """Test that cancelling a finished call does not interrupt the next user of its connection."""
+    print("Testing late cancellation...")
+    executor = DBExecutor()
+    pool = get_pool(db.DB_PATH)
+    used = []
+
+    def remember_connection():
+        with pool.connection() as conn:
+            used.append(conn)
+
+    call = _Call()
+    executor._run(call, remember_connection, ())
+    assert call.conn is None
+
+    started = threading.Event()
+    results = []
+
+    def count():
+        # the only idle connection is the one the finished call gave back
+        with pool.connection() as conn:
+            used.append(conn)
+            conn.set_progress_handler(lambda: started.set() or 0, 1000)
+            try:
+                results.append(conn.execute(
+                    ENDLESS.replace("FROM n)", "FROM n WHERE i < 300000)")).fetchone())
+            except sqlite3.Error as e:
+                results.append(e)
+            finally:
+                conn.set_progress_handler(None, 0)
+
+    thread = threading.Thread(target=count)
+    thread.start()
+    started.wait()
+    executor._cancel(None, "key", (Future(), call))
+    thread.join()
+    executor.close()
+    assert used[0] is used[1]
+    assert results == [(300000,)]
+    print("✓ Late cancellation test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Async Service Tests")
+    print("=" * 40)
+
+    try:
+        test_services()
+        test_coalescing()
+        test_cancellation()
+        test_running_query_is_interrupted()
+        test_cancelled_write_runs_to_commit()
+        test_late_cancel_leaves_connection_alone()
+
+        print("\n" + "=" * 40)
+        print("🎉 All async service tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,136 @@
+"""
+Test script for the bulk loader and schema migrations
+Checks loading from files and that deferred indexes survive a failed load
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import bulk_load
+from db import MIGRATIONS, migrate
+
+
+def index_names(path):
+    """Return the names of the indexes on orders."""
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                            "AND tbl_name = 'orders' AND sql IS NOT NULL").fetchall()
+    return [row[0] for row in rows]
+
+
+def test_load_files():
+    """Test CSV and JSONL loads, skipping or replacing existing ids."""
+    print("Testing file loads...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.db")
+        users_csv = os.path.join(directory, "users.csv")
+        with open(users_csv, "w", encoding="utf-8", newline="") as handle:
+            handle.write("id,name\n1,Alice\n2,Bob\n")
+        orders_jsonl = os.path.join(directory, "orders.jsonl")
+        with open(orders_jsonl, "w", encoding="utf-8") as handle:
+            for order in ({"user_id": 1, "product": "Laptop"}, {"user_id": 2, "product": "Mouse"}):
+                handle.write(json.dumps(order) + "\n")
+            handle.write("\n")
+
+        assert bulk_load.load_file("users", users_csv, path=path, batch_size=1) == 2
+        assert bulk_load.load_file("orders", orders_jsonl, path=path) == 2
+        assert bulk_load.bulk_load("users", [(1, "Alicia")], path) == 1
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT name FROM users WHERE id = 1").fetchone() == ("Alice",)
+        bulk_load.bulk_load("users", [(1, "Alicia")], path, replace=True)
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT * FROM users ORDER BY id").fetchall() == \
+                [(1, "Alicia"), (2, "Bob")]
+            assert conn.execute("SELECT user_id, product FROM orders ORDER BY id").fetchall() == \
+                [(1, "Laptop"), (2, "Mouse")]
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    print("✓ File loads test passed")
+
+
+def test_deferred_indexes_survive_failure():
+    """Test that a load with defer_indexes rebuilds the indexes, even when it fails."""
+    print("Testing deferred indexes...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.db")
+        rows = [(i, i % 7, f"product{i}") for i in range(1, 101)]
+        assert bulk_load.bulk_load("orders", rows, path, batch_size=10, defer_indexes=True) == 100
+        assert index_names(path) == ["idx_orders_user_id"]
+
+        def failing_rows():
+            yield from [(i, 1, "more") for i in range(101, 131)]
+            raise ValueError("bad row")
+
+        try:
+            bulk_load.bulk_load("orders", failing_rows(), path, batch_size=10,
+                                transaction_size=20, defer_indexes=True)
+            assert False, "the row error should be raised"
+        except ValueError:
+            pass
+        assert index_names(path) == ["idx_orders_user_id"]
+        with sqlite3.connect(path) as conn:
+            # the first full transaction was committed, the rest rolled back
+            assert conn.execute("SELECT count(*) FROM orders").fetchone()[0] == 120
+    print("✓ Deferred indexes test passed")
+
+
+def test_deferred_index_names_are_quoted():
+    """Test that indexes with unusual names are dropped and rebuilt."""
+    print("Testing index names...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.db")
+        bulk_load.bulk_load("orders", [], path)
+        with sqlite3.connect(path) as conn:
+            conn.execute('CREATE INDEX "orders by ""product""" ON orders(product)')
+        rows = [(i, 1, f"product{i}") for i in range(1, 11)]
+        assert bulk_load.bulk_load("orders", rows, path, defer_indexes=True) == 10
+        assert sorted(index_names(path)) == ["idx_orders_user_id", 'orders by "product"']
+    print("✓ Index names test passed")
+
+
+def test_migrate_restores_lost_indexes():
+    """Test that migrate() recreates an index dropped after its migration ran."""
+    print("Testing migrations...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.db")
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            assert migrate(conn) == len(MIGRATIONS)
+            assert migrate(conn) == len(MIGRATIONS)
+            conn.execute("DROP INDEX idx_orders_user_id")
+            assert index_names(path) == []
+            assert migrate(conn) == len(MIGRATIONS)
+            assert index_names(path) == ["idx_orders_user_id"]
+        finally:
+            conn.close()
+    print("✓ Migrations test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Bulk Load Tests")
+    print("=" * 40)
+
+    try:
+        test_load_files()
+        test_deferred_indexes_survive_failure()
+        test_deferred_index_names_are_quoted()
+        test_migrate_restores_lost_indexes()
+
+        print("\n" + "=" * 40)
+        print("🎉 All bulk load tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,121 @@
+"""
+Test script for the batched user and order lookups
+Checks results against the per-id queries on a temporary database
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+import db
+from db import OrderService, UserService, get_pool, migrate
+
+USERS = [(1, "Alice"), (2, "Bob"), (3, "Carol")]
+ORDERS = [(1, 1, "Laptop"), (2, 1, "Mouse"), (3, 2, "Keyboard")]
+
+
+def with_database(test):
+    """Run test against a fresh database holding USERS and ORDERS."""
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "app.db")
+            with patch.object(db, "DB_PATH", path):
+                with get_pool(path).connection() as conn:
+                    migrate(conn)
+                    conn.executemany("INSERT INTO users VALUES (?, ?)", USERS)
+                    conn.executemany("INSERT INTO orders VALUES (?, ?, ?)", ORDERS)
+                try:
+                    test()
+                finally:
+                    get_pool(path).close()
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@with_database
+def test_batched_lookups():
+    """Test get_users, get_users_with_orders and get_orders_for_users."""
+    print("Testing batched lookups...")
+    users, orders = UserService(), OrderService()
+    assert users.get_users([2, 1, 9, 2]) == {2: (2, "Bob"), 1: (1, "Alice"), 9: None}
+    assert users.get_users_with_orders([1, 3, 9]) == {
+        1: ((1, "Alice"), [(1, 1, "Laptop"), (2, 1, "Mouse")]),
+        3: ((3, "Carol"), []),
+        9: (None, []),
+    }
+    assert orders.get_orders_for_users([1, 2, 3]) == {
+        user_id: orders.get_orders(user_id) for user_id in (1, 2, 3)}
+    assert users.get_users([]) == {} and orders.get_orders_for_users([]) == {}
+    print("✓ Batched lookups test passed")
+
+
+@with_database
+def test_string_ids():
+    """Test that ids given as strings key the results like ints."""
+    print("Testing string ids...")
+    users, orders = UserService(), OrderService()
+    assert users.get_users(["1", 2]) == {1: (1, "Alice"), 2: (2, "Bob")}
+    assert users.get_users_with_orders(["2"]) == {2: ((2, "Bob"), [(3, 2, "Keyboard")])}
+    assert orders.get_orders_for_users(["1"]) == {1: [(1, 1, "Laptop"), (2, 1, "Mouse")]}
+    print("✓ String ids test passed")
+
+
+@with_database
+def test_large_batches():
+    """Test the chunked IN lists and the temp-table path against per-id queries."""
+    print("Testing large batches...")
+    users = UserService()
+    ids = list(range(1, 40))
+    expected = {user_id: users.get_user(user_id) for user_id in ids}
+    with patch.object(db, "IN_CHUNK_SIZE", 4):
+        assert users.get_users(ids) == expected
+    with patch.object(db, "TEMP_TABLE_THRESHOLD", 10):
+        assert users.get_users(ids) == expected
+        assert users.get_users(ids) == expected
+    print("✓ Large batches test passed")
+
+
+@with_database
+def test_writes():
+    """Test the write methods the cached services build on."""
+    print("Testing writes...")
+    users, orders = UserService(), OrderService()
+    user_id = users.add_user("Dave")
+    order_id = orders.add_order(user_id, "Monitor")
+    users.update_user(user_id, "David")
+    assert users.get_user(user_id) == (user_id, "David")
+    assert orders.delete_order(order_id) == user_id
+    assert orders.delete_order(order_id) is None
+    users.delete_user(1)
+    assert users.get_user(1) is None and orders.get_orders(1) == []
+    print("✓ Writes test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Database Service Tests")
+    print("=" * 40)
+
+    try:
+        test_batched_lookups()
+        test_string_ids()
+        test_large_batches()
+        test_writes()
+
+        print("\n" + "=" * 40)
+        print("🎉 All database service tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
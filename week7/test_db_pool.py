@@ -0,0 +1,168 @@
+"""
+Test script for the SQLite connection pool
+Checks the size bound, checkout timeout and per-thread connection reuse
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from db_pool import ConnectionPool
+
+
+def test_bounded_size_and_timeout():
+    """Test that at most max_size connections exist and waiters time out."""
+    print("Testing pool bound...")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ConnectionPool(os.path.join(directory, "test.db"), max_size=2, timeout=0.2)
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.connection():
+                held.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        with pool.connection():
+            assert pool.stats() == {"size": 2, "idle": 0, "in_use": 2, "max_size": 2}
+            errors = []
+            waiter = threading.Thread(target=lambda: errors.append(_checkout_error(pool)))
+            waiter.start()
+            waiter.join()
+            assert isinstance(errors[0], TimeoutError)
+        release.set()
+        thread.join()
+        assert pool.stats() == {"size": 2, "idle": 2, "in_use": 0, "max_size": 2}
+        pool.close()
+        assert pool.stats()["size"] == 0
+        assert isinstance(_checkout_error(pool), RuntimeError)
+
+    try:
+        ConnectionPool(max_size=0)
+        assert False, "a pool without connections should be rejected"
+    except ValueError:
+        pass
+    print("✓ Pool bound test passed")
+
+
+def _checkout_error(pool):
+    """Return the exception a checkout raises, or None."""
+    try:
+        with pool.connection():
+            return None
+    except Exception as e:
+        return e
+
+
+def test_waiter_gets_released_connection():
+    """Test that a waiting thread gets the connection another thread returns."""
+    print("Testing waiting for a connection...")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ConnectionPool(os.path.join(directory, "test.db"), max_size=1, timeout=5)
+        got = []
+        with pool.connection():
+            waiter = threading.Thread(target=lambda: got.append(_checkout_error(pool)))
+            waiter.start()
+            waiter.join(0.1)
+            assert waiter.is_alive()
+        waiter.join()
+        assert got == [None] and pool.stats()["size"] == 1
+        pool.close()
+    print("✓ Waiting for a connection test passed")
+
+
+def test_per_thread_reuse():
+    """Test that a thread gets its last connection back and nested checkouts share one."""
+    print("Testing per-thread reuse...")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ConnectionPool(os.path.join(directory, "test.db"), max_size=4)
+        with pool.connection() as first:
+            with pool.connection() as nested:
+                assert nested is first
+            with pool.connection() as second:
+                assert second is first
+        assert pool.stats()["size"] == 1
+
+        seen = {}
+
+        def checkout(name, ready, go):
+            with pool.connection() as conn:
+                seen[name] = conn
+                ready.set()
+                go.wait()
+
+        # two threads hold connections at once, so both end up idle in the pool
+        events = {name: (threading.Event(), threading.Event()) for name in ("a", "b")}
+        threads = [threading.Thread(target=checkout, args=(name, *events[name]))
+                   for name in events]
+        for thread, (ready, _) in zip(threads, events.values()):
+            thread.start()
+            ready.wait()
+        for _, go in events.values():
+            go.set()
+        for thread in threads:
+            thread.join()
+        assert seen["a"] is not seen["b"]
+
+        # the main thread last used `first`, which is one of the idle connections
+        assert first in (seen["a"], seen["b"])
+        with pool.connection() as again:
+            assert again is first
+        pool.close()
+    print("✓ Per-thread reuse test passed")
+
+
+def test_commit_and_rollback():
+    """Test that a checkout commits on success and rolls back on error."""
+    print("Testing transactions...")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ConnectionPool(os.path.join(directory, "test.db"))
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+            conn.execute("INSERT INTO items VALUES ('kept')")
+        try:
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('dropped')")
+                raise KeyError("fail")
+        except KeyError:
+            pass
+        with sqlite3.connect(pool.path) as other:
+            assert other.execute("SELECT name FROM items").fetchall() == [("kept",)]
+        # the pool keeps SQLite's default foreign key setting, like db.get_conn()
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+        pool.close()
+    print("✓ Transactions test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Connection Pool Tests")
+    print("=" * 40)
+
+    try:
+        test_bounded_size_and_timeout()
+        test_waiter_gets_released_connection()
+        test_per_thread_reuse()
+        test_commit_and_rollback()
+
+        print("\n" + "=" * 40)
+        print("🎉 All connection pool tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
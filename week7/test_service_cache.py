@@ -0,0 +1,177 @@
+"""
+Test script for the read-through service cache
+Checks load coalescing, invalidation during a load, TTL expiry and result copies
+"""
+
+import sys
+import threading
+import time
+from service_cache import CachedOrderService, CachedUserService, TTLCache
+from test_db import with_database
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stampede_is_coalesced():
+    """Test that concurrent misses for one key run the loader once."""
+    print("Testing load coalescing...")
+    cache = TTLCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait()
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # every thread has either started the load or is waiting for it
+    while cache.stats()["misses"] < 8:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1] and results == ["value"] * 8
+    assert cache.stats()["coalesced"] == 7
+    assert cache.get_or_load("key", loader) == "value" and calls == [1]
+    print("✓ Load coalescing test passed")
+
+
+def test_failed_load_is_shared():
+    """Test that a failed load raises its error and caches nothing."""
+    print("Testing failed loads...")
+    cache = TTLCache()
+    try:
+        cache.get_or_load("key", lambda: 1 / 0)
+        assert False, "the loader's error should be raised"
+    except ZeroDivisionError:
+        pass
+    assert cache.get_or_load("key", lambda: "value") == "value"
+    print("✓ Failed loads test passed")
+
+
+def test_invalidation_during_load():
+    """Test that a load running when its key is invalidated is not stored."""
+    print("Testing invalidation during a load...")
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait()
+        return "old"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get_or_load("key", slow_loader)))
+    thread.start()
+    started.wait()
+    cache.invalidate("key")
+    release.set()
+    thread.join()
+    assert results == ["old"]
+    assert cache.get_or_load("key", lambda: "new") == "new"
+
+    # bulk puts carry the version they read at and are dropped after an invalidation
+    version = cache.version
+    cache.invalidate("other")
+    cache.put("bulk", "old", version)
+    assert cache.get_many(["bulk"]) == ({}, ["bulk"])
+    cache.put("bulk", "new", cache.version)
+    assert cache.get_many(["bulk"]) == ({"bulk": "new"}, [])
+    print("✓ Invalidation during a load test passed")
+
+
+def test_ttl_and_eviction():
+    """Test expiry with a fake clock and LRU eviction at max_size."""
+    print("Testing TTL and eviction...")
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get_or_load("a", lambda: 2) == 1
+    clock.now = 10
+    assert cache.get_or_load("a", lambda: 2) == 2
+    assert cache.stats()["expirations"] == 1
+    clock.now = 25
+    assert cache.get_many(["a"]) == ({}, ["a"])
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get_or_load("a", lambda: None)
+    cache.put("c", 3)
+    assert cache.get_many(["a", "b", "c"]) == ({"a": 1, "c": 3}, ["b"])
+    assert cache.stats()["evictions"] == 1
+    try:
+        TTLCache(max_size=0)
+        assert False, "a cache without room should be rejected"
+    except ValueError:
+        pass
+    print("✓ TTL and eviction test passed")
+
+
+@with_database
+def test_services_return_copies():
+    """Test that callers cannot change cached order lists."""
+    print("Testing cached services...")
+    cache = TTLCache()
+    users, orders = CachedUserService(cache), CachedOrderService(cache)
+    first = orders.get_orders(1)
+    first.append("junk")
+    assert orders.get_orders(1) == [(1, 1, "Laptop"), (2, 1, "Mouse")]
+    batch = orders.get_orders_for_users([1, 2])
+    batch[2].clear()
+    assert orders.get_orders_for_users(["2"]) == {2: [(3, 2, "Keyboard")]}
+    assert orders.get_orders(2) == [(3, 2, "Keyboard")]
+
+    # string and int ids share cache entries, so writes invalidate both
+    assert users.get_user("2") == (2, "Bob")
+    users.update_user(2, "Robert")
+    assert users.get_users(["2"]) == {2: (2, "Robert")}
+    orders.add_order("2", "Cable")
+    assert [row[2] for row in orders.get_orders(2)] == ["Keyboard", "Cable"]
+    users.delete_user("1")
+    assert orders.get_orders(1) == [] and users.get_user(1) is None
+    print("✓ Cached services test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running Service Cache Tests")
+    print("=" * 40)
+
+    try:
+        test_stampede_is_coalesced()
+        test_failed_load_is_shared()
+        test_invalidation_during_load()
+        test_ttl_and_eviction()
+        test_services_return_copies()
+
+        print("\n" + "=" * 40)
+        print("🎉 All service cache tests passed!")
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)